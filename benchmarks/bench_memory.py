@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark mémoire des modèles (Ingredient, Potion)
+
+Compare les modèles actuels (slots, frozensets partagés, chaînes
+internalisées) aux anciens dataclasses (un __dict__ et une liste de types
+par objet) sur 100k ingrédients et 1M potions.
+
+Usage : python benchmarks/bench_memory.py [nb_ingredients] [nb_potions]
+"""
+
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from potiongenerator.core import Ingredient, Potion  # noqa: E402
+
+QUALITIES = ["Mineur", "Majeur", "Légendaire", "Mythique"]
+DURATIONS = ["Instantané", "1 minute", "10 minutes", "1 heure", "Un cycle"]
+BASES = ["eau", "huile", "pate", "vin", "cendre", "quartz"]
+
+
+@dataclass
+class LegacyIngredient:
+    """Ancien modèle : __dict__ et liste de types propres à chaque objet"""
+    id: str
+    name: str
+    effect: str
+    type: str
+    quality: str
+    duration: str
+    rarity: str = "Commun"
+    description: str = ""
+    allowed_potion_types: List[str] = None
+
+    def __post_init__(self):
+        if self.allowed_potion_types is None:
+            self.allowed_potion_types = ["Potion", "Poison", "Onguent", "Filtre", "Substrat", "Médicament"]
+
+
+@dataclass
+class LegacyPotion:
+    """Ancien modèle de potion"""
+    id: str
+    name: str
+    base: str
+    ingredient1: str
+    ingredient2: str
+    category: str
+    created_at: str
+    is_favorite: bool = False
+    notes: str = ""
+
+
+def _fresh(value: str) -> str:
+    """Nouvelle copie d'une chaîne, comme après json.load"""
+    return "".join(list(value))
+
+
+def ingredient_fields(i: int) -> dict:
+    return {
+        "id": f"ing_{i}", "name": f"Ingrédient {i}", "effect": f"Effet {i % 500}",
+        "type": _fresh("positif" if i % 2 else "négatif"),
+        "quality": _fresh(QUALITIES[i % 4]), "duration": _fresh(DURATIONS[i % 5]),
+        "rarity": _fresh("Commun"),
+    }
+
+
+def potion_fields(i: int, nb_ingredients: int) -> dict:
+    return {
+        "id": f"potion_{i}", "name": f"Potion {i}",
+        "base": _fresh(BASES[i % 6]),
+        "ingredient1": _fresh(f"ing_{(i * 7) % nb_ingredients}"),
+        "ingredient2": _fresh(f"ing_{(i * 13) % nb_ingredients}"),
+        "category": _fresh(QUALITIES[i % 4]),
+        "created_at": "2025-05-25T20:37:02.185752",
+    }
+
+
+def measure(label: str, factory, count: int) -> int:
+    """Mémoire (octets) retenue par ``count`` objets"""
+    tracemalloc.start()
+    objects = [factory(i) for i in range(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<22} {current / 1024 / 1024:8.1f} Mo  ({current / count:6.0f} o/objet)")
+    del objects
+    return current
+
+
+def main():
+    nb_ingredients = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    nb_potions = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+
+    print(f"{nb_ingredients} ingrédients")
+    legacy = measure("ancien modèle", lambda i: LegacyIngredient(**ingredient_fields(i)), nb_ingredients)
+    current = measure("modèle compact", lambda i: Ingredient(**ingredient_fields(i)), nb_ingredients)
+    print(f"  réduction : {100 * (1 - current / legacy):.0f} %")
+
+    print(f"{nb_potions} potions")
+    legacy = measure("ancien modèle", lambda i: LegacyPotion(**potion_fields(i, nb_ingredients)), nb_potions)
+    current = measure("modèle compact", lambda i: Potion(**potion_fields(i, nb_ingredients)), nb_potions)
+    print(f"  réduction : {100 * (1 - current / legacy):.0f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du démarrage à froid de l'application
+
+Chaque mesure lance un nouvel interpréteur (imports compris) sur une copie
+du fichier de données, puis chronomètre : import du cœur, chargement des
+données, import de l'interface et premier affichage de la fenêtre
+principale. Sans affichage disponible, seules les étapes sans interface
+sont mesurées.
+
+Objectif : démarrage complet (interpréteur compris) en moins de
+STARTUP_TARGET secondes ; le code de retour vaut 1 si la médiane le dépasse.
+
+Usage : python benchmarks/bench_startup.py [fichier_de_données] [nb_mesures]
+"""
+
+import json
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Démarrage à froid visé (secondes), mesuré sur les portables de l'accueil
+STARTUP_TARGET = 1.0
+
+CHILD = r"""
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+from potiongenerator.core import PotionManager
+t1 = time.perf_counter()
+manager = PotionManager({data_file!r})
+t2 = time.perf_counter()
+timings = {{"import_core": t1 - t0, "load": t2 - t1}}
+try:
+    from potiongenerator.ui.app import PotionGeneratorApp
+    t3 = time.perf_counter()
+    app = PotionGeneratorApp(potion_manager=manager)
+    app.root.update()
+    timings["import_ui"] = t3 - t2
+    timings["first_paint"] = time.perf_counter() - t3
+    timings["dialogs_loaded"] = "potiongenerator.ui.dialogs" in sys.modules
+    app.root.destroy()
+except Exception as e:
+    # Pas d'affichage (serveur, CI) : seules les étapes sans interface comptent
+    timings["ui_error"] = str(e).splitlines()[0]
+manager.data_manager.close()
+print(json.dumps(timings))
+"""
+
+PHASES = [("import_core", "import du cœur"), ("load", "chargement des données"),
+          ("import_ui", "import de l'interface"), ("first_paint", "premier affichage")]
+
+
+def run_once(data_file: Path, workdir: Path) -> dict:
+    """Un démarrage à froid dans un nouvel interpréteur"""
+    copy = workdir / "data" / data_file.name
+    copy.parent.mkdir(exist_ok=True)
+    shutil.copyfile(data_file, copy)
+    code = CHILD.format(root=str(ROOT), data_file=str(copy))
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", code], cwd=workdir, capture_output=True,
+                            text=True, check=True).stdout
+    timings = json.loads(output.strip().splitlines()[-1])
+    timings["total"] = time.perf_counter() - start
+    return timings
+
+
+def main():
+    data_file = Path(sys.argv[1] if len(sys.argv) > 1 else ROOT / "data" / "potions_data.json").resolve()
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    results = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as workdir:
+            results.append(run_once(data_file, Path(workdir)))
+
+    print(f"Démarrage à froid : {data_file.name}, médiane de {runs} mesures")
+    for key, label in PHASES:
+        values = [result[key] for result in results if key in result]
+        if values:
+            print(f"  {label:<24} {statistics.median(values) * 1000:8.1f} ms")
+    if "ui_error" in results[0]:
+        print(f"  interface non mesurée : {results[0]['ui_error']}")
+    elif results[0].get("dialogs_loaded"):
+        print("  ATTENTION : les dialogues secondaires sont importés au démarrage")
+
+    total = statistics.median(result["total"] for result in results)
+    verdict = "OK" if total <= STARTUP_TARGET else "DÉPASSÉ"
+    print(f"  {'total (interpréteur compris)':<24} {total * 1000:8.1f} ms"
+          f"  (objectif {STARTUP_TARGET * 1000:.0f} ms : {verdict})")
+    return 0 if total <= STARTUP_TARGET else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
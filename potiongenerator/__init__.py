@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - paquet sans interface graphique
+
+``potiongenerator.core`` regroupe les modèles, le stockage et la gestion des
+potions ; ``python -m potiongenerator`` les pilote en ligne de commande.
+L'interface Tkinter (``improved_potion_generator_FIXED.py``) s'appuie dessus.
+"""
+
+from .core import (
+    Base,
+    BackupStore,
+    CombinationSpace,
+    DataManager,
+    Ingredient,
+    Potion,
+    PotionManager,
+    PotionTextIndex,
+    SearchIndex,
+    SQLiteStore,
+    StatisticsAggregator,
+    create_sample_ingredients,
+    fold_text,
+    make_ingredient_id,
+    normalize_name,
+    report_error,
+    set_error_handler,
+)
+
+__version__ = "2.0"
@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""Point d'entrée ``python -m potiongenerator``"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
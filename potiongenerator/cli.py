@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+Ligne de commande du générateur de potions (sans interface graphique)
+
+Usage : python -m potiongenerator [--data FICHIER] COMMANDE ...
+
+Les résultats sont écrits au fil de l'eau sur la sortie standard (une ligne
+par potion, séparateur tabulation ou JSON Lines) ; les messages et erreurs
+vont sur la sortie d'erreur. Code de retour : 0 si tout va bien, 1 si des
+problèmes ont été rencontrés (refus, incohérences), 2 pour une erreur
+d'utilisation.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+from typing import List, Optional
+
+from .core import PotionManager
+from .export import ExportEngine
+from .importer import CONFLICT_POLICIES, ImportEngine, ingredient_import_summary, potion_import_summary
+
+CATEGORIES = ("Mineur", "Majeur", "Légendaire", "Mythique")
+SORT_KEYS = ("Nom", "Catégorie", "Date", "Base")
+
+LIST_HEADER = ["ID", "Nom", "Catégorie", "Base", "Ingrédient1", "Ingrédient2", "Créée le", "Favorite"]
+
+
+# ==================== UTILITAIRES ====================
+
+def _error(message: str):
+    print(f"Erreur: {message}", file=sys.stderr)
+
+
+def _names(manager: PotionManager, section: str) -> dict:
+    """Table ID -> nom d'une section, résolue une seule fois"""
+    return {item_id: item["name"] for item_id, item in manager.data[section].items()}
+
+
+def _query(manager: PotionManager, args, search: str = "") -> List[str]:
+    return manager.query_potion_ids(search=search, category=args.category,
+                                    favorites_only=args.favorites, sort_by=args.sort,
+                                    limit=args.limit, offset=args.offset)
+
+
+def _write_potions(manager: PotionManager, potion_ids: List[str], args):
+    """Écrire les potions au fil de l'eau (TSV ou JSON Lines)"""
+    engine = ExportEngine(manager)
+    if args.format == "jsonl":
+        engine.export_potions(sys.stdout, "jsonl", potion_ids=potion_ids)
+        return
+
+    writer = csv.writer(sys.stdout, delimiter="\t", lineterminator="\n")
+    if not args.no_header:
+        writer.writerow(LIST_HEADER)
+    for potion_id, row in engine.potion_records(potion_ids, display=True):
+        writer.writerow([potion_id, row["name"], row["category"], row["base"], row["ingredient1"],
+                         row["ingredient2"], row["created_at"], row["is_favorite"]])
+
+
+def _resolve_recipe(manager: PotionManager, recipe: List[str]) -> tuple:
+    """Recette saisie par noms, libellés ou IDs -> IDs (inchangés si inconnus)"""
+    base, ingredient1, ingredient2 = recipe
+    return (manager.find_base_id(base) or base,
+            manager.find_ingredient_id(ingredient1) or ingredient1,
+            manager.find_ingredient_id(ingredient2) or ingredient2)
+
+
+# ==================== COMMANDES ====================
+
+def cmd_generate(manager: PotionManager, args) -> int:
+    """Créer des potions : N recettes tirées au hasard, ou des recettes données"""
+    if args.recipe:
+        specs = [_resolve_recipe(manager, recipe) for recipe in args.recipe]
+    elif args.count is not None:
+        specs = args.count
+    else:
+        _error("indiquez un nombre de potions ou au moins une --recipe")
+        return 2
+
+    result = manager.create_potions_batch(specs, seed=args.seed, weighting=args.weighting)
+    for potion in result["created"]:
+        sys.stdout.write(f"{potion.id}\t{potion.name}\t{potion.category}\n")
+    for rejection in result["rejected"]:
+        spec = " + ".join(rejection["spec"]) if rejection["spec"] else "-"
+        print(f"Refusée #{rejection['index'] + 1} ({spec}): {rejection['reason']}", file=sys.stderr)
+
+    print(f"{len(result['created'])} potion(s) créée(s), {len(result['rejected'])} refus", file=sys.stderr)
+    return 1 if result["rejected"] else 0
+
+
+def cmd_list(manager: PotionManager, args) -> int:
+    """Lister les potions filtrées et triées"""
+    _write_potions(manager, _query(manager, args), args)
+    return 0
+
+
+def cmd_query(manager: PotionManager, args) -> int:
+    """Rechercher des potions (nom, ingrédients, base, notes)"""
+    _write_potions(manager, _query(manager, args, " ".join(args.text)), args)
+    return 0
+
+
+def cmd_stats(manager: PotionManager, args) -> int:
+    """Afficher les statistiques"""
+    stats = manager.get_statistics(top=args.top)
+    remaining = manager.get_remaining_counts()
+    if args.json:
+        stats["remaining_combinations"] = remaining
+        json.dump(stats, sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return 0
+
+    ingredients = _names(manager, "ingredients")
+    bases = _names(manager, "bases")
+    out = sys.stdout
+    out.write(f"Potions\t{stats['total_potions']}\n")
+    out.write(f"Ingrédients\t{stats['total_ingredients']}\n")
+    out.write(f"Favorites\t{stats['favorites']}\n")
+    for category in CATEGORIES:
+        out.write(f"Catégorie {category}\t{stats['categories'].get(category, 0)}\n")
+    for base_id, count in sorted(stats["bases_used"].items()):
+        out.write(f"Base {bases.get(base_id, base_id)}\t{count}\n")
+    for ing_id, count in stats["top_ingredients"]:
+        out.write(f"Ingrédient {ingredients.get(ing_id, ing_id)}\t{count}\n")
+    for base_id, count in sorted(remaining.items()):
+        out.write(f"Combinaisons restantes {bases.get(base_id, base_id)}\t{count}\n")
+    return 0
+
+
+def cmd_export(manager: PotionManager, args) -> int:
+    """Exporter les potions (CSV, JSON Lines, JSON), les ingrédients ou tout le document"""
+    engine = ExportEngine(manager)
+    destination = sys.stdout if args.output == "-" else args.output
+    if args.ingredients:
+        count = engine.export_ingredients(destination, args.kind)
+        label = "ingrédient(s) exporté(s)"
+    elif args.kind == "json" and not (args.search or args.category or args.favorites or args.sort):
+        # Document complet (réimportable)
+        count = engine.export_document(destination)
+        label = "potion(s) exportée(s) avec tout le document"
+    else:
+        potion_ids = None
+        if args.search or args.category or args.favorites or args.sort:
+            potion_ids = manager.query_potion_ids(search=args.search, category=args.category,
+                                                  favorites_only=args.favorites, sort_by=args.sort or "Nom")
+        count = engine.export_potions(destination, args.kind, potion_ids=potion_ids)
+        label = "potion(s) exportée(s)"
+
+    target = "la sortie standard" if args.output == "-" else args.output
+    print(f"{count} {label} vers {target}", file=sys.stderr)
+    return 0
+
+
+def cmd_import(manager: PotionManager, args) -> int:
+    """Remplacer toutes les données par celles d'un fichier JSON"""
+    if not args.yes:
+        _error("l'import remplace toutes les données actuelles ; confirmez avec --yes")
+        return 2
+
+    document, report = ImportEngine(manager).read_document(args.file)
+    manager.replace_data(document)
+    for rejection in report["rejected"]:
+        print(f"{rejection['section']} {rejection['id']} ignoré : {rejection['reason']}", file=sys.stderr)
+    if report["rejected_count"] > len(report["rejected"]):
+        print(f"... et {report['rejected_count'] - len(report['rejected'])} autre(s) refus", file=sys.stderr)
+    print(f"{len(manager.data['potions'])} potion(s), {len(manager.data['ingredients'])} ingrédient(s) importé(s)",
+          file=sys.stderr)
+    return 0
+
+
+def cmd_import_ingredients(manager: PotionManager, args) -> int:
+    """Ajouter les ingrédients de plusieurs fichiers, sans question"""
+    engine = ImportEngine(manager)
+    records, rejected = engine.read_ingredient_files(args.files)
+    applied = engine.apply_ingredients(records, args.policy)
+    for line in ingredient_import_summary(applied, rejected):
+        print(line, file=sys.stderr)
+    return 1 if rejected else 0
+
+
+def cmd_import_potions(manager: PotionManager, args) -> int:
+    """Ajouter les potions d'un CSV (export retouché dans un tableur), sans question"""
+    engine = ImportEngine(manager)
+    potions, report = engine.read_potions_csv(args.file)
+    applied = engine.apply_potions(potions)
+    for line in potion_import_summary(applied, report):
+        print(line, file=sys.stderr)
+    return 1 if report["rejected_count"] or applied["rejected_count"] else 0
+
+
+def cmd_delete_ingredient(manager: PotionManager, args) -> int:
+    """Supprimer un ingrédient ; ses potions bloquent, suivent ou changent d'ingrédient"""
+    ing_id = manager.find_ingredient_id(args.ingredient) or args.ingredient
+    mode, replacement = "block", None
+    if args.cascade:
+        mode = "cascade"
+    elif args.reassign:
+        mode, replacement = "reassign", manager.find_ingredient_id(args.reassign) or args.reassign
+    usage = len(manager.potion_ids_using_ingredient(ing_id))
+    reason = manager.delete_ingredient(ing_id, mode, replacement)
+    if reason:
+        _error(reason)
+        return 1
+    done = {"block": "", "cascade": f", {usage} potion(s) supprimée(s)",
+            "reassign": f", {usage} potion(s) reportée(s) sur {replacement}"}[mode]
+    print(f"Ingrédient {ing_id} supprimé{done}", file=sys.stderr)
+    return 0
+
+
+def cmd_check(manager: PotionManager, args) -> int:
+    """Vérifier la cohérence des données"""
+    issues = manager.check_integrity()
+    for issue in issues:
+        sys.stdout.write(issue + "\n")
+    if issues:
+        print(f"{len(issues)} problème(s) détecté(s)", file=sys.stderr)
+        return 1
+    print("Aucun problème détecté", file=sys.stderr)
+    return 0
+
+
+def cmd_backup(manager: PotionManager, args) -> int:
+    """Créer, lister ou restaurer des sauvegardes"""
+    data_manager = manager.data_manager
+    if args.list:
+        for entry in data_manager.backups.list_backups():
+            sys.stdout.write(f"{entry['id']}\t{entry['created']}\t{entry['reason']}\t{entry['size']}\n")
+        return 0
+
+    if args.restore:
+        try:
+            manager.restore_backup(args.restore)
+        except (KeyError, FileNotFoundError):
+            _error(f"sauvegarde inconnue: {args.restore}")
+            return 1
+        print(f"Sauvegarde {args.restore} restaurée", file=sys.stderr)
+        return 0
+
+    entry = data_manager.create_backup(reason=args.reason)
+    if entry is None:
+        print("Aucune sauvegarde créée (fichier absent ou inchangé)", file=sys.stderr)
+        return 0
+    sys.stdout.write(entry["id"] + "\n")
+    return 0
+
+
+# ==================== ANALYSE DES ARGUMENTS ====================
+
+def _add_view_arguments(parser: argparse.ArgumentParser):
+    """Filtres, tri et format communs à list et query"""
+    parser.add_argument("--category", choices=CATEGORIES, help="ne garder qu'une catégorie")
+    parser.add_argument("--favorites", action="store_true", help="favorites uniquement")
+    parser.add_argument("--sort", choices=SORT_KEYS, default="Nom", help="tri (défaut : Nom)")
+    parser.add_argument("--limit", type=int, help="nombre maximal de potions")
+    parser.add_argument("--offset", type=int, default=0, help="potions à sauter")
+    parser.add_argument("--format", choices=("tsv", "jsonl"), default="tsv", help="format de sortie")
+    parser.add_argument("--no-header", action="store_true", help="sans ligne d'en-tête (tsv)")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m potiongenerator",
+        description="Générateur de potions en ligne de commande (sans interface graphique)")
+    parser.add_argument("--data", default="data/potions_data.json",
+                        help="fichier de données JSON, ou base .sqlite/.db (défaut : %(default)s)")
+    commands = parser.add_subparsers(dest="command", required=True, metavar="COMMANDE")
+
+    generate = commands.add_parser("generate", help="créer des potions")
+    generate.add_argument("count", type=int, nargs="?", help="nombre de recettes à tirer au hasard")
+    generate.add_argument("--recipe", nargs=3, action="append", metavar=("BASE", "INGR1", "INGR2"),
+                          help="recette imposée (noms ou IDs), répétable")
+    generate.add_argument("--seed", type=int, help="graine pour un tirage reproductible")
+    generate.add_argument("--weighting", choices=("rarity", "quality"),
+                          help="favoriser les ingrédients communs / mineurs")
+    generate.set_defaults(handler=cmd_generate)
+
+    list_parser = commands.add_parser("list", help="lister les potions")
+    _add_view_arguments(list_parser)
+    list_parser.set_defaults(handler=cmd_list)
+
+    query = commands.add_parser("query", help="rechercher des potions")
+    query.add_argument("text", nargs="+", help="texte recherché")
+    _add_view_arguments(query)
+    query.set_defaults(handler=cmd_query)
+
+    stats = commands.add_parser("stats", help="statistiques")
+    stats.add_argument("--top", type=int, default=10, help="ingrédients les plus utilisés à afficher")
+    stats.add_argument("--json", action="store_true", help="sortie JSON")
+    stats.set_defaults(handler=cmd_stats)
+
+    export = commands.add_parser("export", help="exporter les potions, les ingrédients ou tout le document")
+    export.add_argument("kind", choices=("csv", "jsonl", "json"),
+                        help="json sans filtre : document complet (réimportable)")
+    export.add_argument("-o", "--output", default="-", help="fichier de sortie (défaut : sortie standard)")
+    export.add_argument("--ingredients", action="store_true", help="exporter les ingrédients")
+    export.add_argument("--search", default="", help="n'exporter que les potions trouvées")
+    export.add_argument("--category", choices=CATEGORIES, help="n'exporter qu'une catégorie")
+    export.add_argument("--favorites", action="store_true", help="favorites uniquement")
+    export.add_argument("--sort", choices=SORT_KEYS, help="ordre des potions exportées")
+    export.set_defaults(handler=cmd_export)
+
+    import_parser = commands.add_parser("import", help="remplacer les données par un fichier JSON")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--yes", action="store_true", help="confirmer le remplacement des données")
+    import_parser.set_defaults(handler=cmd_import)
+
+    import_ingredients = commands.add_parser("import-ingredients",
+                                             help="ajouter les ingrédients de fichiers JSON ou CSV (code 1 si refus)")
+    import_ingredients.add_argument("files", nargs="+")
+    import_ingredients.add_argument("--policy", choices=CONFLICT_POLICIES, default="skip",
+                                    help="ingrédient déjà présent : ignorer (défaut), remplacer, "
+                                         "fusionner les champs ou renommer l'import")
+    import_ingredients.set_defaults(handler=cmd_import_ingredients)
+
+    import_potions = commands.add_parser("import-potions",
+                                         help="ajouter les potions d'un CSV exporté (code 1 si refus)")
+    import_potions.add_argument("file")
+    import_potions.set_defaults(handler=cmd_import_potions)
+
+    delete_ingredient = commands.add_parser("delete-ingredient",
+                                            help="supprimer un ingrédient (refusé s'il est utilisé, code 1)")
+    delete_ingredient.add_argument("ingredient", help="nom, libellé ou ID")
+    fate = delete_ingredient.add_mutually_exclusive_group()
+    fate.add_argument("--cascade", action="store_true", help="supprimer aussi les potions qui l'utilisent")
+    fate.add_argument("--reassign", metavar="INGREDIENT", help="reporter ses potions sur cet ingrédient")
+    delete_ingredient.set_defaults(handler=cmd_delete_ingredient)
+
+    check = commands.add_parser("check", help="vérifier la cohérence des données")
+    check.set_defaults(handler=cmd_check)
+
+    backup = commands.add_parser("backup", help="créer (défaut), lister ou restaurer des sauvegardes")
+    backup.add_argument("--list", action="store_true", help="lister les sauvegardes")
+    backup.add_argument("--restore", metavar="ID", help="restaurer une sauvegarde")
+    backup.add_argument("--reason", default="ligne de commande", help="origine notée dans l'index")
+    backup.set_defaults(handler=cmd_backup)
+
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Point d'entrée de la ligne de commande"""
+    args = build_parser().parse_args(argv)
+    manager = PotionManager(args.data)
+    try:
+        return args.handler(manager, args)
+    except BrokenPipeError:
+        # Sortie fermée par le lecteur (``| head``) : fin normale
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError) as e:
+        _error(str(e))
+        return 1
+    finally:
+        manager.data_manager.close()
@@ -0,0 +1,2721 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - Cœur
+Modèles, stockage et gestion des potions, sans dépendance à l'interface
+"""
+
+import json
+import bisect
+import os
+import random
+import re
+import sys
+import unicodedata
+import datetime
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from pathlib import Path
+import gzip
+import hashlib
+import heapq
+import sqlite3
+import tempfile
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+# ==================== MODELS ====================
+
+# Types de potions autorisés par défaut (partagé, immuable)
+DEFAULT_POTION_TYPES = ("Potion", "Poison", "Onguent", "Filtre", "Substrat", "Médicament")
+
+# Valeurs admises des champs énumérés d'un ingrédient
+INGREDIENT_TYPES = ("positif", "négatif")
+INGREDIENT_QUALITIES = ("Mineur", "Majeur", "Légendaire", "Mythique")
+INGREDIENT_RARITIES = ("Commun", "Rare", "Légendaire", "Mythique")
+
+# Sort des potions qui utilisent un ingrédient supprimé
+INGREDIENT_DELETE_MODES = ("block", "cascade", "reassign")
+
+# Un seul frozenset par combinaison distincte de types autorisés
+_POTION_TYPE_SETS: Dict[FrozenSet[str], FrozenSet[str]] = {}
+
+def intern_potion_types(potion_types: Optional[Iterable[str]]) -> FrozenSet[str]:
+    """Obtenir le frozenset partagé correspondant à des types de potions"""
+    types = frozenset(DEFAULT_POTION_TYPES if potion_types is None else potion_types)
+    return _POTION_TYPE_SETS.setdefault(types, types)
+
+def _intern(value):
+    """Internaliser les chaînes répétées (qualités, types, IDs...)"""
+    return sys.intern(value) if type(value) is str else value
+
+def make_ingredient_id(name: str) -> str:
+    """ID d'un nouvel ingrédient, dérivé de son nom"""
+    return name.lower().replace(" ", "_").replace("'", "").replace("-", "_")
+
+def fold_text(text: str) -> str:
+    """Texte sans casse ni accents, pour les comparaisons et la recherche"""
+    text = unicodedata.normalize("NFKD", text.casefold())
+    return "".join(char for char in text if not unicodedata.combining(char))
+
+def normalize_name(text: str) -> str:
+    """Forme normalisée d'un nom : sans accents, casse ni ponctuation"""
+    return re.sub(r"[^0-9a-z]+", "_", fold_text(text.strip())).strip("_")
+
+@dataclass(slots=True)
+class Ingredient:
+    """Modèle pour un ingrédient avec types de potions autorisés"""
+    id: str
+    name: str
+    effect: str
+    type: str  # "positif" ou "négatif"
+    quality: str  # "Mineur", "Majeur", "Légendaire", "Mythique"
+    duration: str
+    rarity: str = "Commun"
+    description: str = ""
+    allowed_potion_types: FrozenSet[str] = None  # Types de potions autorisés (frozenset partagé)
+    
+    def __post_init__(self):
+        # Par défaut, autorisé dans tous les types
+        self.allowed_potion_types = intern_potion_types(self.allowed_potion_types)
+        self.type = _intern(self.type)
+        self.quality = _intern(self.quality)
+        self.duration = _intern(self.duration)
+        self.rarity = _intern(self.rarity)
+
+@dataclass(slots=True)
+class Base:
+    """Modèle pour une base de potion"""
+    id: str
+    name: str
+    potion_type: str
+    description: str = ""
+    rarity: str = "Commun"
+    
+    def __post_init__(self):
+        self.potion_type = _intern(self.potion_type)
+        self.rarity = _intern(self.rarity)
+
+@dataclass(slots=True)
+class Potion:
+    """Modèle pour une potion créée"""
+    id: str
+    name: str
+    base: str
+    ingredient1: str
+    ingredient2: str
+    category: str
+    created_at: str
+    is_favorite: bool = False
+    notes: str = ""
+    
+    def __post_init__(self):
+        self.base = _intern(self.base)
+        self.ingredient1 = _intern(self.ingredient1)
+        self.ingredient2 = _intern(self.ingredient2)
+        self.category = _intern(self.category)
+    
+    def get_key(self) -> str:
+        """Clé unique pour identifier les doublons"""
+        return f"{self.base}|{min(self.ingredient1, self.ingredient2)}|{max(self.ingredient1, self.ingredient2)}"
+
+# ==================== RECHERCHE ====================
+
+class SearchIndex:
+    """Index de recherche sur une liste de libellés (listes déroulantes)
+    
+    Les libellés sont normalisés une seule fois (casse et accents), puis
+    indexés par préfixe (listes triées parcourues par dichotomie) et par
+    trigrammes. Une requête qui prolonge la précédente ne filtre que les
+    résultats déjà trouvés. Classement : début du libellé, début d'un mot,
+    sous-chaîne, puis tous les termes présents dans le désordre.
+    """
+    
+    def __init__(self, values: Iterable[str] = ()):
+        self.values = list(values)
+        self._folded = [fold_text(value) for value in self.values]
+        self._prefixes = sorted((folded, position) for position, folded in enumerate(self._folded))
+        self._word_prefixes = sorted(
+            (word, position)
+            for position, folded in enumerate(self._folded)
+            for word in set(re.findall(r"\w+", folded)))
+        self._trigrams: Dict[str, List[int]] = {}
+        for position, folded in enumerate(self._folded):
+            for trigram in {folded[start:start + 3] for start in range(len(folded) - 2)}:
+                self._trigrams.setdefault(trigram, []).append(position)
+        # Dernière requête « complète » et ses correspondances, pour l'affinage
+        self._last_query: Optional[str] = None
+        self._last_matches: List[int] = []
+    
+    def __len__(self) -> int:
+        return len(self.values)
+    
+    @staticmethod
+    def _lookup_prefix(table: List[Tuple[str, int]], prefix: str) -> List[int]:
+        start = bisect.bisect_left(table, (prefix,))
+        stop = bisect.bisect_left(table, (prefix + "\U0010ffff",))
+        return [position for _, position in table[start:stop]]
+    
+    def _candidates(self, tokens: List[str]) -> Iterable[int]:
+        """Positions pouvant contenir tous les termes (trigrammes des termes longs)"""
+        postings = [self._trigrams.get(token[start:start + 3], [])
+                    for token in tokens if len(token) >= 3
+                    for start in range(len(token) - 2)]
+        if not postings:
+            return range(len(self.values))
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return candidates
+    
+    def _rank(self, position: int, query: str) -> Tuple[int, int]:
+        folded = self._folded[position]
+        start = folded.find(query)
+        if start == 0:
+            return 0, position
+        substring = start > 0
+        while start > 0:
+            if not folded[start - 1].isalnum():
+                return 1, position
+            start = folded.find(query, start + 1)
+        return (2 if substring else 3), position
+    
+    def search(self, query: str, limit: Optional[int] = None) -> List[str]:
+        """Libellés correspondant à la requête, les meilleurs d'abord"""
+        query = " ".join(fold_text(query).split())
+        if not query:
+            return self.values[:limit]
+        tokens = query.split(" ")
+        
+        if len(tokens) == 1 and len(query) < 3:
+            # Requête courte : débuts de libellé et de mots uniquement
+            matches = set(self._lookup_prefix(self._prefixes, query))
+            matches.update(self._lookup_prefix(self._word_prefixes, query))
+            self._last_query = None
+        else:
+            if self._last_query is not None and query.startswith(self._last_query):
+                candidates = self._last_matches
+            else:
+                candidates = self._candidates(tokens)
+            matches = [position for position in candidates
+                       if all(token in self._folded[position] for token in tokens)]
+            self._last_query, self._last_matches = query, matches
+        
+        if limit is None:
+            ranked = sorted(matches, key=lambda position: self._rank(position, query))
+        else:
+            ranked = heapq.nsmallest(limit, matches, key=lambda position: self._rank(position, query))
+        return [self.values[position] for position in ranked]
+
+# Mots trop courants pour être indexés
+SEARCH_STOPWORDS = frozenset({"de", "du", "des", "d", "la", "le", "les", "l", "et", "un", "une", "a", "au", "aux"})
+
+def search_terms(text: str) -> set:
+    """Termes indexables d'un texte (sans casse ni accents)"""
+    return {term for term in re.findall(r"\w+", fold_text(text)) if term not in SEARCH_STOPWORDS}
+
+class ReferenceIndex:
+    """Index inverse des références : ingrédient -> potions, base -> potions
+    
+    Tenu à jour à chaque ajout ou retrait de potion : renommer ou supprimer
+    un ingrédient ne parcourt que les potions qui l'utilisent.
+    """
+    
+    def __init__(self):
+        self.potions_by_ingredient: Dict[str, set] = {}
+        self.potions_by_base: Dict[str, set] = {}
+    
+    @staticmethod
+    def _link(table: Dict[str, set], key: str, potion_id: str):
+        potions = table.get(key)
+        if potions is None:
+            potions = table[key] = set()
+        potions.add(potion_id)
+    
+    @staticmethod
+    def _unlink(table: Dict[str, set], key: str, potion_id: str):
+        potions = table.get(key)
+        if potions is not None:
+            potions.discard(potion_id)
+            if not potions:
+                del table[key]
+    
+    def add_potion(self, potion_data: dict):
+        potion_id = potion_data["id"]
+        self._link(self.potions_by_ingredient, potion_data["ingredient1"], potion_id)
+        self._link(self.potions_by_ingredient, potion_data["ingredient2"], potion_id)
+        self._link(self.potions_by_base, potion_data["base"], potion_id)
+    
+    def remove_potion(self, potion_data: dict):
+        potion_id = potion_data["id"]
+        self._unlink(self.potions_by_ingredient, potion_data["ingredient1"], potion_id)
+        self._unlink(self.potions_by_ingredient, potion_data["ingredient2"], potion_id)
+        self._unlink(self.potions_by_base, potion_data["base"], potion_id)
+
+
+class PotionTextIndex:
+    """Index inversé pour la recherche de potions
+    
+    Chaque terme renvoie aux potions qui le contiennent dans leur nom ou
+    leurs notes. Les termes des ingrédients (nom, effet) et des bases (nom)
+    renvoient à ces éléments, reliés à leurs potions par l'index des
+    références : renommer un ingrédient ne touche donc pas aux potions.
+    Une requête est un ET de termes, chacun pris comme préfixe.
+    
+    ``references`` est l'index tenu par le PotionManager, partagé ; sans
+    lui, l'index de recherche tient le sien.
+    """
+    
+    def __init__(self, references: Optional[ReferenceIndex] = None):
+        self._potion_terms: Dict[str, set] = {}
+        self._ingredient_terms: Dict[str, set] = {}
+        self._base_terms: Dict[str, set] = {}
+        self._terms_by_item: Dict[Tuple[str, str], set] = {}
+        self._owns_references = references is None
+        self.references = ReferenceIndex() if references is None else references
+        # Vocabulaire trié (préfixes), reconstruit après l'ajout ou le retrait d'un terme
+        self._vocabulary: Optional[List[str]] = None
+    
+    def _link(self, table: Dict[str, set], key: str, item_id: str):
+        items = table.get(key)
+        if items is None:
+            items = table[key] = set()
+            if any(table is terms for terms in self._term_tables()):
+                self._vocabulary = None
+        items.add(item_id)
+    
+    def _unlink(self, table: Dict[str, set], key: str, item_id: str):
+        items = table.get(key)
+        if items is not None:
+            items.discard(item_id)
+            if not items:
+                del table[key]
+                if any(table is terms for terms in self._term_tables()):
+                    self._vocabulary = None
+    
+    def _term_tables(self) -> Tuple[Dict[str, set], ...]:
+        return self._potion_terms, self._ingredient_terms, self._base_terms
+    
+    # ---------- Mise à jour ----------
+    
+    def add_potion(self, potion_data: dict):
+        potion_id = potion_data["id"]
+        for term in search_terms(f"{potion_data['name']} {potion_data.get('notes', '')}"):
+            self._link(self._potion_terms, term, potion_id)
+        if self._owns_references:
+            self.references.add_potion(potion_data)
+    
+    def remove_potion(self, potion_data: dict):
+        potion_id = potion_data["id"]
+        for term in search_terms(f"{potion_data['name']} {potion_data.get('notes', '')}"):
+            self._unlink(self._potion_terms, term, potion_id)
+        if self._owns_references:
+            self.references.remove_potion(potion_data)
+    
+    def _set_item(self, kind: str, table: Dict[str, set], item_id: str, text: str):
+        for term in self._terms_by_item.pop((kind, item_id), ()):
+            self._unlink(table, term, item_id)
+        if text:
+            terms = search_terms(text)
+            self._terms_by_item[(kind, item_id)] = terms
+            for term in terms:
+                self._link(table, term, item_id)
+    
+    def set_ingredient(self, ing_id: str, ingredient_data: Optional[dict]):
+        """Indexer (ou retirer si None) le nom et l'effet d'un ingrédient"""
+        text = f"{ingredient_data.get('name', '')} {ingredient_data.get('effect', '')}" if ingredient_data else ""
+        self._set_item("ingredient", self._ingredient_terms, ing_id, text)
+    
+    def set_base(self, base_id: str, base_data: Optional[dict]):
+        """Indexer (ou retirer si None) le nom d'une base"""
+        self._set_item("base", self._base_terms, base_id, base_data.get("name", "") if base_data else "")
+    
+    # ---------- Requêtes ----------
+    
+    def _expand(self, prefix: str) -> List[str]:
+        """Termes connus commençant par ``prefix``"""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(set().union(*self._term_tables()))
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        stop = bisect.bisect_left(self._vocabulary, prefix + "\U0010ffff")
+        return self._vocabulary[start:stop]
+    
+    def item_matches(self, prefix: str) -> Tuple[List[str], List[str]]:
+        """Ingrédients et bases dont un terme commence par ``prefix``"""
+        ingredient_ids, base_ids = set(), set()
+        for term in self._expand(prefix):
+            ingredient_ids.update(self._ingredient_terms.get(term, ()))
+            base_ids.update(self._base_terms.get(term, ()))
+        return sorted(ingredient_ids), sorted(base_ids)
+    
+    def _postings(self, prefix: str) -> List[set]:
+        """Ensembles d'IDs de potions dont l'union correspond à ``prefix``"""
+        postings = []
+        by_ingredient = self.references.potions_by_ingredient
+        by_base = self.references.potions_by_base
+        for term in self._expand(prefix):
+            if term in self._potion_terms:
+                postings.append(self._potion_terms[term])
+            for ing_id in self._ingredient_terms.get(term, ()):
+                postings.append(by_ingredient.get(ing_id, set()))
+            for base_id in self._base_terms.get(term, ()):
+                postings.append(by_base.get(base_id, set()))
+        return postings
+    
+    def search(self, query: str) -> set:
+        """IDs des potions correspondant à tous les termes de la requête"""
+        prefixes = search_terms(query)
+        if not prefixes:
+            return set()
+        
+        # Les termes les plus sélectifs passent d'abord
+        candidates = sorted((self._postings(prefix) for prefix in prefixes),
+                            key=lambda postings: sum(map(len, postings)))
+        result = set().union(*candidates[0])
+        for postings in candidates[1:]:
+            if not result:
+                break
+            if sum(map(len, postings)) <= 4 * len(result):
+                result.intersection_update(set().union(*postings))
+            else:
+                # Terme fréquent : tester l'appartenance des quelques candidats restants
+                result = {potion_id for potion_id in result
+                          if any(potion_id in posting for posting in postings)}
+        return result
+
+# ==================== SAUVEGARDES ====================
+
+class BackupStore:
+    """Sauvegardes compressées, dédupliquées par empreinte du contenu
+    
+    Les contenus sont stockés une seule fois (``<sha256>.json.gz``, ou
+    ``.sqlite.gz`` pour une base SQLite) et un
+    index ``index.json`` décrit chaque sauvegarde : lister ou restaurer ne
+    parcourt jamais le dossier.
+    """
+    
+    # Rétention : les plus récentes, la dernière de chaque heure / jour,
+    # et la première de chaque session (l'état au début de l'événement)
+    KEEP_RECENT = 10
+    KEEP_HOURLY = 24
+    KEEP_DAILY = 30
+    KEEP_SESSIONS = 20
+    
+    def __init__(self, backup_dir: Path, suffix: str = ".json"):
+        self.backup_dir = Path(backup_dir)
+        self.suffix = suffix
+        self.index_file = self.backup_dir / "index.json"
+        self._lock = threading.Lock()
+        self._entries: Optional[List[dict]] = None
+    
+    def _load_index(self) -> List[dict]:
+        """Charger l'index des sauvegardes (une seule fois)"""
+        if self._entries is None:
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    self._entries = json.load(f)["backups"]
+            except (FileNotFoundError, json.JSONDecodeError, KeyError):
+                self._entries = []
+        return self._entries
+    
+    def _save_index(self):
+        """Écrire l'index de façon atomique"""
+        tmp_file = self.index_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"version": "1.0", "backups": self._entries}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.index_file)
+    
+    def _object_path(self, content_hash: str) -> Path:
+        return self.backup_dir / f"{content_hash}{self.suffix}.gz"
+    
+    def add(self, payload: bytes, session: str, reason: str = "auto") -> Optional[dict]:
+        """Ajouter une sauvegarde ; rien n'est écrit si le contenu n'a pas changé"""
+        content_hash = hashlib.sha256(payload).hexdigest()
+        with self._lock:
+            self.backup_dir.mkdir(exist_ok=True)
+            entries = self._load_index()
+            if entries and entries[-1]["hash"] == content_hash:
+                return None
+            
+            object_path = self._object_path(content_hash)
+            if not object_path.exists():
+                tmp_file = object_path.with_suffix(".tmp")
+                with gzip.open(tmp_file, 'wb', compresslevel=6) as f:
+                    f.write(payload)
+                os.replace(tmp_file, object_path)
+            
+            now = datetime.datetime.now()
+            entry = {
+                "id": now.strftime("%Y%m%d_%H%M%S_%f"),
+                "created": now.isoformat(),
+                "hash": content_hash,
+                "size": len(payload),
+                "session": session,
+                "reason": reason
+            }
+            entries.append(entry)
+            self._prune()
+            self._save_index()
+            return entry
+    
+    def _prune(self):
+        """Appliquer la politique de rétention et supprimer les contenus orphelins"""
+        entries = self._entries
+        keep = {entry["id"] for entry in entries[-self.KEEP_RECENT:]}
+        hourly, daily, sessions = {}, {}, {}
+        for entry in entries:  # Ordre chronologique : la dernière de chaque heure/jour l'emporte
+            created = datetime.datetime.fromisoformat(entry["created"])
+            hourly[created.strftime("%Y%m%d%H")] = entry["id"]
+            daily[created.strftime("%Y%m%d")] = entry["id"]
+            sessions.setdefault(entry.get("session", ""), entry["id"])
+        
+        for groups, limit in ((hourly, self.KEEP_HOURLY), (daily, self.KEEP_DAILY),
+                              (sessions, self.KEEP_SESSIONS)):
+            keep.update(list(groups.values())[-limit:])
+        
+        removed = [entry for entry in entries if entry["id"] not in keep]
+        if not removed:
+            return
+        
+        self._entries = [entry for entry in entries if entry["id"] in keep]
+        used_hashes = {entry["hash"] for entry in self._entries}
+        for entry in removed:
+            if entry["hash"] not in used_hashes:
+                self._object_path(entry["hash"]).unlink(missing_ok=True)
+                used_hashes.add(entry["hash"])  # Déjà supprimé
+    
+    def list_backups(self) -> List[dict]:
+        """Lister les sauvegardes, de la plus récente à la plus ancienne"""
+        with self._lock:
+            return list(reversed(self._load_index()))
+    
+    def read(self, backup_id: str) -> bytes:
+        """Lire le contenu décompressé d'une sauvegarde"""
+        with self._lock:
+            for entry in self._load_index():
+                if entry["id"] == backup_id:
+                    with gzip.open(self._object_path(entry["hash"]), 'rb') as f:
+                        return f.read()
+        raise KeyError(f"Sauvegarde inconnue: {backup_id}")
+
+# ==================== STOCKAGE SQLITE ====================
+
+# Colonnes indexées de chaque table ; bases et ingrédients gardent en plus
+# leur entrée complète (JSON) dans la colonne "data"
+SQLITE_TABLES = {
+    "bases": ("id", "name", "potion_type"),
+    "ingredients": ("id", "name", "type", "quality"),
+    "potions": ("id", "name", "base", "ingredient1", "ingredient2", "category",
+                "created_at", "is_favorite", "notes"),
+}
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS bases (
+    id TEXT PRIMARY KEY, name TEXT NOT NULL, potion_type TEXT, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS ingredients (
+    id TEXT PRIMARY KEY, name TEXT NOT NULL, type TEXT, quality TEXT, data TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS potions (
+    id TEXT PRIMARY KEY, name TEXT NOT NULL, base TEXT NOT NULL,
+    ingredient1 TEXT NOT NULL, ingredient2 TEXT NOT NULL, category TEXT,
+    created_at TEXT, is_favorite INTEGER NOT NULL DEFAULT 0, notes TEXT NOT NULL DEFAULT '');
+CREATE INDEX IF NOT EXISTS idx_ingredients_type ON ingredients (type);
+CREATE INDEX IF NOT EXISTS idx_potions_combination ON potions (base, ingredient1, ingredient2);
+CREATE INDEX IF NOT EXISTS idx_potions_ingredient1 ON potions (ingredient1);
+CREATE INDEX IF NOT EXISTS idx_potions_ingredient2 ON potions (ingredient2);
+CREATE INDEX IF NOT EXISTS idx_potions_category ON potions (category);
+CREATE INDEX IF NOT EXISTS idx_potions_created_at ON potions (created_at);
+CREATE INDEX IF NOT EXISTS idx_potions_favorite ON potions (is_favorite);
+CREATE VIRTUAL TABLE IF NOT EXISTS potion_search USING fts5(
+    terms, tokenize="unicode61 remove_diacritics 0 tokenchars '_'");
+CREATE TRIGGER IF NOT EXISTS potion_search_insert AFTER INSERT ON potions BEGIN
+    INSERT INTO potion_search (rowid, terms) VALUES (new.rowid, search_text(new.name || ' ' || new.notes));
+END;
+CREATE TRIGGER IF NOT EXISTS potion_search_delete AFTER DELETE ON potions BEGIN
+    DELETE FROM potion_search WHERE rowid = old.rowid;
+END;
+CREATE TRIGGER IF NOT EXISTS potion_search_update AFTER UPDATE ON potions BEGIN
+    UPDATE potion_search SET terms = search_text(new.name || ' ' || new.notes) WHERE rowid = new.rowid;
+END;
+"""
+
+# Version du schéma (PRAGMA user_version) ; 1 : index plein texte des potions
+SQLITE_SCHEMA_VERSION = 1
+
+# Pages copiées par pas lors d'une sauvegarde de la base (verrou relâché entre deux pas)
+SQLITE_BACKUP_PAGES = 256
+
+# Terme d'une recherche : préfixe, ingrédients et bases dont un terme commence par lui
+SearchTerm = Tuple[str, Sequence[str], Sequence[str]]
+
+# Tri de la liste des potions -> clause ORDER BY
+SQLITE_POTION_ORDER = {
+    "Nom": "casefold(name)",
+    "Catégorie": "category",
+    "Date": "created_at DESC",
+    "Base": "base",
+}
+
+
+class SQLiteConnection:
+    """Connexion SQLite partagée par le thread Tk et les tâches de fond
+    
+    Chaque accès est sérialisé par un verrou. Les lectures longues
+    (``iter_rows``) sont lues par paquets et relâchent le verrou entre
+    deux paquets : un export en cours ne bloque pas les écritures de
+    l'interface, qui restent visibles aux lectures suivantes.
+    """
+    
+    # Lignes lues par prise du verrou dans ``iter_rows``
+    FETCH_SIZE = 500
+    
+    def __init__(self, db_file: Path):
+        self.lock = threading.RLock()
+        self._conn = sqlite3.connect(str(db_file), check_same_thread=False)
+    
+    def create_function(self, name: str, num_params: int, func: Callable):
+        with self.lock:
+            self._conn.create_function(name, num_params, func, deterministic=True)
+    
+    def executescript(self, script: str):
+        with self.lock:
+            self._conn.executescript(script)
+    
+    def execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        """Exécuter une écriture (le curseur renvoyé ne sert qu'à ``rowcount``)"""
+        with self.lock:
+            return self._conn.execute(sql, params)
+    
+    def executemany(self, sql: str, rows: Iterable):
+        with self.lock:
+            self._conn.executemany(sql, rows)
+    
+    def fetchone(self, sql: str, params=()) -> Optional[tuple]:
+        with self.lock:
+            return self._conn.execute(sql, params).fetchone()
+    
+    def fetchall(self, sql: str, params=()) -> List[tuple]:
+        with self.lock:
+            return self._conn.execute(sql, params).fetchall()
+    
+    def iter_rows(self, sql: str, params=()) -> Iterator[tuple]:
+        """Parcourir le résultat d'une requête, paquet par paquet"""
+        with self.lock:
+            cursor = self._conn.execute(sql, params)
+        while True:
+            with self.lock:
+                rows = cursor.fetchmany(self.FETCH_SIZE)
+            if not rows:
+                return
+            yield from rows
+    
+    def commit(self):
+        with self.lock:
+            self._conn.commit()
+    
+    def close(self):
+        with self.lock:
+            self._conn.commit()
+            self._conn.close()
+
+
+class SQLiteTable(MutableMapping):
+    """Section du document (bases, ingredients, potions) adossée à une table
+    
+    Se manipule comme le dictionnaire d'origine ; les lignes ne sont lues
+    qu'à la demande, sauf si ``cached`` (petites tables lues en entier).
+    Les écritures ne sont validées qu'au ``commit`` du DataManager.
+    """
+    
+    def __init__(self, conn: SQLiteConnection, table: str, cached: bool = False):
+        self.conn = conn
+        self.table = table
+        self.columns = SQLITE_TABLES[table]
+        self._has_data = table != "potions"
+        self._cache: Optional[dict] = None
+        if cached:
+            self._cache = dict(self._select_items())
+    
+    def _row_to_dict(self, row: tuple) -> dict:
+        if self._has_data:
+            return json.loads(row[-1])
+        value = dict(zip(self.columns, row))
+        value["is_favorite"] = bool(value["is_favorite"])
+        return value
+    
+    def _select_items(self, where: str = "", params: tuple = ()) -> Iterator[Tuple[str, dict]]:
+        columns = ", ".join(self.columns + (("data",) if self._has_data else ()))
+        for row in self.conn.iter_rows(f"SELECT {columns} FROM {self.table} {where}", params):
+            yield row[0], self._row_to_dict(row)
+    
+    def __getitem__(self, item_id: str) -> dict:
+        if self._cache is not None:
+            return self._cache[item_id]
+        for _, value in self._select_items("WHERE id = ?", (item_id,)):
+            return value
+        raise KeyError(item_id)
+    
+    def __setitem__(self, item_id: str, value: dict):
+        row = [item_id] + [value.get(column) for column in self.columns[1:]]
+        if self._has_data:
+            row.append(json.dumps(value, ensure_ascii=False))
+        else:
+            row[self.columns.index("is_favorite")] = int(bool(value.get("is_favorite")))
+            row[self.columns.index("notes")] = value.get("notes") or ""
+        placeholders = ", ".join("?" * len(row))
+        self.conn.execute(f"INSERT OR REPLACE INTO {self.table} VALUES ({placeholders})", row)
+        if self._cache is not None:
+            self._cache[item_id] = value
+    
+    def __delitem__(self, item_id: str):
+        cursor = self.conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (item_id,))
+        if self._cache is not None:
+            self._cache.pop(item_id, None)
+        if cursor.rowcount == 0:
+            raise KeyError(item_id)
+    
+    def __contains__(self, item_id) -> bool:
+        if self._cache is not None:
+            return item_id in self._cache
+        return self.conn.fetchone(f"SELECT 1 FROM {self.table} WHERE id = ?", (item_id,)) is not None
+    
+    def __iter__(self) -> Iterator[str]:
+        if self._cache is not None:
+            return iter(list(self._cache))
+        return (row[0] for row in self.conn.iter_rows(f"SELECT id FROM {self.table}"))
+    
+    def __len__(self) -> int:
+        if self._cache is not None:
+            return len(self._cache)
+        return self.conn.fetchone(f"SELECT COUNT(*) FROM {self.table}")[0]
+    
+    def items(self):
+        """Parcourir les entrées en une seule requête"""
+        if self._cache is not None:
+            return list(self._cache.items())
+        return self._select_items()
+    
+    def values(self):
+        """Parcourir les valeurs en une seule requête"""
+        return (value for _, value in self.items())
+    
+    def iter_many(self, item_ids: Iterable[str], chunk_size: int = 500) -> Iterator[Tuple[str, dict]]:
+        """Parcourir des entrées dans l'ordre donné, par paquets de ``chunk_size`` requêtes"""
+        if self._cache is not None:
+            for item_id in item_ids:
+                if item_id in self._cache:
+                    yield item_id, self._cache[item_id]
+            return
+        
+        item_ids = iter(item_ids)
+        while True:
+            chunk = [item_id for _, item_id in zip(range(chunk_size), item_ids)]
+            if not chunk:
+                return
+            placeholders = ", ".join("?" * len(chunk))
+            found = dict(self._select_items(f"WHERE id IN ({placeholders})", tuple(chunk)))
+            for item_id in chunk:
+                if item_id in found:
+                    yield item_id, found[item_id]
+    
+    def clear(self):
+        self.conn.execute(f"DELETE FROM {self.table}")
+        if self._cache is not None:
+            self._cache.clear()
+
+
+class SQLiteStore:
+    """Stockage SQLite : tables indexées pour bases, ingrédients et potions
+    
+    Les sections non tabulaires (version, metadata, config, tags, favorites)
+    sont rangées en JSON dans la table ``meta``.
+    """
+    
+    META_KEYS = ("version", "metadata", "config", "tags", "favorites")
+    
+    def __init__(self, db_file: Path):
+        self.db_file = Path(db_file)
+        self.conn = SQLiteConnection(self.db_file)
+        self.conn.create_function("casefold", 1, lambda text: (text or "").casefold())
+        # Texte indexé des potions (nom et notes), mêmes termes que PotionTextIndex
+        self.conn.create_function("search_text", 1, lambda text: " ".join(search_terms(text or "")))
+        # INSERT OR REPLACE doit déclencher la suppression de l'ancienne ligne de l'index
+        self.conn.execute("PRAGMA recursive_triggers = ON")
+        self.conn.executescript(SQLITE_SCHEMA)
+        if self.conn.fetchone("PRAGMA user_version")[0] < SQLITE_SCHEMA_VERSION:
+            # Base antérieure à l'index plein texte : le remplir une fois
+            self.conn.execute("DELETE FROM potion_search")
+            self.conn.execute("INSERT INTO potion_search (rowid, terms)"
+                              " SELECT rowid, search_text(name || ' ' || notes) FROM potions")
+            self.conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+            self.conn.commit()
+    
+    def is_empty(self) -> bool:
+        return self.conn.fetchone("SELECT 1 FROM meta LIMIT 1") is None
+    
+    def load(self) -> dict:
+        """Construire le document : tables en sections paresseuses"""
+        data = {}
+        for key, value in self.conn.fetchall("SELECT key, value FROM meta"):
+            data[key] = json.loads(value)
+        data["bases"] = SQLiteTable(self.conn, "bases", cached=True)
+        data["ingredients"] = SQLiteTable(self.conn, "ingredients", cached=True)
+        data["potions"] = SQLiteTable(self.conn, "potions")
+        return data
+    
+    def write_meta(self, data: dict):
+        """Écrire les sections non tabulaires"""
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta VALUES (?, ?)",
+            [(key, json.dumps(data[key], ensure_ascii=False)) for key in self.META_KEYS if key in data])
+    
+    def write_document(self, data: dict):
+        """Remplacer tout le contenu par un document au format v2.0"""
+        for table in SQLITE_TABLES:
+            target = SQLiteTable(self.conn, table)
+            target.clear()
+            for item_id, value in data.get(table, {}).items():
+                target[item_id] = value
+        self.conn.execute("DELETE FROM meta")
+        self.write_meta(data)
+    
+    def commit(self):
+        self.conn.commit()
+    
+    def close(self):
+        self.conn.close()
+    
+    def snapshot_bytes(self) -> bytes:
+        """Contenu validé de la base, copié par l'API de sauvegarde de SQLite
+        
+        Utilisable hors du thread de l'interface : la copie passe par ses
+        propres connexions, sans le verrou de la connexion partagée.
+        """
+        fd, tmp_name = tempfile.mkstemp(suffix=".backup", dir=self.db_file.parent)
+        os.close(fd)
+        try:
+            source = sqlite3.connect(self.db_file)
+            try:
+                target = sqlite3.connect(tmp_name)
+                try:
+                    source.backup(target, pages=SQLITE_BACKUP_PAGES)
+                finally:
+                    target.close()
+            finally:
+                source.close()
+            return Path(tmp_name).read_bytes()
+        finally:
+            os.unlink(tmp_name)
+    
+    # ---------- Requêtes ----------
+    
+    @staticmethod
+    def _potion_filters(search: str = "", category: Optional[str] = None,
+                        favorites_only: bool = False, terms: Sequence[SearchTerm] = ()) -> Tuple[str, list]:
+        clauses, params = [], []
+        if search:
+            clauses.append("instr(casefold(name), ?) > 0")
+            params.append(search.casefold())
+        for prefix, ingredient_ids, base_ids in terms:
+            # Chaque terme : nom ou notes (index plein texte), un ingrédient ou la base
+            matches = ["rowid IN (SELECT rowid FROM potion_search WHERE potion_search MATCH ?)"]
+            params.append(f'"{prefix}"*')
+            if ingredient_ids:
+                placeholders = ", ".join("?" * len(ingredient_ids))
+                matches += [f"ingredient1 IN ({placeholders})", f"ingredient2 IN ({placeholders})"]
+                params += list(ingredient_ids) * 2
+            if base_ids:
+                matches.append(f"base IN ({', '.join('?' * len(base_ids))})")
+                params += list(base_ids)
+            clauses.append(f"({' OR '.join(matches)})")
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if favorites_only:
+            clauses.append("is_favorite = 1")
+        return ("WHERE " + " AND ".join(clauses)) if clauses else "", params
+    
+    def has_combination(self, base_id: str, ingredient1_id: str, ingredient2_id: str) -> bool:
+        row = self.conn.fetchone(
+            "SELECT 1 FROM potions WHERE base = ? AND ((ingredient1 = ? AND ingredient2 = ?)"
+            " OR (ingredient1 = ? AND ingredient2 = ?)) LIMIT 1",
+            (base_id, ingredient1_id, ingredient2_id, ingredient2_id, ingredient1_id))
+        return row is not None
+    
+    def potion_ids_using_ingredient(self, ing_id: str) -> set:
+        rows = self.conn.fetchall("SELECT id FROM potions WHERE ingredient1 = ?"
+                                  " UNION SELECT id FROM potions WHERE ingredient2 = ?", (ing_id, ing_id))
+        return {row[0] for row in rows}
+    
+    def potion_ids_using_base(self, base_id: str) -> set:
+        return {row[0] for row in self.conn.fetchall("SELECT id FROM potions WHERE base = ?", (base_id,))}
+    
+    def query_potion_ids(self, search: str = "", category: Optional[str] = None,
+                         favorites_only: bool = False, sort_by: str = "Nom",
+                         limit: Optional[int] = None, offset: int = 0,
+                         terms: Sequence[SearchTerm] = ()) -> List[str]:
+        where, params = self._potion_filters(search, category, favorites_only, terms)
+        order = SQLITE_POTION_ORDER.get(sort_by, "rowid")
+        sql = f"SELECT id FROM potions {where} ORDER BY {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [row[0] for row in self.conn.fetchall(sql, params)]
+    
+    def count_potions(self, search: str = "", category: Optional[str] = None,
+                      favorites_only: bool = False, terms: Sequence[SearchTerm] = ()) -> int:
+        where, params = self._potion_filters(search, category, favorites_only, terms)
+        return self.conn.fetchone(f"SELECT COUNT(*) FROM potions {where}", params)[0]
+    
+    def count_by(self, column: str) -> Dict[str, int]:
+        """Compter les potions par valeur d'une colonne indexée"""
+        if column not in SQLITE_TABLES["potions"]:
+            raise ValueError(f"Colonne inconnue: {column}")
+        return dict(self.conn.fetchall(f"SELECT {column}, COUNT(*) FROM potions GROUP BY {column}"))
+    
+    def ingredient_usage(self) -> Dict[str, int]:
+        usage = {}
+        for column in ("ingredient1", "ingredient2"):
+            for ing_id, count in self.count_by(column).items():
+                usage[ing_id] = usage.get(ing_id, 0) + count
+        return usage
+
+# ==================== SIGNALEMENT DES ERREURS ====================
+
+def _print_error(title: str, message: str):
+    """Signalement par défaut : sur la sortie d'erreur"""
+    print(f"{title}: {message}", file=sys.stderr)
+
+# Remplacé par l'interface graphique (boîte de dialogue) ; la ligne de
+# commande garde la sortie d'erreur
+_error_handler: Callable[[str, str], None] = _print_error
+
+def set_error_handler(handler: Optional[Callable[[str, str], None]]):
+    """Choisir la fonction appelée avec (titre, message) pour les erreurs"""
+    global _error_handler
+    _error_handler = handler or _print_error
+
+def report_error(title: str, message: str):
+    """Signaler une erreur à l'utilisateur, quel que soit le frontal"""
+    _error_handler(title, message)
+
+
+# ==================== DATA MANAGER ====================
+
+class DataManager:
+    """Gestionnaire de données avec sauvegarde automatique
+    
+    Modes de stockage, choisis par ``config.storage`` :
+    - "json" : les sections modifiées sont marquées "sales" et le document
+      complet est réécrit en différé, hors du thread de l'interface
+    - "journal" : chaque modification ajoute un enregistrement au journal
+      (``potions_data.journal``), compacté en tâche de fond dans le JSON
+    Un fichier ``.sqlite``/``.db`` utilise le mode "sqlite" (tables indexées,
+    potions lues à la demande).
+    """
+    
+    SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+    
+    # Taille du journal au-delà de laquelle une compaction est lancée
+    JOURNAL_COMPACT_BYTES = 1024 * 1024
+    # Période de calme (secondes) avant l'écriture différée en mode "json"
+    SAVE_DELAY = 0.5
+    
+    def __init__(self, data_file: str = "data/potions_data.json"):
+        self.data_file = Path(data_file)
+        self.backup_dir = Path("backups")
+        self.journal_file = self.data_file.with_suffix(".journal")
+        self.compacting_file = self.data_file.with_suffix(".journal.compacting")
+        self._journal_handle = None
+        self._journal_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        self._pending_records: Optional[List[dict]] = None
+        self._sqlite: Optional[SQLiteStore] = None
+        # Import en flux vers une base SQLite temporaire (voir stage_document)
+        self._staged_store: Optional[SQLiteStore] = None
+        self._staged_data: Optional[dict] = None
+        # Écriture différée : sections modifiées depuis la dernière sauvegarde
+        self._dirty_sections = set()
+        self._data_lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._save_timer: Optional[threading.Timer] = None
+        # Sauvegardes : la première écriture de la session, puis selon backup_frequency
+        self.backups = BackupStore(self.backup_dir, suffix=self.data_file.suffix)
+        self.session_id = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        self._saves_since_backup = 0
+        self._last_backup_time: Optional[datetime.datetime] = None
+        # Sauvegarde d'une base SQLite en cours (copie et compression en tâche de fond)
+        self._backup_thread: Optional[threading.Thread] = None
+        self.data = self._load_data()
+        self._ensure_directories()
+    
+    @property
+    def storage(self) -> str:
+        """Mode de stockage ("json", "journal" ou "sqlite")"""
+        if self._sqlite is not None:
+            return "sqlite"
+        return self.data.get("config", {}).get("storage", "json")
+    
+    @property
+    def sqlite(self) -> Optional[SQLiteStore]:
+        """Base SQLite sous-jacente (None pour les modes JSON)"""
+        return self._sqlite
+    
+    def _ensure_directories(self):
+        """Créer les dossiers nécessaires"""
+        self.data_file.parent.mkdir(exist_ok=True)
+        self.backup_dir.mkdir(exist_ok=True)
+        Path("exports").mkdir(exist_ok=True)
+    
+    def _load_data(self) -> dict:
+        """Charger les données depuis le fichier JSON"""
+        if self.data_file.suffix in self.SQLITE_SUFFIXES:
+            return self._load_sqlite()
+        
+        if not self.data_file.exists():
+            return self._create_default_data()
+        
+        try:
+            with open(self.data_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            data = self._migrate_data(data)
+        except (json.JSONDecodeError, FileNotFoundError, Exception) as e:
+            report_error("Erreur", f"Impossible de charger les données: {e}")
+            return self._create_default_data()
+        
+        # Rejouer les modifications journalisées depuis le dernier instantané
+        for journal in (self.compacting_file, self.journal_file):
+            self._replay_journal(journal, data)
+        return data
+    
+    def _load_sqlite(self) -> dict:
+        """Ouvrir la base SQLite, initialisée depuis le JSON voisin si elle est neuve"""
+        try:
+            self.data_file.parent.mkdir(exist_ok=True)
+            self._sqlite = SQLiteStore(self.data_file)
+            if self._sqlite.is_empty():
+                json_file = self.data_file.with_suffix(".json")
+                if json_file.exists():
+                    with open(json_file, 'r', encoding='utf-8') as f:
+                        initial_data = self._migrate_data(json.load(f))
+                else:
+                    initial_data = self._create_default_data()
+                self._sqlite.write_document(initial_data)
+                self._sqlite.commit()
+            return self._sqlite.load()
+        except (sqlite3.Error, json.JSONDecodeError, OSError) as e:
+            report_error("Erreur", f"Impossible d'ouvrir la base SQLite: {e}")
+            raise
+    
+    def _create_default_data(self) -> dict:
+        """Créer la structure de données par défaut"""
+        return {
+            "version": "2.0",
+            "metadata": {
+                "created": datetime.datetime.now().isoformat(),
+                "last_modified": datetime.datetime.now().isoformat(),
+                "total_potions": 0,
+                "total_ingredients": 0
+            },
+            "config": {
+                "auto_save": True,
+                "backup_frequency": 10,
+                "storage": "json",
+                "theme": "light"
+            },
+            "bases": {
+                "eau": {"id": "eau", "name": "Eau", "potion_type": "Potion", "description": "Base liquide standard"},
+                "huile": {"id": "huile", "name": "Huile", "potion_type": "Poison", "description": "Base huileuse toxique"},
+                "pate": {"id": "pate", "name": "Pâte", "potion_type": "Onguent", "description": "Base épaisse topique"},
+                "vin": {"id": "vin", "name": "Vin alchimique", "potion_type": "Filtre", "description": "Base alcoolisée magique"},
+                "cendre": {"id": "cendre", "name": "Cendre", "potion_type": "Substrat", "description": "Base poudreuse rituelle"},
+                "quartz": {"id": "quartz", "name": "Poudre de quartz", "potion_type": "Médicament", "description": "Base cristalline curative"}
+            },
+            "ingredients": {},
+            "potions": {},
+            "tags": [],
+            "favorites": []
+        }
+
+    def _migrate_data(self, old_data: dict) -> dict:
+        """Migrer l'ancien format vers le nouveau"""
+        if "version" in old_data and old_data["version"] == "2.0":
+            for ing_id, ing_data in old_data.get("ingredients", {}).items():
+                self.migrate_ingredient(ing_id, ing_data)
+            potions = old_data.get("potions", {})
+            if isinstance(potions, dict):
+                for potion_data in potions.values():
+                    self.migrate_potion(potion_data)
+            return old_data
+        
+        new_data = self._create_default_data()
+        if "ingredients" in old_data:
+            for name, props in old_data["ingredients"].items():
+                ingredient_id, ing_data = self.migrate_ingredient(name, props, legacy=True)
+                new_data["ingredients"][ingredient_id] = ing_data
+        if "potions_creees" in old_data:
+            for i, potion in enumerate(old_data["potions_creees"]):
+                potion_id, potion_data = self.migrate_legacy_potion(i, potion)
+                new_data["potions"][potion_id] = potion_data
+        return new_data
+    
+    # ---------- Migration d'un enregistrement ----------
+    
+    @staticmethod
+    def migrate_ingredient(ing_id: str, ing_data: dict, legacy: bool = False) -> Tuple[str, dict]:
+        """Migrer un ingrédient ; l'ancien format est indexé par nom (effet, qualité, durée)"""
+        if legacy:
+            ingredient_id = ing_id.lower().replace(" ", "_").replace("'", "")
+            return ingredient_id, {
+                "id": ingredient_id,
+                "name": ing_id,
+                "effect": ing_data.get("effet", ""),
+                "type": ing_data.get("type", "positif"),
+                "quality": ing_data.get("qualité", "Mineur"),
+                "duration": ing_data.get("durée", "Instantané"),
+                "rarity": "Commun",
+                "description": "",
+                "allowed_potion_types": DEFAULT_POTION_TYPES
+            }
+        
+        if "allowed_potion_types" not in ing_data:
+            ing_data["allowed_potion_types"] = DEFAULT_POTION_TYPES
+        ing_data.pop("contraindications", None)
+        ing_data.pop("synergies", None)
+        return ing_id, ing_data
+    
+    @staticmethod
+    def migrate_potion(potion_data: dict) -> dict:
+        """Migrer une potion au format v2.0"""
+        # Les IDs et catégories se répètent d'une potion à l'autre : une seule copie
+        for field in ("base", "ingredient1", "ingredient2", "category"):
+            if field in potion_data:
+                potion_data[field] = _intern(potion_data[field])
+        return potion_data
+    
+    @staticmethod
+    def migrate_legacy_potion(index: int, potion: dict) -> Tuple[str, dict]:
+        """Convertir une entrée de l'ancienne liste ``potions_creees``"""
+        potion_id = f"potion_{index+1}"
+        return potion_id, {
+            "id": potion_id,
+            "name": potion.get("nom", ""),
+            "base": potion.get("base", ""),
+            "ingredient1": potion.get("ingredient1", ""),
+            "ingredient2": potion.get("ingredient2", ""),
+            "category": potion.get("categorie", "Mineur"),
+            "created_at": datetime.datetime.now().isoformat(),
+            "is_favorite": False,
+            "notes": ""
+        }
+
+    def save_data(self):
+        """Sauvegarder immédiatement toutes les données"""
+        self._cancel_scheduled_save()
+        with self._save_lock:
+            self._dirty_sections.clear()
+            try:
+                if self._sqlite is not None:
+                    self._save_sqlite()
+                    return
+                
+                if self.storage == "journal":
+                    # Un instantané complet rend le journal (et toute compaction en cours) obsolète
+                    self._wait_for_compaction()
+                    self._close_journal()
+                
+                self._write_snapshot(self.data)
+                
+                for journal in (self.compacting_file, self.journal_file):
+                    if journal.exists():
+                        journal.unlink()
+            except Exception as e:
+                report_error("Erreur de sauvegarde", f"Impossible de sauvegarder: {e}")
+    
+    def _save_sqlite(self):
+        """Valider la base SQLite (les lignes sont écrites au fil des modifications)"""
+        self.data["metadata"]["last_modified"] = datetime.datetime.now().isoformat()
+        self.data["metadata"]["total_potions"] = len(self.data["potions"])
+        self.data["metadata"]["total_ingredients"] = len(self.data["ingredients"])
+        self._sqlite.write_meta(self.data)
+        self._sqlite.commit()
+        self._maybe_backup()
+    
+    def replace_data(self, data: dict):
+        """Remplacer tout le document (import) et le sauvegarder
+        
+        ``data`` peut venir de ``stage_document`` : en mode SQLite, la base
+        temporaire remplace alors directement le fichier de données.
+        """
+        if self._sqlite is not None and data is self._staged_data:
+            self._install_staged()
+        elif self._sqlite is not None:
+            self._sqlite.write_document(data)
+            self.data = self._sqlite.load()
+        else:
+            self.data = data
+        self.save_data()
+    
+    def stage_document(self) -> dict:
+        """Document par défaut à remplir (import en flux), puis à passer à ``replace_data``
+        
+        En mode SQLite, bases, ingrédients et potions sont les tables d'une
+        base temporaire : les entrées importées ne restent pas en mémoire et
+        les données actuelles restent lisibles jusqu'au remplacement.
+        """
+        data = self._create_default_data()
+        if self._sqlite is None:
+            return data
+        
+        self.discard_staged()
+        staging_file = self.data_file.with_suffix(self.data_file.suffix + ".importing")
+        if staging_file.exists():
+            staging_file.unlink()
+        self._staged_store = SQLiteStore(staging_file)
+        self._staged_store.write_document(data)
+        self._staged_data = self._staged_store.load()
+        return self._staged_data
+    
+    def discard_staged(self):
+        """Abandonner le document en préparation (import annulé ou en échec)"""
+        if self._staged_store is not None:
+            self._staged_store.close()
+            self._staged_store.db_file.unlink(missing_ok=True)
+        self._staged_store = None
+        self._staged_data = None
+    
+    def _install_staged(self):
+        """Remplacer la base SQLite par la base temporaire remplie par l'import"""
+        store, data = self._staged_store, self._staged_data
+        self._staged_store = self._staged_data = None
+        store.write_meta(data)
+        store.close()
+        with self._save_lock:
+            self._sqlite.close()
+            self._sqlite = None
+            os.replace(store.db_file, self.data_file)
+            self.data = self._load_data()
+    
+    def export_document(self) -> dict:
+        """Document complet au format v2.0 (sections SQLite matérialisées)"""
+        self.sync()
+        return {key: dict(value.items()) if isinstance(value, SQLiteTable) else value
+                for key, value in self.data.items()}
+    
+    def _backup_frequency(self) -> Tuple[int, Optional[float]]:
+        """Lire config.backup_frequency : N sauvegardes, ou {"saves": N, "minutes": T}"""
+        frequency = self.data.get("config", {}).get("backup_frequency", 10)
+        if isinstance(frequency, dict):
+            return int(frequency.get("saves", 10)), frequency.get("minutes")
+        return int(frequency), None
+    
+    def _maybe_backup(self):
+        """Sauvegarder le fichier actuel avant de l'écraser, si la fréquence l'exige"""
+        if not self.data_file.exists():
+            return
+        
+        saves, minutes = self._backup_frequency()
+        now = datetime.datetime.now()
+        self._saves_since_backup += 1
+        due = (self._last_backup_time is None
+               or self._saves_since_backup >= max(saves, 1)
+               or (minutes is not None and now - self._last_backup_time >= datetime.timedelta(minutes=minutes)))
+        if not due:
+            return
+        
+        if self._sqlite is not None:
+            # Appelé dans le thread Tk après chaque validation : la base est
+            # copiée et compressée hors de ce thread
+            if self._backup_thread is not None and self._backup_thread.is_alive():
+                return  # Nouvel essai au prochain enregistrement
+            self._saves_since_backup = 0
+            self._last_backup_time = now
+            self._backup_thread = threading.Thread(target=self._run_sqlite_backup,
+                                                   args=(self._sqlite,), daemon=True)
+            self._backup_thread.start()
+            return
+        
+        try:
+            self.backups.add(self.data_file.read_bytes(), self.session_id)
+        except OSError as e:
+            # Une sauvegarde manquée ne doit pas empêcher l'écriture des données
+            print(f"Impossible de créer la sauvegarde: {e}", file=sys.stderr)
+            return
+        self._saves_since_backup = 0
+        self._last_backup_time = now
+    
+    def _run_sqlite_backup(self, store: SQLiteStore):
+        """Sauvegarder la base SQLite (exécuté hors du thread de l'interface)"""
+        try:
+            self.backups.add(store.snapshot_bytes(), self.session_id)
+        except (OSError, sqlite3.Error) as e:
+            print(f"Impossible de créer la sauvegarde: {e}", file=sys.stderr)
+    
+    def _wait_for_backup(self):
+        """Attendre la fin d'une sauvegarde SQLite en cours"""
+        thread = self._backup_thread
+        if thread is not None:
+            thread.join()
+            self._backup_thread = None
+    
+    def create_backup(self, reason: str = "manuelle") -> Optional[dict]:
+        """Créer immédiatement une sauvegarde du fichier de données"""
+        self.sync()
+        if not self.data_file.exists():
+            return None
+        return self.backups.add(self.data_file.read_bytes(), self.session_id, reason)
+    
+    def restore_backup(self, backup_id: str):
+        """Restaurer une sauvegarde et recharger les données"""
+        payload = self.backups.read(backup_id)
+        
+        # L'état actuel reste récupérable
+        self.create_backup(reason="avant restauration")
+        self._close_journal()
+        self._wait_for_backup()
+        
+        with self._save_lock:
+            if self._sqlite is not None:
+                self._sqlite.close()
+                self._sqlite = None
+            tmp_file = self.data_file.with_suffix(self.data_file.suffix + ".tmp")
+            tmp_file.write_bytes(payload)
+            os.replace(tmp_file, self.data_file)
+            for journal in (self.compacting_file, self.journal_file):
+                if journal.exists():
+                    journal.unlink()
+            self._dirty_sections.clear()
+            self.data = self._load_data()
+    
+    def _write_snapshot(self, data: dict):
+        """Écrire un instantané complet de façon atomique"""
+        self._maybe_backup()
+        data["metadata"]["last_modified"] = datetime.datetime.now().isoformat()
+        data["metadata"]["total_potions"] = len(data["potions"])
+        data["metadata"]["total_ingredients"] = len(data["ingredients"])
+        
+        tmp_file = self.data_file.with_suffix(".json.tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_file, self.data_file)
+    
+    # ---------- Modifications ----------
+    
+    def put(self, section: str, item_id: str, value: dict):
+        """Créer ou remplacer une entrée d'une section (bases, ingredients, potions)
+        
+        La valeur remplace l'ancienne entrée sans la modifier en place, ce qui
+        permet à l'écriture différée de travailler sur une copie superficielle.
+        """
+        with self._data_lock:
+            self.data[section][item_id] = value
+        self._record({"op": "put", "section": section, "id": item_id, "value": value})
+    
+    def remove(self, section: str, item_id: str) -> Optional[dict]:
+        """Supprimer une entrée d'une section"""
+        with self._data_lock:
+            value = self.data[section].pop(item_id, None)
+        if value is not None:
+            self._record({"op": "del", "section": section, "id": item_id})
+        return value
+    
+    @contextmanager
+    def batch(self):
+        """Regrouper plusieurs modifications en une seule écriture"""
+        if self._pending_records is not None:
+            yield  # Lot déjà ouvert : les modifications le rejoignent
+            return
+        
+        self._pending_records = []
+        try:
+            yield
+        finally:
+            records, self._pending_records = self._pending_records, None
+            if records:
+                self._persist(records)
+    
+    def _record(self, record: dict):
+        """Enregistrer une modification, immédiatement ou à la fin du lot"""
+        if self._pending_records is not None:
+            self._pending_records.append(record)
+        else:
+            self._persist([record])
+    
+    def _persist(self, records: List[dict]):
+        """Rendre des modifications durables selon le mode de stockage"""
+        if self._sqlite is not None:
+            try:
+                sections = {sub_record["section"] for record in records
+                            for sub_record in record.get("records", [record])}
+                if sections & set(SQLiteStore.META_KEYS):
+                    self._sqlite.write_meta(self.data)
+                self._sqlite.commit()
+                self._maybe_backup()
+            except sqlite3.Error as e:
+                report_error("Erreur de sauvegarde", f"Impossible d'écrire dans la base: {e}")
+            return
+        
+        if self.storage != "journal":
+            for record in records:
+                for sub_record in record.get("records", [record]):
+                    self.mark_dirty(sub_record["section"])
+            self._schedule_save()
+            return
+        
+        try:
+            record = records[0] if len(records) == 1 else {"op": "batch", "records": records}
+            line = json.dumps(record, ensure_ascii=False) + "\n"
+            with self._journal_lock:
+                if self._journal_handle is None:
+                    self._journal_handle = open(self.journal_file, 'a', encoding='utf-8')
+                self._journal_handle.write(line)
+                self._journal_handle.flush()
+                os.fsync(self._journal_handle.fileno())
+                journal_size = self._journal_handle.tell()
+            
+            if journal_size >= self.JOURNAL_COMPACT_BYTES:
+                self.compact()
+        except Exception as e:
+            report_error("Erreur de sauvegarde", f"Impossible d'écrire le journal: {e}")
+    
+    # ---------- Écriture différée ----------
+    
+    def mark_dirty(self, section: str):
+        """Signaler qu'une section doit être réécrite"""
+        with self._data_lock:
+            self._dirty_sections.add(section)
+    
+    @property
+    def is_dirty(self) -> bool:
+        """Des modifications attendent-elles d'être écrites ?"""
+        return bool(self._dirty_sections)
+    
+    def _schedule_save(self):
+        """(Re)démarrer le délai de calme avant l'écriture différée"""
+        self._cancel_scheduled_save()
+        self._save_timer = threading.Timer(self.SAVE_DELAY, self._write_behind)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+    
+    def _cancel_scheduled_save(self):
+        """Annuler l'écriture différée programmée"""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+            self._save_timer = None
+    
+    def _write_dirty(self):
+        """Écrire un instantané cohérent si des sections sont sales"""
+        with self._save_lock:
+            with self._data_lock:
+                if not self._dirty_sections:
+                    return
+                dirty, self._dirty_sections = self._dirty_sections, set()
+                # Copie superficielle : les entrées ne sont jamais modifiées en place
+                snapshot = {key: dict(value) if isinstance(value, dict) else value
+                            for key, value in self.data.items()}
+            try:
+                self._write_snapshot(snapshot)
+            except Exception:
+                with self._data_lock:
+                    self._dirty_sections |= dirty
+                raise
+    
+    def _write_behind(self):
+        """Écriture différée (exécutée hors du thread de l'interface)"""
+        try:
+            self._write_dirty()
+        except Exception as e:
+            # Les sections restent sales : nouvel essai à la prochaine modification ou à la fermeture
+            print(f"Erreur lors de la sauvegarde différée: {e}", file=sys.stderr)
+    
+    def flush(self):
+        """Écrire immédiatement les modifications en attente (rien si tout est à jour)"""
+        self._cancel_scheduled_save()
+        try:
+            self._write_dirty()
+        except Exception as e:
+            report_error("Erreur de sauvegarde", f"Impossible de sauvegarder: {e}")
+    
+    # ---------- Journal ----------
+    
+    @staticmethod
+    def _apply_record(data: dict, record: dict):
+        """Appliquer un enregistrement du journal sur les données"""
+        op = record["op"]
+        if op == "batch":
+            for sub_record in record["records"]:
+                DataManager._apply_record(data, sub_record)
+        elif op == "put":
+            data.setdefault(record["section"], {})[record["id"]] = record["value"]
+        elif op == "del":
+            data.get(record["section"], {}).pop(record["id"], None)
+    
+    def _replay_journal(self, journal: Path, data: dict):
+        """Rejouer un fichier journal sur les données chargées"""
+        if not journal.exists():
+            return
+        
+        with open(journal, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Dernier enregistrement tronqué par un arrêt brutal
+                    print(f"Journal {journal}: enregistrement incomplet ignoré", file=sys.stderr)
+                    break
+                self._apply_record(data, record)
+    
+    def _close_journal(self):
+        """Fermer le fichier journal actif"""
+        with self._journal_lock:
+            if self._journal_handle is not None:
+                self._journal_handle.close()
+                self._journal_handle = None
+    
+    def compact(self, wait: bool = False):
+        """Fusionner le journal dans un nouvel instantané, en tâche de fond
+        
+        Le journal actif est scellé puis rejoué sur l'instantané présent sur
+        disque : la compaction ne touche jamais aux données en mémoire.
+        """
+        with self._journal_lock:
+            if self._compaction_thread is not None and self._compaction_thread.is_alive():
+                pass  # Une compaction est déjà en cours
+            elif self.journal_file.exists() and not self.compacting_file.exists():
+                if self._journal_handle is not None:
+                    self._journal_handle.close()
+                    self._journal_handle = None
+                os.replace(self.journal_file, self.compacting_file)
+                self._compaction_thread = threading.Thread(target=self._run_compaction, daemon=True)
+                self._compaction_thread.start()
+            elif self.compacting_file.exists():
+                # Compaction interrompue lors d'une session précédente
+                self._compaction_thread = threading.Thread(target=self._run_compaction, daemon=True)
+                self._compaction_thread.start()
+        
+        if wait:
+            self._wait_for_compaction()
+    
+    def _run_compaction(self):
+        """Écrire l'instantané compacté (exécuté hors du thread de l'interface)"""
+        try:
+            if self.data_file.exists():
+                with open(self.data_file, 'r', encoding='utf-8') as f:
+                    snapshot = self._migrate_data(json.load(f))
+            else:
+                snapshot = self._create_default_data()
+            
+            self._replay_journal(self.compacting_file, snapshot)
+            self._write_snapshot(snapshot)
+            self.compacting_file.unlink()
+        except Exception as e:
+            # Le segment est conservé et sera rejoué au prochain démarrage
+            print(f"Erreur lors de la compaction du journal: {e}", file=sys.stderr)
+    
+    def _wait_for_compaction(self):
+        """Attendre la fin d'une compaction en cours"""
+        thread = self._compaction_thread
+        if thread is not None:
+            thread.join()
+            self._compaction_thread = None
+    
+    def sync(self):
+        """Rendre le fichier de données complet et à jour"""
+        if self._sqlite is not None:
+            self._sqlite.commit()
+        elif self.storage == "journal":
+            self.compact(wait=True)
+            # Journal écrit pendant la compaction précédente
+            if self.journal_file.exists():
+                self.compact(wait=True)
+        else:
+            self.flush()
+    
+    def close(self):
+        """Fermer le stockage : le fichier de données est laissé complet et à jour"""
+        self.sync()
+        self._close_journal()
+        self.discard_staged()
+        self._wait_for_backup()
+        if self._sqlite is not None:
+            self._sqlite.close()
+            self._sqlite = None
+
+
+# ==================== ESPACE DES COMBINAISONS ====================
+
+# Poids des ingrédients pour les suggestions pondérées (les plus courants d'abord)
+SUGGESTION_WEIGHTS = {
+    "rarity": {"Commun": 8, "Rare": 4, "Légendaire": 2, "Mythique": 1},
+    "quality": {"Mineur": 8, "Majeur": 4, "Légendaire": 2, "Mythique": 1},
+}
+
+class _FenwickTree:
+    """Arbre de Fenwick (sommes préfixes) sur des poids entiers"""
+    
+    def __init__(self, weights: List[int]):
+        self.size = len(weights)
+        self._tree = [0] + list(weights)
+        for index in range(1, self.size + 1):
+            parent = index + (index & -index)
+            if parent <= self.size:
+                self._tree[parent] += self._tree[index]
+        self.total = sum(weights)
+    
+    def add(self, index: int, delta: int):
+        self.total += delta
+        index += 1
+        while index <= self.size:
+            self._tree[index] += delta
+            index += index & -index
+    
+    def find(self, target: int) -> Tuple[int, int]:
+        """Indice dont l'intervalle cumulé contient ``target`` et reste dans cet intervalle"""
+        position = 0
+        step = 1 << self.size.bit_length()
+        while step:
+            following = position + step
+            if following <= self.size and self._tree[following] <= target:
+                position = following
+                target -= self._tree[following]
+            step >>= 1
+        return position, target
+
+class CombinationSpace:
+    """Espace des recettes valides : base × ingrédient positif × négatif
+    
+    Les ingrédients sont numérotés par type ; chaque type de potion a un
+    masque (entier utilisé comme ensemble de bits) des positifs et des
+    négatifs autorisés. Les recettes déjà utilisées sont, par base, un
+    masque de négatifs pour chaque positif. Les comptes restants sont donc
+    exacts sans jamais matérialiser l'espace.
+    """
+    
+    def __init__(self, bases: Iterable[Base], ingredients: Iterable[Ingredient]):
+        self.bases: Dict[str, Base] = {base.id: base for base in bases}
+        self.positives: List[Ingredient] = []
+        self.negatives: List[Ingredient] = []
+        for ingredient in sorted(ingredients, key=lambda ing: ing.id):
+            if ingredient.type == "positif":
+                self.positives.append(ingredient)
+            elif ingredient.type == "négatif":
+                self.negatives.append(ingredient)
+        self._pos_index = {ing.id: index for index, ing in enumerate(self.positives)}
+        self._neg_index = {ing.id: index for index, ing in enumerate(self.negatives)}
+        
+        # Masques par type de potion et par qualité
+        self._pos_masks: Dict[str, int] = {}
+        self._neg_masks: Dict[str, int] = {}
+        self._pos_quality: Dict[str, int] = {}
+        self._neg_quality: Dict[str, int] = {}
+        for ingredients_side, type_masks, quality_masks in ((self.positives, self._pos_masks, self._pos_quality),
+                                                            (self.negatives, self._neg_masks, self._neg_quality)):
+            for index, ingredient in enumerate(ingredients_side):
+                bit = 1 << index
+                for potion_type in ingredient.allowed_potion_types:
+                    type_masks[potion_type] = type_masks.get(potion_type, 0) | bit
+                quality_masks[ingredient.quality] = quality_masks.get(ingredient.quality, 0) | bit
+        
+        # Recettes utilisées : base -> {index positif: masque des négatifs}
+        self._used: Dict[str, Dict[int, int]] = {base_id: {} for base_id in self.bases}
+        self._used_counts: Dict[str, int] = {base_id: 0 for base_id in self.bases}
+        self._used_by_quality: Dict[Tuple[str, str, str], int] = {}
+        # Tirage : (base, pondération) -> poids restant de chaque positif
+        self._samplers: Dict[Tuple[str, Optional[str]], _FenwickTree] = {}
+        self._classes: Dict[Tuple[str, Optional[str]], List[Tuple[int, int]]] = {}
+    
+    def pos_mask(self, base_id: str) -> int:
+        """Positifs autorisés pour une base"""
+        return self._pos_masks.get(self.bases[base_id].potion_type, 0)
+    
+    def neg_mask(self, base_id: str) -> int:
+        """Négatifs autorisés pour une base"""
+        return self._neg_masks.get(self.bases[base_id].potion_type, 0)
+    
+    def _locate(self, base_id: str, ingredient1_id: str, ingredient2_id: str) -> Optional[Tuple[int, int]]:
+        """Indices (positif, négatif) d'une recette valide, ou None"""
+        if base_id not in self.bases:
+            return None
+        pos = self._pos_index.get(ingredient1_id)
+        neg = self._neg_index.get(ingredient2_id)
+        if pos is None or neg is None:
+            pos = self._pos_index.get(ingredient2_id)
+            neg = self._neg_index.get(ingredient1_id)
+            if pos is None or neg is None:
+                return None
+        if not (self.pos_mask(base_id) >> pos) & 1 or not (self.neg_mask(base_id) >> neg) & 1:
+            return None
+        return pos, neg
+    
+    def _set_used(self, base_id: str, pos: int, neg: int, used: bool) -> bool:
+        row = self._used[base_id].get(pos, 0)
+        if bool((row >> neg) & 1) == used:
+            return False
+        row ^= 1 << neg
+        if row:
+            self._used[base_id][pos] = row
+        else:
+            self._used[base_id].pop(pos, None)
+        delta = 1 if used else -1
+        self._used_counts[base_id] += delta
+        key = (base_id, self.positives[pos].quality, self.negatives[neg].quality)
+        self._used_by_quality[key] = self._used_by_quality.get(key, 0) + delta
+        for (sampler_base, weighting), tree in self._samplers.items():
+            if sampler_base == base_id:
+                weight = (self._weight(self.positives[pos], weighting)
+                          * self._weight(self.negatives[neg], weighting))
+                tree.add(pos, -delta * weight)
+        return True
+    
+    def mark_used(self, base_id: str, ingredient1_id: str, ingredient2_id: str) -> bool:
+        """Marquer une recette comme utilisée ; False si invalide ou déjà marquée"""
+        located = self._locate(base_id, ingredient1_id, ingredient2_id)
+        return located is not None and self._set_used(base_id, *located, True)
+    
+    def mark_unused(self, base_id: str, ingredient1_id: str, ingredient2_id: str) -> bool:
+        """Rendre une recette à nouveau disponible"""
+        located = self._locate(base_id, ingredient1_id, ingredient2_id)
+        return located is not None and self._set_used(base_id, *located, False)
+    
+    def is_used(self, base_id: str, ingredient1_id: str, ingredient2_id: str) -> bool:
+        located = self._locate(base_id, ingredient1_id, ingredient2_id)
+        if located is None:
+            return False
+        pos, neg = located
+        return bool((self._used[base_id].get(pos, 0) >> neg) & 1)
+    
+    # ---------- Comptes ----------
+    
+    def total(self, base_id: Optional[str] = None) -> int:
+        """Nombre de recettes valides (pour une base ou toutes)"""
+        if base_id is None:
+            return sum(self.total(base) for base in self.bases)
+        return self.pos_mask(base_id).bit_count() * self.neg_mask(base_id).bit_count()
+    
+    def remaining(self, base_id: Optional[str] = None) -> int:
+        """Nombre de recettes valides encore inutilisées"""
+        if base_id is None:
+            return sum(self.remaining(base) for base in self.bases)
+        return self.total(base_id) - self._used_counts[base_id]
+    
+    def remaining_by_quality(self, base_id: str) -> Dict[Tuple[str, str], int]:
+        """Recettes restantes d'une base par paire (qualité positive, qualité négative)"""
+        pos_mask, neg_mask = self.pos_mask(base_id), self.neg_mask(base_id)
+        counts = {}
+        for pos_quality, pos_bits in self._pos_quality.items():
+            pos_count = (pos_bits & pos_mask).bit_count()
+            for neg_quality, neg_bits in self._neg_quality.items():
+                total = pos_count * (neg_bits & neg_mask).bit_count()
+                if total:
+                    used = self._used_by_quality.get((base_id, pos_quality, neg_quality), 0)
+                    counts[(pos_quality, neg_quality)] = total - used
+        return counts
+    
+    # ---------- Parcours ----------
+    
+    @staticmethod
+    def _bits(mask: int) -> Iterator[int]:
+        """Indices des bits à 1 d'un masque, par ordre croissant"""
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+    
+    @staticmethod
+    def _nth_bit(mask: int, n: int) -> int:
+        """Indice du n-ième bit à 1 (à partir de 0), par blocs de 64 bits"""
+        offset = 0
+        while True:
+            chunk = mask & 0xFFFFFFFFFFFFFFFF
+            count = chunk.bit_count()
+            if n < count:
+                for _ in range(n):
+                    chunk &= chunk - 1
+                return offset + (chunk & -chunk).bit_length() - 1
+            n -= count
+            mask >>= 64
+            offset += 64
+    
+    def iter_unused(self, base_id: Optional[str] = None) -> Iterator[Tuple[str, str, str]]:
+        """Générer les recettes (base, positif, négatif) valides et inutilisées"""
+        base_ids = [base_id] if base_id is not None else list(self.bases)
+        for base in base_ids:
+            neg_mask = self.neg_mask(base)
+            used = self._used[base]
+            for pos in self._bits(self.pos_mask(base)):
+                available = neg_mask & ~used.get(pos, 0)
+                pos_id = self.positives[pos].id
+                for neg in self._bits(available):
+                    yield base, pos_id, self.negatives[neg].id
+    
+    # ---------- Tirage ----------
+    
+    @staticmethod
+    def _weight(ingredient: Ingredient, weighting: Optional[str]) -> int:
+        if weighting is None:
+            return 1
+        return SUGGESTION_WEIGHTS[weighting].get(getattr(ingredient, weighting), 1)
+    
+    def _weight_classes(self, base_id: str, weighting: Optional[str]) -> List[Tuple[int, int]]:
+        """Négatifs autorisés d'une base regroupés par poids : [(poids, masque)]"""
+        key = (base_id, weighting)
+        if key not in self._classes:
+            classes: Dict[int, int] = {}
+            for neg in self._bits(self.neg_mask(base_id)):
+                weight = self._weight(self.negatives[neg], weighting)
+                classes[weight] = classes.get(weight, 0) | (1 << neg)
+            self._classes[key] = sorted(classes.items(), reverse=True)
+        return self._classes[key]
+    
+    def _sampler(self, base_id: str, weighting: Optional[str]) -> _FenwickTree:
+        """Arbre des poids restants par positif, construit à la première demande"""
+        key = (base_id, weighting)
+        tree = self._samplers.get(key)
+        if tree is None:
+            classes = self._weight_classes(base_id, weighting)
+            neg_mask = self.neg_mask(base_id)
+            used = self._used[base_id]
+            weights = [0] * len(self.positives)
+            for pos in self._bits(self.pos_mask(base_id)):
+                available = neg_mask & ~used.get(pos, 0)
+                weights[pos] = self._weight(self.positives[pos], weighting) * sum(
+                    weight * (available & mask).bit_count() for weight, mask in classes)
+            tree = self._samplers[key] = _FenwickTree(weights)
+        return tree
+    
+    def _draw(self, base_ids: List[str], weighting: Optional[str], rng: random.Random) -> Optional[Tuple[int, int, str]]:
+        """Tirer une recette inutilisée : base, puis positif, puis négatif"""
+        trees = [(base_id, self._sampler(base_id, weighting)) for base_id in base_ids]
+        total = sum(tree.total for _, tree in trees)
+        if total <= 0:
+            return None
+        target = rng.randrange(total)
+        for base_id, tree in trees:
+            if target < tree.total:
+                break
+            target -= tree.total
+        
+        pos, target = tree.find(target)
+        target //= self._weight(self.positives[pos], weighting)
+        available = self.neg_mask(base_id) & ~self._used[base_id].get(pos, 0)
+        for weight, mask in self._weight_classes(base_id, weighting):
+            candidates = available & mask
+            span = weight * candidates.bit_count()
+            if target < span:
+                return pos, self._nth_bit(candidates, target // weight), base_id
+            target -= span
+        return None
+    
+    def sample(self, count: int = 1, weighting: Optional[str] = None, base_id: Optional[str] = None,
+               rng: Optional[random.Random] = None) -> List[Tuple[str, str, str]]:
+        """Tirer jusqu'à ``count`` recettes distinctes, valides et inutilisées
+        
+        Tirage uniforme, ou pondéré (``"rarity"``, ``"quality"``) par le
+        produit des poids des deux ingrédients. Chaque tirage coûte un
+        parcours d'arbre de Fenwick et de masque, sans rejet, quelle que
+        soit la part de l'espace déjà utilisée.
+        """
+        rng = rng or random
+        base_ids = [base_id] if base_id is not None else list(self.bases)
+        drawn = []
+        try:
+            for _ in range(count):
+                located = self._draw(base_ids, weighting, rng)
+                if located is None:
+                    break
+                pos, neg, base = located
+                # Marquée le temps du tirage pour obtenir des recettes distinctes
+                self._set_used(base, pos, neg, True)
+                drawn.append((base, pos, neg))
+        finally:
+            for base, pos, neg in drawn:
+                self._set_used(base, pos, neg, False)
+        return [(base, self.positives[pos].id, self.negatives[neg].id) for base, pos, neg in drawn]
+
+# ==================== STATISTIQUES ====================
+
+class StatisticsAggregator:
+    """Compteurs de statistiques tenus à jour à chaque modification
+    
+    Totaux, favorites, potions par catégorie et par base, utilisation des
+    ingrédients, et un tas des ingrédients les plus utilisés. Chaque ajout
+    ou retrait de potion coûte O(1) (plus une insertion dans le tas) ; un
+    favori basculé ou un ingrédient renommé est un retrait suivi d'un ajout.
+    """
+    
+    def __init__(self):
+        self.total = 0
+        self.favorites = 0
+        self.categories: Dict[str, int] = {}
+        self.bases: Dict[str, int] = {}
+        self.ingredient_usage: Dict[str, int] = {}
+        # Tas (-utilisation, ID) avec entrées périmées ignorées à la lecture
+        self._usage_heap: List[Tuple[int, str]] = []
+    
+    @staticmethod
+    def _bump(counter: Dict[str, int], key: str, delta: int):
+        count = counter.get(key, 0) + delta
+        if count > 0:
+            counter[key] = count
+        else:
+            counter.pop(key, None)
+    
+    def _bump_ingredient(self, ing_id: str, delta: int):
+        self._bump(self.ingredient_usage, ing_id, delta)
+        count = self.ingredient_usage.get(ing_id)
+        if count:
+            heapq.heappush(self._usage_heap, (-count, ing_id))
+        if len(self._usage_heap) > 2 * len(self.ingredient_usage) + 64:
+            self._rebuild_heap()
+    
+    def _rebuild_heap(self):
+        self._usage_heap = [(-count, ing_id) for ing_id, count in self.ingredient_usage.items()]
+        heapq.heapify(self._usage_heap)
+    
+    def add(self, potion_data: dict, delta: int = 1):
+        """Compter (ou décompter avec ``delta=-1``) une potion"""
+        self.total += delta
+        if potion_data.get("is_favorite"):
+            self.favorites += delta
+        self._bump(self.categories, potion_data["category"], delta)
+        self._bump(self.bases, potion_data["base"], delta)
+        self._bump_ingredient(potion_data["ingredient1"], delta)
+        self._bump_ingredient(potion_data["ingredient2"], delta)
+    
+    def remove(self, potion_data: dict):
+        self.add(potion_data, -1)
+    
+    def load_counts(self, total: int, favorites: int, categories: Dict[str, int],
+                    bases: Dict[str, int], ingredient_usage: Dict[str, int]):
+        """Initialiser les compteurs à partir d'agrégats déjà calculés (SQLite)"""
+        self.total = total
+        self.favorites = favorites
+        self.categories = {key: count for key, count in categories.items() if count}
+        self.bases = {key: count for key, count in bases.items() if count}
+        self.ingredient_usage = {key: count for key, count in ingredient_usage.items() if count}
+        self._rebuild_heap()
+    
+    def most_used(self, n: int = 1) -> List[Tuple[str, int]]:
+        """Les ``n`` ingrédients les plus utilisés, sous forme (ID, utilisations)"""
+        top, seen = [], set()
+        while self._usage_heap and len(top) < n:
+            negative_count, ing_id = heapq.heappop(self._usage_heap)
+            if ing_id in seen or self.ingredient_usage.get(ing_id) != -negative_count:
+                continue  # Entrée périmée
+            seen.add(ing_id)
+            top.append((ing_id, -negative_count))
+        for ing_id, count in top:
+            heapq.heappush(self._usage_heap, (-count, ing_id))
+        return top
+
+# ==================== POTION MANAGER ====================
+
+# Fréquence (en enregistrements) des appels de progression des longs parcours
+PROGRESS_EVERY = 1000
+
+ProgressCallback = Callable[[int, Optional[int]], None]
+
+
+def iter_section_snapshot(section) -> Iterator[Tuple[str, dict]]:
+    """Parcourir les entrées (ID, valeur) d'une section sur un instantané de ses IDs
+    
+    Utilisable hors du thread de l'interface : les IDs d'un dictionnaire
+    sont copiés d'un bloc et les entrées supprimées entre-temps sont
+    ignorées. Une table SQLite est lue directement par son curseur.
+    """
+    if isinstance(section, SQLiteTable):
+        yield from section.items()
+        return
+    for item_id in list(section):
+        value = section.get(item_id)
+        if value is not None:
+            yield item_id, value
+
+
+class PotionManager:
+    """Gestionnaire principal des potions"""
+    
+    def __init__(self, data_file: str = "data/potions_data.json"):
+        self.data_manager = DataManager(data_file)
+        self.data = self.data_manager.data
+        # Version de l'espace des recettes : change avec les ingrédients et les bases
+        self._space_generation = 0
+        self._rebuild_indexes()
+    
+    @property
+    def store(self) -> Optional[SQLiteStore]:
+        """Base SQLite si ce stockage est utilisé : les requêtes passent par ses index"""
+        return self.data_manager.sqlite
+    
+    # ---------- Index ----------
+    
+    @staticmethod
+    def combination_key(base_id: str, ingredient1_id: str, ingredient2_id: str) -> Tuple[str, str, str]:
+        """Clé (base, ing_a, ing_b) indépendante de l'ordre des ingrédients"""
+        if ingredient1_id <= ingredient2_id:
+            return (base_id, ingredient1_id, ingredient2_id)
+        return (base_id, ingredient2_id, ingredient1_id)
+    
+    def _rebuild_indexes(self):
+        """Reconstruire les index en mémoire (une seule fois au chargement)"""
+        # Objets typés de longue durée, indexés par ID. Les potions sont
+        # matérialisées à la demande ; ces objets sont partagés : ne pas les modifier.
+        self._bases: Dict[str, Base] = {base_id: Base(**base_data)
+                                        for base_id, base_data in self.data["bases"].items()}
+        self._ingredients: Dict[str, Ingredient] = {}
+        for ing_id, ing_data in self.data["ingredients"].items():
+            ingredient = self._build_ingredient(ing_id, ing_data)
+            if ingredient:
+                self._ingredients[ing_id] = ingredient
+        self._ingredient_views: Dict[Optional[str], List[Ingredient]] = {}
+        self._potions: Dict[str, Potion] = {}
+        # Index de recherche plein texte, construit à la première recherche
+        self._text_index: Optional[PotionTextIndex] = None
+        # Espace des recettes, construit à la première utilisation (ou en tâche
+        # de fond, voir prepare_combination_space)
+        self._combination_space: Optional[CombinationSpace] = None
+        self._invalidate_combination_space()
+        
+        # Index d'identité : (libellé affiché | nom exact | nom normalisé) -> ID
+        self._base_identity: Dict[Tuple[str, str], str] = {}
+        for base in self._bases.values():
+            self._register_identity(self._base_identity, base.id, self.base_label(base), base.name)
+        self._ingredient_identity: Dict[Tuple[str, str], str] = {}
+        for ingredient in self._ingredients.values():
+            self._register_identity(self._ingredient_identity, ingredient.id,
+                                    self.ingredient_label(ingredient), ingredient.name)
+        
+        # Compteur par combinaison : tolère d'anciens doublons dans le fichier,
+        # et index inverse ingrédient/base -> potions. En SQLite, les index
+        # de la table (combinaison, ingredient1, ingredient2) en tiennent lieu.
+        self._combination_keys: Optional[Dict[Tuple[str, str, str], int]] = None
+        self._references: Optional[ReferenceIndex] = None
+        self.statistics = StatisticsAggregator()
+        if self.store is not None:
+            # Statistiques initiales calculées par SQLite
+            self.statistics.load_counts(
+                total=len(self.data["potions"]),
+                favorites=self.store.count_by("is_favorite").get(1, 0),
+                categories=self.store.count_by("category"),
+                bases=self.store.count_by("base"),
+                ingredient_usage=self.store.ingredient_usage())
+            return
+        
+        self._combination_keys = {}
+        self._references = ReferenceIndex()
+        for potion_data in self.data["potions"].values():
+            self._index_potion(potion_data)
+    
+    @staticmethod
+    def _build_ingredient(ing_id: str, ing_data: dict) -> Optional[Ingredient]:
+        """Construire un ingrédient, ou None si l'entrée est incomplète"""
+        # Vérifier que toutes les clés nécessaires sont présentes
+        required_keys = ["id", "name", "effect", "type", "quality", "duration"]
+        missing_keys = [key for key in required_keys if key not in ing_data]
+        if missing_keys:
+            print(f"Ingrédient {ing_id} ignoré, clés manquantes: {missing_keys}", file=sys.stderr)
+            return None
+        
+        try:
+            return Ingredient(**ing_data)
+        except TypeError as e:
+            print(f"Ingrédient {ing_id} ignoré: {e}", file=sys.stderr)
+            return None
+    
+    @staticmethod
+    def base_label(base: Base) -> str:
+        """Libellé affiché d'une base"""
+        return f"{base.name} ({base.potion_type})"
+    
+    @staticmethod
+    def ingredient_label(ingredient: Ingredient) -> str:
+        """Libellé affiché d'un ingrédient"""
+        return f"{ingredient.name} ({ingredient.effect})"
+    
+    @staticmethod
+    def _identity_keys(label: str, name: str) -> List[Tuple[str, str]]:
+        return [("label", label), ("name", name), ("slug", normalize_name(name))]
+    
+    def _register_identity(self, identity: dict, item_id: str, label: str, name: str):
+        """Ajouter les clés d'identité d'une base ou d'un ingrédient"""
+        for key in self._identity_keys(label, name):
+            identity[key] = item_id
+    
+    def _unregister_identity(self, identity: dict, item_id: str, label: str, name: str):
+        """Retirer les clés d'identité qui désignent encore cet élément"""
+        for key in self._identity_keys(label, name):
+            if identity.get(key) == item_id:
+                del identity[key]
+    
+    @staticmethod
+    def _lookup_identity(identity: dict, text: str) -> Optional[str]:
+        """Résoudre un libellé affiché, un nom exact ou un nom approché en ID"""
+        text = text.strip()
+        return (identity.get(("label", text))
+                or identity.get(("name", text))
+                or identity.get(("slug", normalize_name(text))))
+    
+    def find_base_id(self, text: str) -> Optional[str]:
+        """ID de la base désignée par un libellé ou un nom"""
+        return self._lookup_identity(self._base_identity, text)
+    
+    def find_ingredient_id(self, text: str, expected_type: Optional[str] = None) -> Optional[str]:
+        """ID de l'ingrédient désigné par un libellé ou un nom (du type attendu)"""
+        ing_id = self._lookup_identity(self._ingredient_identity, text)
+        if ing_id and expected_type and self._ingredients[ing_id].type != expected_type:
+            return None
+        return ing_id
+    
+    def _put_potion(self, potion_id: str, potion_data: dict, old_data: Optional[dict] = None):
+        """Enregistrer une potion et mettre à jour index et caches"""
+        if old_data is None:
+            old_data = self.data["potions"].get(potion_id)
+        if old_data is not None:
+            self._unindex_potion(old_data)
+        self._index_potion(potion_data)
+        if self._text_index is not None and self.store is None:
+            if old_data is not None:
+                self._text_index.remove_potion(old_data)
+            self._text_index.add_potion(potion_data)
+        self._potions.pop(potion_id, None)
+        self.data_manager.put("potions", potion_id, potion_data)
+        if self._combination_space is not None:
+            self._release_combination(old_data)
+            self._combination_space.mark_used(potion_data["base"], potion_data["ingredient1"],
+                                              potion_data["ingredient2"])
+        elif self._space_changes is not None:
+            self._note_space_change(old_data)
+            self._note_space_change(potion_data)
+    
+    def _remove_potion(self, potion_id: str) -> Optional[dict]:
+        """Supprimer une potion et mettre à jour index et caches"""
+        potion_data = self.data_manager.remove("potions", potion_id)
+        if potion_data is not None:
+            self._unindex_potion(potion_data)
+            if self._combination_space is not None:
+                self._release_combination(potion_data)
+            elif self._space_changes is not None:
+                self._note_space_change(potion_data)
+            if self._text_index is not None and self.store is None:
+                self._text_index.remove_potion(potion_data)
+            self._potions.pop(potion_id, None)
+        return potion_data
+    
+    def _release_combination(self, potion_data: Optional[dict]):
+        """Rendre la recette d'une potion disponible si plus aucune potion ne l'utilise"""
+        if potion_data is None:
+            return
+        combination = (potion_data["base"], potion_data["ingredient1"], potion_data["ingredient2"])
+        if not self.has_combination(*combination):
+            self._combination_space.mark_unused(*combination)
+    
+    def _note_space_change(self, potion_data: Optional[dict]):
+        """Noter une recette modifiée pendant une construction de l'espace en tâche de fond"""
+        if potion_data is not None:
+            self._space_changes.add((potion_data["base"], potion_data["ingredient1"], potion_data["ingredient2"]))
+    
+    def _invalidate_combination_space(self):
+        """Oublier l'espace des recettes ; les constructions en cours deviennent périmées"""
+        self._combination_space = None
+        self._space_generation += 1
+        # Recettes modifiées depuis le début d'une construction en tâche de fond
+        self._space_changes: Optional[set] = None
+    
+    def _put_ingredient(self, ingredient_data: dict):
+        """Enregistrer un ingrédient et invalider les vues triées"""
+        ing_id = ingredient_data["id"]
+        previous = self._ingredients.pop(ing_id, None)
+        if previous:
+            self._unregister_identity(self._ingredient_identity, ing_id,
+                                      self.ingredient_label(previous), previous.name)
+        ingredient = self._build_ingredient(ing_id, ingredient_data)
+        if ingredient:
+            self._ingredients[ing_id] = ingredient
+            self._register_identity(self._ingredient_identity, ing_id,
+                                    self.ingredient_label(ingredient), ingredient.name)
+        self._ingredient_views.clear()
+        self._invalidate_combination_space()
+        if self._text_index is not None:
+            self._text_index.set_ingredient(ing_id, ingredient_data)
+        self.data_manager.put("ingredients", ing_id, ingredient_data)
+    
+    def _remove_ingredient(self, ing_id: str) -> Optional[dict]:
+        """Supprimer un ingrédient et invalider les vues triées"""
+        previous = self._ingredients.pop(ing_id, None)
+        if previous:
+            self._unregister_identity(self._ingredient_identity, ing_id,
+                                      self.ingredient_label(previous), previous.name)
+        self._ingredient_views.clear()
+        self._invalidate_combination_space()
+        if self._text_index is not None:
+            self._text_index.set_ingredient(ing_id, None)
+        return self.data_manager.remove("ingredients", ing_id)
+    
+    def _index_potion(self, potion_data: dict):
+        """Ajouter une potion aux index"""
+        self.statistics.add(potion_data)
+        if self._combination_keys is None:
+            return
+        key = self.combination_key(potion_data["base"], potion_data["ingredient1"], potion_data["ingredient2"])
+        self._combination_keys[key] = self._combination_keys.get(key, 0) + 1
+        self._references.add_potion(potion_data)
+    
+    def _unindex_potion(self, potion_data: dict):
+        """Retirer une potion des index"""
+        self.statistics.remove(potion_data)
+        if self._combination_keys is None:
+            return
+        key = self.combination_key(potion_data["base"], potion_data["ingredient1"], potion_data["ingredient2"])
+        count = self._combination_keys.get(key, 0)
+        if count <= 1:
+            self._combination_keys.pop(key, None)
+        else:
+            self._combination_keys[key] = count - 1
+        self._references.remove_potion(potion_data)
+    
+    @property
+    def combination_space(self) -> CombinationSpace:
+        """Espace des recettes valides, tenu à jour à chaque création ou suppression"""
+        if self._combination_space is None:
+            space = CombinationSpace(self._bases.values(), self._ingredients.values())
+            for potion_data in self.data["potions"].values():
+                space.mark_used(potion_data["base"], potion_data["ingredient1"], potion_data["ingredient2"])
+            self._combination_space = space
+            self._space_changes = None
+        return self._combination_space
+    
+    @property
+    def combination_space_ready(self) -> bool:
+        """L'espace des recettes est-il déjà construit ?"""
+        return self._combination_space is not None
+    
+    def prepare_combination_space(self) -> Callable[[Optional[ProgressCallback]], Tuple[int, CombinationSpace]]:
+        """Préparer la construction de l'espace des recettes hors du thread Tk
+        
+        Appelée dans le thread Tk : bases et ingrédients (objets partagés,
+        jamais modifiés) sont copiés et les recettes des potions modifiées
+        à partir de maintenant sont notées. La fonction renvoyée parcourt
+        les potions sur un instantané, dans un thread de travail ; son
+        résultat est remis à ``install_combination_space``.
+        """
+        bases, ingredients = list(self._bases.values()), list(self._ingredients.values())
+        potions = self.data["potions"]
+        generation = self._space_generation
+        if self._space_changes is None:
+            self._space_changes = set()
+        
+        def build(progress: Optional[ProgressCallback] = None) -> Tuple[int, CombinationSpace]:
+            space = CombinationSpace(bases, ingredients)
+            total = len(potions)
+            for done, (_, potion_data) in enumerate(iter_section_snapshot(potions)):
+                if progress is not None and done % PROGRESS_EVERY == 0:
+                    progress(done, total)
+                space.mark_used(potion_data["base"], potion_data["ingredient1"], potion_data["ingredient2"])
+            return generation, space
+        
+        return build
+    
+    def install_combination_space(self, built: Tuple[int, CombinationSpace]) -> bool:
+        """Adopter l'espace construit en tâche de fond (thread Tk)
+        
+        Les recettes modifiées pendant la construction, que l'instantané a
+        pu voir ou non, sont recalées sur les potions actuelles. Renvoie
+        False si l'espace est périmé (ingrédients ou bases modifiés depuis
+        ``prepare_combination_space``) : il faut alors le reconstruire.
+        """
+        generation, space = built
+        if self._combination_space is not None:
+            return True
+        if generation != self._space_generation or self._space_changes is None:
+            return False
+        for combination in self._space_changes:
+            if self.has_combination(*combination):
+                space.mark_used(*combination)
+            else:
+                space.mark_unused(*combination)
+        self._combination_space = space
+        self._space_changes = None
+        return True
+    
+    def get_remaining_counts(self) -> Dict[str, int]:
+        """Nombre de recettes valides encore inutilisées, par base"""
+        space = self.combination_space
+        return {base_id: space.remaining(base_id) for base_id in space.bases}
+    
+    def iter_unused_combinations(self, base_id: Optional[str] = None) -> Iterator[Tuple[str, str, str]]:
+        """Parcourir les recettes (base, positif, négatif) valides et inutilisées"""
+        return self.combination_space.iter_unused(base_id)
+    
+    def suggest_combinations(self, count: int = 1, weighting: Optional[str] = None,
+                             base_id: Optional[str] = None,
+                             rng: Optional[random.Random] = None) -> List[Tuple[str, str, str]]:
+        """Suggérer jusqu'à ``count`` recettes (base, positif, négatif) distinctes,
+        valides et inutilisées, au hasard (pondération "rarity" ou "quality" possible)"""
+        return self.combination_space.sample(count, weighting=weighting, base_id=base_id, rng=rng)
+    
+    def has_combination(self, base_id: str, ingredient1_id: str, ingredient2_id: str) -> bool:
+        """Vérifier en O(1) si une combinaison a déjà été utilisée"""
+        if self.store is not None:
+            return self.store.has_combination(base_id, ingredient1_id, ingredient2_id)
+        return self.combination_key(base_id, ingredient1_id, ingredient2_id) in self._combination_keys
+    
+    def potion_ids_using_ingredient(self, ing_id: str) -> set:
+        """IDs des potions qui utilisent un ingrédient (index inverse, sans parcours)"""
+        if self._references is None:
+            return self.store.potion_ids_using_ingredient(ing_id)
+        return set(self._references.potions_by_ingredient.get(ing_id, ()))
+    
+    def potion_ids_using_base(self, base_id: str) -> set:
+        """IDs des potions préparées sur une base (index inverse, sans parcours)"""
+        if self._references is None:
+            return self.store.potion_ids_using_base(base_id)
+        return set(self._references.potions_by_base.get(base_id, ()))
+    
+    def restore_backup(self, backup_id: str):
+        """Restaurer une sauvegarde et reconstruire les index"""
+        self.data_manager.restore_backup(backup_id)
+        self.data = self.data_manager.data
+        self._rebuild_indexes()
+    
+    def replace_data(self, data: dict):
+        """Remplacer toutes les données (import) et reconstruire les index"""
+        self.data_manager.replace_data(data)
+        self.data = self.data_manager.data
+        self._rebuild_indexes()
+    
+    def get_bases(self) -> List[Base]:
+        """Obtenir toutes les bases"""
+        return list(self._bases.values())
+    
+    def get_base(self, base_id: str) -> Optional[Base]:
+        """Obtenir une base par son ID"""
+        return self._bases.get(base_id)
+    
+    def get_ingredients(self, filter_type: str = None) -> List[Ingredient]:
+        """Obtenir les ingrédients triés par nom, optionnellement filtrés par type"""
+        view = self._ingredient_views.get(filter_type)
+        if view is None:
+            view = sorted((ing for ing in self._ingredients.values()
+                           if filter_type is None or ing.type == filter_type),
+                          key=lambda x: x.name)
+            self._ingredient_views[filter_type] = view
+        return list(view)
+    
+    def get_ingredient(self, ing_id: str) -> Optional[Ingredient]:
+        """Obtenir un ingrédient par son ID"""
+        return self._ingredients.get(ing_id)
+    
+    def get_potions(self) -> List[Potion]:
+        """Obtenir toutes les potions"""
+        potions = []
+        for potion_id, potion_data in self.data["potions"].items():
+            potion = self._potions.get(potion_id)
+            if potion is None:
+                potion = self._potions[potion_id] = Potion(**potion_data)
+            potions.append(potion)
+        return potions
+    
+    def get_potion(self, potion_id: str) -> Optional[Potion]:
+        """Obtenir une potion par son ID"""
+        potion = self._potions.get(potion_id)
+        if potion is None:
+            potion_data = self.data["potions"].get(potion_id)
+            if potion_data is None:
+                return None
+            potion = self._potions[potion_id] = Potion(**potion_data)
+        return potion
+    
+    def search_potion_ids(self, query: str) -> set:
+        """IDs des potions dont le nom, les notes, les ingrédients (nom, effet)
+        ou la base contiennent tous les termes de la requête (préfixes)"""
+        if self.store is not None:
+            terms = self._search_terms(query)
+            return set(self.store.query_potion_ids(terms=terms)) if terms else set()
+        return self._get_text_index().search(query)
+    
+    def _get_text_index(self) -> PotionTextIndex:
+        """Index inversé, construit à la première recherche. En mode SQLite,
+        les potions restent dans l'index plein texte de la base : seuls les
+        ingrédients et les bases (peu nombreux) y sont chargés."""
+        if self._text_index is None:
+            self._text_index = PotionTextIndex(self._references)
+            for base_id, base_data in self.data["bases"].items():
+                self._text_index.set_base(base_id, base_data)
+            for ing_id, ing_data in self.data["ingredients"].items():
+                self._text_index.set_ingredient(ing_id, ing_data)
+            if self.store is None:
+                for potion_data in self.data["potions"].values():
+                    self._text_index.add_potion(potion_data)
+        return self._text_index
+    
+    def _search_terms(self, query: str) -> List[SearchTerm]:
+        """Termes de la requête pour SQLite, avec les ingrédients et bases qui y répondent"""
+        text_index = self._get_text_index()
+        return [(prefix, *text_index.item_matches(prefix)) for prefix in search_terms(query)]
+    
+    def query_potion_ids(self, search: str = "", category: Optional[str] = None,
+                         favorites_only: bool = False, sort_by: str = "Nom",
+                         limit: Optional[int] = None, offset: int = 0) -> List[str]:
+        """IDs des potions filtrées et triées (page ``limit``/``offset`` optionnelle)"""
+        if self.store is not None:
+            terms = self._search_terms(search) if search.strip() else []
+            if search.strip() and not terms:
+                return []
+            return self.store.query_potion_ids("", category, favorites_only, sort_by, limit, offset, terms)
+        
+        matches = self.search_potion_ids(search) if search.strip() else None
+        
+        potions_section = self.data["potions"]
+        
+        # Filtre par texte de recherche (index inversé)
+        if matches is None:
+            potions = potions_section.values()
+        else:
+            potions = [potions_section[potion_id] for potion_id in matches]
+        
+        # Filtre par catégorie/favoris
+        if favorites_only:
+            potions = [p for p in potions if p["is_favorite"]]
+        if category:
+            potions = [p for p in potions if p["category"] == category]
+        
+        # Tri
+        if sort_by == "Nom":
+            potions = sorted(potions, key=lambda p: p["name"].lower())
+        elif sort_by == "Catégorie":
+            potions = sorted(potions, key=lambda p: p["category"])
+        elif sort_by == "Date":
+            potions = sorted(potions, key=lambda p: p["created_at"], reverse=True)
+        elif sort_by == "Base":
+            potions = sorted(potions, key=lambda p: p["base"])
+        
+        ids = [p["id"] for p in potions]
+        if limit is not None:
+            return ids[offset:offset + limit]
+        return ids
+    
+    def _allocate_potion_id(self) -> str:
+        """Nouvel ID de potion, tiré d'un compteur monotone persisté dans les métadonnées
+        
+        Contrairement à ``potion_{nombre de potions + 1}``, un ID n'est jamais
+        réattribué après une suppression.
+        """
+        counter = self.data["metadata"].get("next_potion_id")
+        if counter is None:
+            # Premier appel sur un ancien fichier : repartir du plus grand ID existant
+            counter = 1
+            for potion_id in self.data["potions"]:
+                prefix, _, number = potion_id.rpartition("_")
+                if prefix == "potion" and number.isdigit():
+                    counter = max(counter, int(number) + 1)
+        while f"potion_{counter}" in self.data["potions"]:
+            counter += 1
+        self.data_manager.put("metadata", "next_potion_id", counter + 1)
+        return f"potion_{counter}"
+    
+    def validate_combination(self, base_id: str, ingredient1_id: str, ingredient2_id: str) -> Optional[str]:
+        """Motif de refus d'une recette (inconnue, incompatible, doublon), ou None si valide"""
+        base = self.get_base(base_id)
+        if base is None:
+            return f"Base inconnue: {base_id}"
+        ingredients = []
+        for ing_id in (ingredient1_id, ingredient2_id):
+            ingredient = self.get_ingredient(ing_id)
+            if ingredient is None:
+                return f"Ingrédient inconnu: {ing_id}"
+            ingredients.append(ingredient)
+        if {ing.type for ing in ingredients} != {"positif", "négatif"}:
+            return "Il faut un ingrédient positif et un ingrédient négatif"
+        for ingredient in ingredients:
+            if base.potion_type not in ingredient.allowed_potion_types:
+                return f"{ingredient.name} n'est pas utilisable dans les {base.potion_type}s"
+        if self.has_combination(base_id, ingredient1_id, ingredient2_id):
+            return "Cette combinaison existe déjà"
+        return None
+    
+    def _new_potion(self, base_id: str, ingredient1_id: str, ingredient2_id: str,
+                    rng=random, created_at: Optional[str] = None, category: Optional[str] = None,
+                    name: Optional[str] = None, is_favorite: bool = False, notes: str = "") -> Potion:
+        """Construire et enregistrer une potion (combinaison supposée valide)
+        
+        ``category`` et ``name`` (relus d'un import) remplacent les valeurs
+        calculées ; la catégorie doit être la qualité d'un des ingrédients.
+        """
+        # Obtenir les données
+        base = self.data["bases"][base_id]
+        ing1 = self.data["ingredients"][ingredient1_id]
+        ing2 = self.data["ingredients"][ingredient2_id]
+        
+        # Déterminer la catégorie
+        qual1, qual2 = ing1["quality"], ing2["quality"]
+        if category not in (qual1, qual2):
+            category = qual1 if qual1 == qual2 else rng.choice([qual1, qual2])
+        
+        # Générer le nom
+        effect1, effect2 = ing1["effect"], ing2["effect"]
+        if not name and base["potion_type"] == "Médicament":
+            name = f"{base['potion_type']} : {category} de {effect1} et {effect2}"
+        elif not name:
+            name = f"{base['potion_type']} {category} de {effect1} et {effect2}"
+        
+        # Créer la potion
+        potion_id = self._allocate_potion_id()
+        potion = Potion(
+            id=potion_id,
+            name=name,
+            base=base_id,
+            ingredient1=ingredient1_id,
+            ingredient2=ingredient2_id,
+            category=category,
+            created_at=created_at or datetime.datetime.now().isoformat(),
+            is_favorite=is_favorite,
+            notes=notes
+        )
+        
+        # Sauvegarder
+        self._put_potion(potion_id, asdict(potion))
+        
+        return potion
+    
+    def create_potion(self, base_id: str, ingredient1_id: str, ingredient2_id: str, **fields) -> Optional[Potion]:
+        """Créer une nouvelle potion
+        
+        ``fields`` (created_at, category, name, is_favorite, notes) reprend
+        les valeurs d'une potion importée.
+        """
+        # Vérifier les doublons
+        if self.has_combination(base_id, ingredient1_id, ingredient2_id):
+            return None  # Doublon détecté
+        
+        with self.data_manager.batch():
+            return self._new_potion(base_id, ingredient1_id, ingredient2_id, **fields)
+    
+    def create_potions_batch(self, specs: Union[int, Iterable[Tuple[str, str, str]]],
+                             seed: Optional[int] = None, weighting: Optional[str] = None) -> dict:
+        """Créer un lot de potions en une seule sauvegarde
+        
+        ``specs`` est une liste de recettes (base, ingrédient 1, ingrédient 2)
+        ou un nombre de recettes à tirer parmi celles encore disponibles
+        (pondération ``weighting`` possible). ``seed`` rend le tirage et le
+        choix des catégories reproductibles. Chaque recette est validée
+        (existence, compatibilité, doublons y compris dans le lot) ; les
+        refus sont rapportés sans interrompre le lot.
+        
+        Renvoie ``{"created": [Potion], "rejected": [{"index", "spec", "reason"}]}``.
+        """
+        rng = random.Random(seed)
+        rejected = []
+        if isinstance(specs, int):
+            requested = specs
+            specs = self.suggest_combinations(requested, weighting=weighting, rng=rng)
+            for index in range(len(specs), requested):
+                rejected.append({"index": index, "spec": None,
+                                 "reason": "Plus aucune combinaison valide disponible"})
+        
+        created = []
+        created_at = datetime.datetime.now().isoformat()
+        with self.data_manager.batch():
+            for index, spec in enumerate(specs):
+                try:
+                    base_id, ingredient1_id, ingredient2_id = spec
+                except (TypeError, ValueError):
+                    rejected.append({"index": index, "spec": spec, "reason": "Recette mal formée"})
+                    continue
+                reason = self.validate_combination(base_id, ingredient1_id, ingredient2_id)
+                if reason:
+                    rejected.append({"index": index, "spec": spec, "reason": reason})
+                    continue
+                created.append(self._new_potion(base_id, ingredient1_id, ingredient2_id,
+                                                rng=rng, created_at=created_at))
+        
+        rejected.sort(key=lambda rejection: rejection["index"])
+        return {"created": created, "rejected": rejected}
+    
+    def delete_potion(self, potion_id: str) -> bool:
+        """Supprimer une potion"""
+        return self._remove_potion(potion_id) is not None
+    
+    def toggle_favorite(self, potion_id: str) -> bool:
+        """Basculer le statut favori d'une potion"""
+        if potion_id in self.data["potions"]:
+            potion_data = self.data["potions"][potion_id]
+            current = potion_data["is_favorite"]
+            self._put_potion(potion_id, dict(potion_data, is_favorite=not current), potion_data)
+            return not current
+        return False
+    
+    def update_potion_notes(self, potion_id: str, notes: str):
+        """Mettre à jour les notes d'une potion"""
+        if potion_id in self.data["potions"]:
+            potion_data = self.data["potions"][potion_id]
+            self._put_potion(potion_id, dict(potion_data, notes=notes), potion_data)
+    
+    def save_ingredient(self, ingredient_data: dict, old_id: Optional[str] = None):
+        """Créer ou mettre à jour un ingrédient, en renommant ses références si l'ID change"""
+        ingredient_id = ingredient_data["id"]
+        
+        with self.data_manager.batch():
+            if old_id and old_id != ingredient_id:
+                # Supprimer l'ancien
+                self._remove_ingredient(old_id)
+                
+                # Mettre à jour les seules potions qui utilisent cet ingrédient
+                self._reassign_potions(self.potion_ids_using_ingredient(old_id), old_id, ingredient_id)
+            
+            self._put_ingredient(ingredient_data)
+    
+    def _reassign_potions(self, potion_ids: Iterable[str], old_id: str, new_id: str):
+        """Reporter sur ``new_id`` les références à ``old_id`` des potions données"""
+        potions = self.data["potions"]
+        for potion_id in potion_ids:
+            potion_data = potions[potion_id]
+            new_data = dict(potion_data)
+            if new_data["ingredient1"] == old_id:
+                new_data["ingredient1"] = new_id
+            if new_data["ingredient2"] == old_id:
+                new_data["ingredient2"] = new_id
+            self._put_potion(potion_id, new_data, potion_data)
+    
+    def delete_ingredient(self, ing_id: str, mode: str = "block",
+                          replacement: Optional[str] = None) -> Optional[str]:
+        """Supprimer un ingrédient ; motif du refus, ou None une fois supprimé
+        
+        Les potions qui l'utilisent (index inverse) décident du ``mode`` :
+        "block" refuse la suppression s'il y en a, "cascade" les supprime
+        avec lui, "reassign" les reporte sur l'ingrédient ``replacement``
+        (refus si l'une des recettes obtenues est invalide ou existe déjà).
+        Rien n'est modifié en cas de refus ; le tout tient en une sauvegarde.
+        """
+        if mode not in INGREDIENT_DELETE_MODES:
+            raise ValueError(f"Mode de suppression inconnu: {mode}")
+        ingredient = self.get_ingredient(ing_id)
+        if ingredient is None:
+            return f"Ingrédient inconnu: {ing_id}"
+        potion_ids = self.potion_ids_using_ingredient(ing_id)
+        
+        if potion_ids and mode == "block":
+            return f"{ingredient.name} est utilisé par {len(potion_ids)} potion(s)"
+        if potion_ids and mode == "reassign":
+            reason = self._check_reassignment(potion_ids, ing_id, replacement)
+            if reason:
+                return reason
+        
+        with self.data_manager.batch():
+            if mode == "cascade":
+                for potion_id in potion_ids:
+                    self._remove_potion(potion_id)
+            elif mode == "reassign":
+                self._reassign_potions(potion_ids, ing_id, replacement)
+            self._remove_ingredient(ing_id)
+        return None
+    
+    def _check_reassignment(self, potion_ids: Iterable[str], old_id: str,
+                            new_id: Optional[str]) -> Optional[str]:
+        """Motif de refus du report de ``old_id`` sur ``new_id``, ou None"""
+        if not new_id or new_id == old_id or self.get_ingredient(new_id) is None:
+            return "Choisissez un autre ingrédient existant pour le remplacer"
+        seen = set()
+        potions = self.data["potions"]
+        for potion_id in potion_ids:
+            potion_data = potions[potion_id]
+            recipe = [potion_data["base"]] + [new_id if ing_id == old_id else ing_id
+                                              for ing_id in (potion_data["ingredient1"], potion_data["ingredient2"])]
+            key = self.combination_key(*recipe)
+            reason = "Cette combinaison existe déjà" if key in seen else self.validate_combination(*recipe)
+            if reason:
+                return f"{potion_data['name']} : {reason}"
+            seen.add(key)
+        return None
+    
+    def get_statistics(self, top: int = 10) -> dict:
+        """Obtenir les statistiques (compteurs tenus à jour, sans recalcul)"""
+        statistics = self.statistics
+        top_ingredients = statistics.most_used(top)
+        return {
+            "total_potions": statistics.total,
+            "total_ingredients": len(self._ingredients),
+            "favorites": statistics.favorites,
+            "categories": dict(statistics.categories),
+            "bases_used": dict(statistics.bases),
+            "ingredient_usage": dict(statistics.ingredient_usage),
+            "top_ingredients": top_ingredients,
+            "most_used_ingredient": top_ingredients[0] if top_ingredients else None
+        }
+    
+    def check_integrity(self, progress: Optional[ProgressCallback] = None) -> List[str]:
+        """Vérifier la cohérence des données : liste des problèmes détectés
+        
+        Les sections sont parcourues sur un instantané : la vérification peut
+        tourner en tâche de fond pendant que l'interface modifie les données.
+        ``progress(done, total)`` est appelé toutes les PROGRESS_EVERY potions
+        et peut lever une exception pour interrompre la vérification.
+        """
+        issues = []
+        
+        # Vérifier les ingrédients
+        for ing_id, ing_data in iter_section_snapshot(self.data["ingredients"]):
+            if ing_id != ing_data.get("id"):
+                issues.append(f"Ingrédient {ing_id}: ID incohérent")
+        
+            required_fields = ["name", "effect", "type", "quality", "duration"]
+            for field in required_fields:
+                if not ing_data.get(field):
+                    issues.append(f"Ingrédient {ing_id}: champ '{field}' manquant")
+        
+        # Vérifier les potions
+        valid_ingredient_ids = set(self.data["ingredients"].keys())
+        valid_base_ids = set(self.data["bases"].keys())
+        
+        total = len(self.data["potions"])
+        for done, (potion_id, potion_data) in enumerate(iter_section_snapshot(self.data["potions"])):
+            if progress is not None and done % PROGRESS_EVERY == 0:
+                progress(done, total)
+            if potion_data.get("base") not in valid_base_ids:
+                issues.append(f"Potion {potion_id}: base '{potion_data.get('base')}' invalide")
+        
+            for i, field in enumerate(["ingredient1", "ingredient2"], 1):
+                ing_id = potion_data.get(field)
+                if ing_id not in valid_ingredient_ids:
+                    issues.append(f"Potion {potion_id}: ingrédient{i} '{ing_id}' invalide")
+        
+        if progress is not None:
+            progress(total, total)
+        return issues
+
+
+# ==================== DONNÉES INITIALES ====================
+
+def create_sample_ingredients():
+    """Créer des ingrédients d'exemple si le fichier est vide"""
+    sample_ingredients = {
+        "sauge": {
+            "id": "sauge", "name": "Sauge", "effect": "Purification", "type": "positif",
+            "quality": "Mineur", "duration": "Instantané", "rarity": "Commun",
+            "description": "Herbe purificatrice commune", "contraindications": [], "synergies": []
+        },
+        "ortie": {
+            "id": "ortie", "name": "Ortie", "effect": "Enchevêtrement", "type": "négatif",
+            "quality": "Mineur", "duration": "1 minute", "rarity": "Commun",
+            "description": "Plante urticante provoquant l'enchevêtrement", "contraindications": [], "synergies": []
+        },
+        "belladone": {
+            "id": "belladone", "name": "Belladone", "effect": "Empoisonné", "type": "négatif",
+            "quality": "Majeur", "duration": "Instantané", "rarity": "Rare",
+            "description": "Plante toxique mortelle", "contraindications": [], "synergies": []
+        },
+        "lotus": {
+            "id": "lotus", "name": "Lotus", "effect": "Charme / Séduction", "type": "positif",
+            "quality": "Mineur", "duration": "1 minute", "rarity": "Commun",
+            "description": "Fleur enchanteresse", "contraindications": [], "synergies": []
+        },
+        "mandragore": {
+            "id": "mandragore", "name": "Mandragore", "effect": "Assommé Légendaire", "type": "négatif",
+            "quality": "Légendaire", "duration": "Jusqu'à réveil", "rarity": "Légendaire",
+            "description": "Racine légendaire aux pouvoirs endormants", "contraindications": [], "synergies": []
+        }
+    }
+    return sample_ingredients
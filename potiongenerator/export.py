@@ -0,0 +1,369 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - Moteur d'export en flux
+
+Les enregistrements sont lus un à un dans le stockage (dictionnaire ou
+table SQLite) et passés à un écrivain interchangeable : CSV (utf-8-sig pour
+Excel), JSON Lines ou JSON indenté. Rien n'est accumulé en mémoire : les
+tables ID -> nom sont résolues une fois par export et les dates sont
+reformatées par découpage de la chaîne ISO, sans ``fromisoformat`` par ligne.
+"""
+
+import copy
+import csv
+import datetime
+import json
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple, Union
+
+from .core import PROGRESS_EVERY, PotionManager, SQLiteTable, iter_section_snapshot
+
+# Colonnes (clé, intitulé) des exports lisibles ; mêmes intitulés que l'interface
+POTION_COLUMNS = [
+    ("name", "Nom"), ("base", "Base"), ("category", "Catégorie"),
+    ("ingredient1", "Ingrédient1"), ("ingredient2", "Ingrédient2"),
+    ("created_at", "Créée le"), ("is_favorite", "Favorite"), ("notes", "Notes"),
+]
+INGREDIENT_COLUMNS = [
+    ("name", "Nom"), ("effect", "Effet"), ("type", "Type"), ("quality", "Qualité"),
+    ("duration", "Durée"), ("rarity", "Rareté"), ("description", "Description"),
+    ("allowed_potion_types", "Types de potions"),
+]
+
+# Sections dont les entrées sont remplacées, jamais modifiées en place
+SHALLOW_COPY_SECTIONS = ("bases", "ingredients")
+
+# Séparateur des types de potions autorisés dans une cellule CSV
+POTION_TYPES_SEPARATOR = "|"
+
+# Format des dates dans les exports lisibles
+EXPORT_DATE_FORMAT = "%d/%m/%Y %H:%M"
+
+Destination = Union[str, Path, TextIO]
+
+
+def format_created_at(value: str) -> str:
+    """Date ISO -> "jj/mm/aaaa hh:mm", par découpage (repli sur fromisoformat)"""
+    if (isinstance(value, str) and len(value) >= 16 and value[4] == "-" and value[7] == "-"
+            and value[10] in "T " and value[13] == ":"):
+        return f"{value[8:10]}/{value[5:7]}/{value[0:4]} {value[11:16]}"
+    try:
+        return datetime.datetime.fromisoformat(value).strftime(EXPORT_DATE_FORMAT)
+    except (TypeError, ValueError):
+        return value or ""
+
+
+# ==================== ÉCRIVAINS ====================
+
+class ExportWriter:
+    """Écrivain d'export : consomme un flux d'enregistrements
+    
+    ``display`` indique si l'écrivain attend des valeurs lisibles (noms,
+    dates formatées) plutôt que les enregistrements bruts du stockage.
+    """
+    
+    extension = ""
+    encoding = "utf-8"
+    newline: Optional[str] = None
+    display = False
+    
+    def __init__(self, stream: TextIO, columns: List[Tuple[str, str]], section: str):
+        self.stream = stream
+        self.columns = columns
+        self.section = section
+    
+    def write(self, records: Iterable[Tuple[str, dict]], total: Optional[int] = None) -> int:
+        """Écrire les enregistrements (ID, valeur) ; renvoie leur nombre"""
+        raise NotImplementedError
+
+
+class CSVExportWriter(ExportWriter):
+    """CSV avec BOM (utf-8-sig) pour qu'Excel reconnaisse les accents"""
+    
+    extension = ".csv"
+    encoding = "utf-8-sig"
+    newline = ""
+    display = True
+    
+    def write(self, records: Iterable[Tuple[str, dict]], total: Optional[int] = None) -> int:
+        writer = csv.writer(self.stream)
+        keys = [key for key, _ in self.columns]
+        writer.writerow([label for _, label in self.columns])
+        count = 0
+        for _, record in records:
+            writer.writerow([record.get(key, "") for key in keys])
+            count += 1
+        return count
+
+
+class JSONLinesExportWriter(ExportWriter):
+    """Un enregistrement JSON brut par ligne"""
+    
+    extension = ".jsonl"
+    
+    def write(self, records: Iterable[Tuple[str, dict]], total: Optional[int] = None) -> int:
+        write = self.stream.write
+        count = 0
+        for _, record in records:
+            write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+        return count
+
+
+class JSONExportWriter(ExportWriter):
+    """Document JSON indenté (même présentation que ``json.dump(indent=2)``)
+    
+    La section exportée est écrite entrée par entrée dans un document au
+    format v2.0 : ``{"version", "export_date", "total_<section>", "<section>": {...}}``.
+    """
+    
+    extension = ".json"
+    
+    def write(self, records: Iterable[Tuple[str, dict]], total: Optional[int] = None) -> int:
+        counter = _Counter(records)
+        header = [("version", "2.0"), ("export_date", datetime.datetime.now().isoformat())]
+        if total is not None:
+            header.append((f"total_{self.section}", total))
+        write_json_object(self.stream, header + [(self.section, StreamedObject(counter))])
+        self.stream.write("\n")
+        return counter.count
+
+
+EXPORT_WRITERS: Dict[str, type] = {
+    "csv": CSVExportWriter,
+    "jsonl": JSONLinesExportWriter,
+    "json": JSONExportWriter,
+}
+
+
+def format_for_path(path: Union[str, Path], default: str = "csv") -> str:
+    """Format d'export déduit de l'extension d'un fichier"""
+    suffix = Path(path).suffix.lower()
+    for name, writer_class in EXPORT_WRITERS.items():
+        if writer_class.extension == suffix:
+            return name
+    return default
+
+
+# ==================== JSON EN FLUX ====================
+
+class StreamedObject:
+    """Objet JSON dont les entrées (clé, valeur) sont produites à la demande"""
+    
+    def __init__(self, entries: Iterable[Tuple[str, object]]):
+        self.entries = entries
+
+
+class _Counter:
+    """Itérateur qui compte les éléments qui le traversent"""
+    
+    def __init__(self, iterable: Iterable):
+        self.iterator = iter(iterable)
+        self.count = 0
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        item = next(self.iterator)
+        self.count += 1
+        return item
+
+
+_SCALARS = (str, int, float, bool, type(None))
+
+
+def _dumps_indented(value, padding: str) -> str:
+    """``json.dumps(value, indent=2)`` décalé de ``padding``
+    
+    Un dictionnaire plat (cas des enregistrements) passe par l'encodeur C,
+    que ``indent`` désactive : ses séparateurs portent le retour à la ligne.
+    """
+    if type(value) is dict and value and all(type(item) in _SCALARS for item in value.values()):
+        inner = padding + "  "
+        text = json.dumps(value, ensure_ascii=False, separators=(",\n" + inner, ": "))
+        return "{\n" + inner + text[1:-1] + "\n" + padding + "}"
+    return json.dumps(value, indent=2, ensure_ascii=False).replace("\n", "\n" + padding)
+
+
+def write_json_object(stream: TextIO, entries: Iterable[Tuple[str, object]], level: int = 0):
+    """Écrire un objet JSON indenté entrée par entrée
+    
+    Les valeurs ``StreamedObject`` sont écrites récursivement sans être
+    matérialisées ; les autres passent par ``json.dumps``.
+    """
+    indent = "  "
+    padding = indent * (level + 1)
+    first = True
+    stream.write("{")
+    for key, value in entries:
+        stream.write(("\n" if first else ",\n") + padding + json.dumps(key, ensure_ascii=False) + ": ")
+        first = False
+        if isinstance(value, StreamedObject):
+            write_json_object(stream, value.entries, level + 1)
+        else:
+            stream.write(_dumps_indented(value, padding))
+    stream.write("}" if first else "\n" + indent * level + "}")
+
+
+# ==================== MOTEUR ====================
+
+class ExportEngine:
+    """Exports en flux des potions, des ingrédients ou du document complet
+    
+    ``progress(done, total)`` est appelé régulièrement pendant l'export ;
+    il peut lever une exception pour l'interrompre (annulation).
+    """
+    
+    def __init__(self, potion_manager: PotionManager):
+        self.potion_manager = potion_manager
+    
+    # ---------- Sources ----------
+    
+    def _names(self, section: str) -> Dict[str, str]:
+        """Table ID -> nom, résolue une fois par export"""
+        return {item_id: item.get("name", item_id)
+                for item_id, item in iter_section_snapshot(self.potion_manager.data[section])}
+    
+    def _entries(self, section: str, item_ids: Optional[Iterable[str]]) -> Iterator[Tuple[str, dict]]:
+        """Entrées (ID, valeur) d'une section, toutes ou dans l'ordre de ``item_ids``
+        
+        Les entrées supprimées pendant l'export (tâche de fond) sont ignorées.
+        """
+        values = self.potion_manager.data[section]
+        if item_ids is None:
+            return iter_section_snapshot(values)
+        if isinstance(values, SQLiteTable):
+            return values.iter_many(item_ids)
+        lookups = ((item_id, values.get(item_id)) for item_id in item_ids)
+        return ((item_id, value) for item_id, value in lookups if value is not None)
+    
+    def potion_records(self, potion_ids: Optional[Iterable[str]] = None,
+                       display: bool = False) -> Iterator[Tuple[str, dict]]:
+        """Potions (ID, enregistrement) brutes, ou lisibles pour ``display``"""
+        entries = self._entries("potions", potion_ids)
+        if not display:
+            yield from entries
+            return
+        
+        bases = self._names("bases")
+        ingredients = self._names("ingredients")
+        for potion_id, potion in entries:
+            yield potion_id, {
+                "name": potion["name"],
+                "base": bases.get(potion["base"], potion["base"]),
+                "category": potion["category"],
+                "ingredient1": ingredients.get(potion["ingredient1"], potion["ingredient1"]),
+                "ingredient2": ingredients.get(potion["ingredient2"], potion["ingredient2"]),
+                "created_at": format_created_at(potion.get("created_at")),
+                "is_favorite": "Oui" if potion.get("is_favorite") else "Non",
+                "notes": potion.get("notes", ""),
+            }
+    
+    def ingredient_records(self, ingredient_ids: Optional[Iterable[str]] = None,
+                           display: bool = False) -> Iterator[Tuple[str, dict]]:
+        """Ingrédients (ID, enregistrement) ; lisibles, les types de potions tiennent en une cellule"""
+        entries = self._entries("ingredients", ingredient_ids)
+        if not display:
+            yield from entries
+            return
+        
+        for ing_id, ingredient in entries:
+            potion_types = ingredient.get("allowed_potion_types") or ()
+            yield ing_id, dict(ingredient, allowed_potion_types=POTION_TYPES_SEPARATOR.join(potion_types))
+    
+    # ---------- Exports ----------
+    
+    @staticmethod
+    def _progress(records: Iterable, total: Optional[int],
+                  progress: Optional[Callable[[int, Optional[int]], None]]) -> Iterator:
+        if progress is None:
+            yield from records
+            return
+        done = 0
+        progress(0, total)
+        for record in records:
+            yield record
+            done += 1
+            if done % PROGRESS_EVERY == 0:
+                progress(done, total)
+        progress(done, total)
+    
+    def _export(self, destination: Destination, fmt: str, section: str, columns: List[Tuple[str, str]],
+                records: Callable[[bool], Iterator[Tuple[str, dict]]], total: Optional[int],
+                progress: Optional[Callable[[int, Optional[int]], None]]) -> int:
+        writer_class = EXPORT_WRITERS[fmt]
+        if isinstance(destination, (str, Path)):
+            with open(destination, "w", encoding=writer_class.encoding, newline=writer_class.newline) as stream:
+                return self._export(stream, fmt, section, columns, records, total, progress)
+        
+        writer = writer_class(destination, columns, section)
+        return writer.write(self._progress(records(writer.display), total, progress), total)
+    
+    def export_potions(self, destination: Destination, fmt: str = "csv",
+                       potion_ids: Optional[List[str]] = None,
+                       progress: Optional[Callable[[int, Optional[int]], None]] = None) -> int:
+        """Exporter les potions (toutes, ou la vue ``potion_ids`` dans son ordre)
+        
+        Renvoie le nombre de potions écrites.
+        """
+        total = len(potion_ids) if potion_ids is not None else len(self.potion_manager.data["potions"])
+        return self._export(destination, fmt, "potions", POTION_COLUMNS,
+                            lambda display: self.potion_records(potion_ids, display), total, progress)
+    
+    def export_ingredients(self, destination: Destination, fmt: str = "json",
+                           ingredient_ids: Optional[List[str]] = None,
+                           progress: Optional[Callable[[int, Optional[int]], None]] = None) -> int:
+        """Exporter les ingrédients ; renvoie le nombre d'ingrédients écrits"""
+        section = self.potion_manager.data["ingredients"]
+        total = len(ingredient_ids) if ingredient_ids is not None else len(section)
+        return self._export(destination, fmt, "ingredients", INGREDIENT_COLUMNS,
+                            lambda display: self.ingredient_records(ingredient_ids, display), total, progress)
+    
+    def document_snapshot(self) -> List[Tuple[str, object]]:
+        """Sections du document à exporter, prises dans le thread Tk
+        
+        Le fichier de données est d'abord rendu complet et à jour. Les
+        petites sections (métadonnées, configuration...) sont copiées en
+        profondeur ; bases et ingrédients, dont les entrées sont remplacées
+        et jamais modifiées en place, superficiellement. Les potions et les
+        tables SQLite restent lues en flux par ``export_document``.
+        """
+        self.potion_manager.data_manager.sync()
+        entries = []
+        for key, value in self.potion_manager.data.items():
+            if key == "potions" or isinstance(value, SQLiteTable):
+                pass
+            elif key in SHALLOW_COPY_SECTIONS:
+                value = dict(value)
+            else:
+                value = copy.deepcopy(value)
+            entries.append((key, value))
+        return entries
+    
+    def export_document(self, destination: Destination,
+                        progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                        snapshot: Optional[List[Tuple[str, object]]] = None) -> int:
+        """Exporter tout le document (format v2.0, réimportable), potions en flux
+        
+        En tâche de fond, ``snapshot`` (``document_snapshot``) est pris au
+        préalable dans le thread Tk. Renvoie le nombre de potions écrites.
+        """
+        if isinstance(destination, (str, Path)):
+            with open(destination, "w", encoding="utf-8") as stream:
+                return self.export_document(stream, progress, snapshot)
+        
+        if snapshot is None:
+            snapshot = self.document_snapshot()
+        potions = None
+        entries = []
+        for key, value in snapshot:
+            if key == "potions":
+                potions = _Counter(self._progress(iter_section_snapshot(value), len(value), progress))
+                value = StreamedObject(potions)
+            elif isinstance(value, SQLiteTable):
+                value = StreamedObject(value.items())
+            entries.append((key, value))
+        write_json_object(destination, entries)
+        destination.write("\n")
+        return potions.count if potions is not None else 0
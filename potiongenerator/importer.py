@@ -0,0 +1,699 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - Import en flux
+
+Les fichiers JSON sont lus par morceaux : les sections volumineuses
+(bases, ingrédients, potions) sont décodées entrée par entrée avec
+``json.JSONDecoder.raw_decode``, chaque enregistrement est validé et migré
+au passage puis versé directement dans le stockage. Le tampon de lecture ne
+dépend que de la taille du plus gros enregistrement, pas de celle du fichier.
+
+Les CSV produits par l'export (puis retouchés dans un tableur) sont relus
+ligne à ligne : les noms affichés redeviennent des IDs par les index
+d'identité du PotionManager.
+"""
+
+import csv
+import dataclasses
+import datetime
+import itertools
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, Union
+
+from .core import (DEFAULT_POTION_TYPES, INGREDIENT_QUALITIES, INGREDIENT_RARITIES, INGREDIENT_TYPES,
+                   Base, DataManager, Ingredient, Potion, PotionManager, fold_text, make_ingredient_id)
+from .export import EXPORT_DATE_FORMAT, INGREDIENT_COLUMNS, POTION_COLUMNS, POTION_TYPES_SEPARATOR
+
+# Taille (en caractères) des morceaux lus dans le fichier
+CHUNK_SIZE = 64 * 1024
+
+# Clés de premier niveau d'un document complet (v2.0 ou ancien format)
+DOCUMENT_KEYS = frozenset({"version", "metadata", "config", "bases", "ingredients", "potions",
+                           "tags", "favorites", "potions_creees"})
+
+# Politiques pour un ingrédient importé déjà présent (même ID ou même nom)
+CONFLICT_POLICIES = ("skip", "replace", "merge", "rename")
+
+# Nombre maximal de refus détaillés dans le rapport (les suivants sont comptés)
+MAX_REJECTED = 100
+
+# Colonnes indispensables d'un CSV importé
+CSV_REQUIRED_COLUMNS = {
+    "potions": ("base", "ingredient1", "ingredient2"),
+    "ingredients": ("name", "effect", "type", "quality", "duration"),
+}
+
+# Dates relues dans la colonne "Créée le" : format de l'export, puis variantes de tableur
+CSV_DATE_FORMATS = (EXPORT_DATE_FORMAT, "%d/%m/%Y %H:%M:%S", "%d/%m/%y %H:%M", "%d/%m/%Y")
+
+# Valeurs admises dans la colonne "Favorite" (comparées sans casse)
+FAVORITE_VALUES = {"oui": True, "non": False, "": False, "vrai": True, "faux": False,
+                   "true": True, "false": False, "1": True, "0": False}
+
+Source = Union[str, Path, TextIO]
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+# ==================== LECTURE JSON EN FLUX ====================
+
+class JSONStreamReader:
+    """Lecteur JSON incrémental sur un flux texte
+    
+    Les objets et tableaux se parcourent élément par élément (``iter_object``,
+    ``iter_array``) ; les valeurs lues par ``read_value`` sont décodées d'un
+    bloc. Le tampon ne garde que la partie non lue du fichier.
+    """
+    
+    def __init__(self, stream: TextIO, chunk_size: int = CHUNK_SIZE):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.pos = 0
+        # Caractères déjà retirés du tampon (position dans les messages d'erreur)
+        self.offset = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+    
+    def _fill(self) -> bool:
+        """Ajouter un morceau au tampon ; False en fin de flux
+        
+        Le morceau lu fait au moins la taille de la partie en attente : une
+        valeur longue n'est redécodée qu'un nombre logarithmique de fois.
+        """
+        if self.eof:
+            return False
+        chunk = self.stream.read(max(self.chunk_size, len(self.buffer) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        if self.pos:
+            self.offset += self.pos
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return True
+    
+    def _error(self, message: str) -> ValueError:
+        return ValueError(f"JSON invalide (caractère {self.offset + self.pos}) : {message}")
+    
+    def peek(self) -> str:
+        """Prochain caractère significatif, sans le consommer ("" en fin de flux)"""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ""
+    
+    def _expect(self, char: str):
+        if self.peek() != char:
+            raise self._error(f"'{char}' attendu")
+        self.pos += 1
+    
+    def read_value(self):
+        """Décoder la valeur suivante"""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as e:
+                # Valeur coupée par la fin du tampon : lire la suite et recommencer
+                truncated = e.pos >= len(self.buffer) - 16 or e.msg.startswith("Unterminated string")
+                if truncated and self._fill():
+                    continue
+                self.pos = e.pos
+                raise self._error(e.msg) from None
+            # Un nombre coupé ("12" de "125", "1" de "1.5") se décode aussi
+            if (end == len(self.buffer) or self.buffer[end] in ".eE") and self._fill():
+                continue
+            self.pos = end
+            return value
+    
+    def iter_object(self) -> Iterator[str]:
+        """Parcourir un objet : produit chaque clé, dont la valeur reste à lire"""
+        self._expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.read_value()
+            if not isinstance(key, str):
+                raise self._error("clé attendue")
+            self._expect(":")
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == "}":
+                return
+            if separator != ",":
+                self.pos -= 1
+                raise self._error("',' ou '}' attendu")
+    
+    def iter_array(self) -> Iterator[int]:
+        """Parcourir un tableau : produit chaque indice, dont la valeur reste à lire"""
+        self._expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        index = 0
+        while True:
+            yield index
+            index += 1
+            separator = self.peek()
+            self.pos += 1
+            if separator == "]":
+                return
+            if separator != ",":
+                self.pos -= 1
+                raise self._error("',' ou ']' attendu")
+    
+    def skip_value(self):
+        """Passer la valeur suivante sans la construire en entier"""
+        char = self.peek()
+        if char == "{":
+            for _ in self.iter_object():
+                self.skip_value()
+        elif char == "[":
+            for _ in self.iter_array():
+                self.skip_value()
+        else:
+            self.read_value()
+    
+    def expect_end(self):
+        if self.peek():
+            raise self._error("données après la fin du document")
+
+
+# ==================== VALIDATION ====================
+
+# Modèle de chaque section : champs obligatoires et champs connus
+SECTION_MODELS = {"bases": Base, "ingredients": Ingredient, "potions": Potion}
+
+_REQUIRED_FIELDS = {
+    section: frozenset(field.name for field in dataclasses.fields(model)
+                       if field.default is dataclasses.MISSING)
+    for section, model in SECTION_MODELS.items()
+}
+_KNOWN_FIELDS = {
+    section: frozenset(field.name for field in dataclasses.fields(model))
+    for section, model in SECTION_MODELS.items()
+}
+
+
+def validate_record(section: str, item_id: str, value) -> Optional[str]:
+    """Raison du refus d'un enregistrement (déjà migré), ou None s'il est valide"""
+    if not isinstance(value, dict):
+        return "l'entrée n'est pas un objet"
+    if value.get("id") != item_id:
+        return f"ID incohérent ({value.get('id')!r})"
+    missing = _REQUIRED_FIELDS[section].difference(value)
+    if missing:
+        return f"champs manquants : {', '.join(sorted(missing))}"
+    unknown = set(value).difference(_KNOWN_FIELDS[section])
+    if unknown:
+        return f"champs inconnus : {', '.join(sorted(unknown))}"
+    return None
+
+
+class IngredientSchema:
+    """Validation des ingrédients importés, compilée une fois par import
+    
+    Champs obligatoires, valeurs admises (type, qualité, rareté) et types
+    de potions autorisés sont préparés à la construction ; ``validate``
+    n'a plus qu'à les appliquer à chaque enregistrement.
+    """
+    
+    def __init__(self, potion_types: Iterable[str] = DEFAULT_POTION_TYPES):
+        self.required = tuple(sorted(_REQUIRED_FIELDS["ingredients"] - {"id"}))
+        self.enums = tuple((field, frozenset(values), ", ".join(values)) for field, values in (
+            ("type", INGREDIENT_TYPES), ("quality", INGREDIENT_QUALITIES), ("rarity", INGREDIENT_RARITIES)))
+        self.potion_types = frozenset(potion_types)
+    
+    def validate(self, item_id: str, record) -> Optional[str]:
+        """Raison du refus d'un ingrédient (déjà migré), ou None s'il est valide"""
+        reason = validate_record("ingredients", item_id, record)
+        if reason:
+            return reason
+        for field in self.required:
+            value = record[field]
+            if not isinstance(value, str) or not value.strip():
+                return f"champ '{field}' vide"
+        for field, allowed, expected in self.enums:
+            if field in record and record[field] not in allowed:
+                return f"{field} '{record[field]}' invalide (attendu : {expected})"
+        potion_types = record.get("allowed_potion_types")
+        if potion_types is not None:
+            if not isinstance(potion_types, (list, tuple)) or not potion_types:
+                return "allowed_potion_types doit être une liste non vide"
+            unknown = [value for value in potion_types if value not in self.potion_types]
+            if unknown:
+                return f"types de potions inconnus : {', '.join(map(str, unknown))}"
+        return None
+
+
+# ==================== LECTURE CSV ====================
+
+def parse_created_at(text: str) -> Optional[str]:
+    """Date d'un CSV ("jj/mm/aaaa hh:mm" ou ISO) -> date ISO ; None si la cellule est vide"""
+    text = text.strip()
+    if not text:
+        return None
+    for date_format in CSV_DATE_FORMATS:
+        try:
+            return datetime.datetime.strptime(text, date_format).isoformat()
+        except ValueError:
+            pass
+    try:
+        return datetime.datetime.fromisoformat(text).isoformat()
+    except ValueError:
+        raise ValueError(f"date illisible '{text}' (attendu : jj/mm/aaaa hh:mm)") from None
+
+
+def is_csv_source(source: Source) -> bool:
+    """Vrai si la source est un fichier .csv (d'après son nom)"""
+    name = getattr(source, "name", source)
+    return isinstance(name, (str, Path)) and Path(name).suffix.lower() == ".csv"
+
+
+def iter_csv_rows(stream: TextIO, columns: List[Tuple[str, str]], section: str) -> Iterator[Tuple[int, dict]]:
+    """Lignes ``(numéro, {clé: cellule})`` d'un CSV dont l'en-tête reprend ``columns``
+    
+    Les intitulés sont reconnus sans casse ni accents (ceux de l'export ou
+    les clés) ; les colonnes inconnues sont ignorées. Le séparateur (virgule,
+    point-virgule, tabulation selon le tableur) est déduit de l'en-tête.
+    """
+    header_line = stream.readline()
+    try:
+        dialect = csv.Sniffer().sniff(header_line, delimiters=",;\t")
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(itertools.chain([header_line], stream), dialect)
+    header = next(reader, None)
+    if not header:
+        raise ValueError("CSV vide : ligne d'en-tête attendue")
+    
+    names = {}
+    for key, label in columns:
+        names[fold_text(key)] = key
+        names[fold_text(label)] = key
+    keys = [names.get(fold_text(cell.strip())) for cell in header]
+    missing = [label for key, label in columns if key in CSV_REQUIRED_COLUMNS[section] and key not in keys]
+    if missing:
+        raise ValueError(f"colonnes manquantes : {', '.join(missing)}")
+    
+    for row in reader:
+        if any(cell.strip() for cell in row):
+            yield reader.line_num, {key: cell.strip() for key, cell in zip(keys, row) if key}
+
+
+# ==================== MOTEUR ====================
+
+class ImportEngine:
+    """Imports en flux d'un document complet ou d'un fichier d'ingrédients
+    
+    ``progress(done, total)`` est appelé à chaque enregistrement (``total``
+    reste None : le nombre d'entrées n'est connu qu'à la fin) ; il peut
+    lever une exception pour interrompre l'import.
+    
+    Les rapports ont la forme ``{"imported": {section: nombre},
+    "rejected": [{"section", "id", "reason"}], "rejected_count": nombre}``.
+    """
+    
+    def __init__(self, potion_manager: PotionManager):
+        self.potion_manager = potion_manager
+    
+    @staticmethod
+    def _open(source: Source, encoding: str = "utf-8", newline: Optional[str] = None):
+        if isinstance(source, (str, Path)):
+            return open(source, "r", encoding=encoding, newline=newline)
+        return None
+    
+    @staticmethod
+    def _new_report() -> dict:
+        return {"imported": {}, "rejected": [], "rejected_count": 0}
+    
+    @staticmethod
+    def _reject(report: dict, section: str, item_id, reason: str):
+        report["rejected_count"] += 1
+        if len(report["rejected"]) < MAX_REJECTED:
+            report["rejected"].append({"section": section, "id": item_id, "reason": reason})
+    
+    # ---------- Enregistrements ----------
+    
+    def _accept(self, section: str, key, value, report: dict,
+                progress: Optional[Callable[[int, Optional[int]], None]]) -> Optional[Tuple[str, dict]]:
+        """Migrer et valider un enregistrement ; None (et refus rapporté) s'il est invalide"""
+        legacy_list = section == "potions_creees"
+        if legacy_list:
+            section = "potions"
+        if not isinstance(value, dict):
+            self._reject(report, section, key, "l'entrée n'est pas un objet")
+            return None
+        if legacy_list:
+            item_id, value = DataManager.migrate_legacy_potion(key, value)
+        elif section == "ingredients":
+            # L'ancien format indexe les ingrédients par nom, sans "name" ni "effect"
+            legacy = "name" not in value and "effect" not in value
+            item_id, value = DataManager.migrate_ingredient(key, value, legacy=legacy)
+        else:
+            item_id = key
+            if section == "potions":
+                DataManager.migrate_potion(value)
+        value.setdefault("id", item_id)
+        
+        reason = validate_record(section, item_id, value)
+        if reason:
+            self._reject(report, section, item_id, reason)
+            return None
+        imported = report["imported"]
+        imported[section] = imported.get(section, 0) + 1
+        if progress is not None:
+            progress(sum(imported.values()), None)
+        return item_id, value
+    
+    def _records(self, reader: JSONStreamReader, section: str, report: dict,
+                 progress: Optional[Callable[[int, Optional[int]], None]]) -> Iterator[Tuple[str, dict]]:
+        """Enregistrements valides et migrés d'une section, lus un à un"""
+        keys = reader.iter_array() if section == "potions_creees" else reader.iter_object()
+        for key in keys:
+            record = self._accept(section, key, reader.read_value(), report, progress)
+            if record is not None:
+                yield record
+    
+    # ---------- Imports ----------
+    
+    def read_document(self, source: Source,
+                      progress: Optional[Callable[[int, Optional[int]], None]] = None) -> Tuple[dict, dict]:
+        """Lire un document complet (v2.0 ou ancien format) dans un document neuf
+        
+        Renvoie ``(document, rapport)`` ; le document est à passer à
+        ``PotionManager.replace_data``. Les sections absentes du fichier
+        gardent leurs valeurs par défaut.
+        """
+        stream = self._open(source)
+        if stream is not None:
+            with stream:
+                return self.read_document(stream, progress)
+        
+        data_manager = self.potion_manager.data_manager
+        document = data_manager.stage_document()
+        report = self._new_report()
+        try:
+            reader = JSONStreamReader(source)
+            for key in reader.iter_object():
+                if key in SECTION_MODELS or key == "potions_creees":
+                    section = document["potions" if key == "potions_creees" else key]
+                    section.clear()
+                    for item_id, value in self._records(reader, key, report, progress):
+                        section[item_id] = value
+                elif key == "version":
+                    # Le document produit est toujours au format v2.0
+                    reader.read_value()
+                else:
+                    document[key] = reader.read_value()
+            reader.expect_end()
+        except BaseException:
+            data_manager.discard_staged()
+            raise
+        return document, report
+    
+    def read_ingredients(self, source: Source,
+                         progress: Optional[Callable[[int, Optional[int]], None]] = None) -> Tuple[Dict[str, dict], dict]:
+        """Lire les ingrédients d'un document complet ou d'un dictionnaire d'ingrédients
+        
+        Les autres sections d'un document complet (potions...) sont passées
+        sans être construites. Renvoie ``(ingrédients, rapport)``.
+        """
+        stream = self._open(source)
+        if stream is not None:
+            with stream:
+                return self.read_ingredients(stream, progress)
+        
+        report = self._new_report()
+        ingredients: Dict[str, dict] = {}
+        reader = JSONStreamReader(source)
+        for key in reader.iter_object():
+            if key == "ingredients":
+                ingredients.update(self._records(reader, key, report, progress))
+            elif key in DOCUMENT_KEYS:
+                reader.skip_value()
+            else:
+                # Dictionnaire direct d'ingrédients : la clé est l'ID
+                record = self._accept("ingredients", key, reader.read_value(), report, progress)
+                if record is not None:
+                    ingredients[record[0]] = record[1]
+        reader.expect_end()
+        return ingredients, report
+    
+    # ---------- Import groupé d'ingrédients ----------
+    
+    def _read_ingredient_file(self, source: Source, schema: IngredientSchema) -> Tuple[List[Tuple[str, dict]], dict]:
+        """Lire et valider un fichier d'ingrédients, JSON ou CSV (exécuté en parallèle)"""
+        read = self.read_ingredients_csv if is_csv_source(source) else self.read_ingredients
+        ingredients, report = read(source)
+        records = []
+        for item_id, record in ingredients.items():
+            reason = schema.validate(item_id, record)
+            if reason:
+                self._reject(report, "ingredients", item_id, reason)
+            else:
+                records.append((item_id, record))
+        return records, report
+    
+    def read_ingredient_files(self, sources: Sequence[Source], schema: Optional[IngredientSchema] = None,
+                              progress: Optional[Callable[[int, Optional[int]], None]] = None,
+                              max_workers: int = 4) -> Tuple[List[Tuple[str, dict]], List[dict]]:
+        """Lire et valider plusieurs fichiers d'ingrédients en parallèle
+        
+        Ne modifie pas les données : utilisable en tâche de fond avant
+        ``apply_ingredients``. Renvoie les ingrédients valides (dans l'ordre
+        des fichiers) et les refus, chacun annoté de son fichier.
+        ``progress(fichiers lus, nombre de fichiers)`` suit l'avancement.
+        """
+        if schema is None:
+            schema = IngredientSchema(base["potion_type"] for base in self.potion_manager.data["bases"].values())
+        results = [None] * len(sources)
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(sources)))) as executor:
+            futures = {executor.submit(self._read_ingredient_file, source, schema): index
+                       for index, source in enumerate(sources)}
+            for done, future in enumerate(as_completed(futures), 1):
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except (OSError, ValueError) as e:
+                    # Fichier illisible : refusé en entier, les autres continuent
+                    report = self._new_report()
+                    self._reject(report, "ingredients", None, str(e))
+                    results[index] = ([], report)
+                if progress is not None:
+                    progress(done, len(sources))
+        
+        records, rejected = [], []
+        for source, (file_records, report) in zip(sources, results):
+            records.extend(file_records)
+            name = getattr(source, "name", source)
+            rejected.extend(dict(rejection, file=str(name)) for rejection in report["rejected"])
+        return records, rejected
+    
+    def apply_ingredients(self, records: Iterable[Tuple[str, dict]], policy: str = "skip") -> dict:
+        """Verser des ingrédients validés dans le stockage, en une seule sauvegarde
+        
+        Un ingrédient est en conflit si son ID ou son nom existe déjà (y
+        compris plus tôt dans le même import). ``policy`` décide alors :
+        "skip" garde l'existant, "replace" le remplace (sous son ID actuel),
+        "merge" complète l'existant avec les champs non vides importés,
+        "rename" ajoute l'import sous un ID et un nom libres. Un import qui
+        ne précise pas les types de potions autorisés garde ceux de
+        l'existant (remplacement comme fusion).
+        
+        Renvoie ``{"added", "replaced", "merged", "skipped": [ID],
+        "renamed": [(ID importé, nouvel ID)]}``.
+        """
+        if policy not in CONFLICT_POLICIES:
+            raise ValueError(f"Politique de conflit inconnue: {policy}")
+        
+        manager = self.potion_manager
+        ingredients = manager.data["ingredients"]
+        report = {"added": [], "replaced": [], "merged": [], "skipped": [], "renamed": []}
+        with manager.data_manager.batch():
+            for item_id, record in records:
+                existing_id = item_id if item_id in ingredients else manager.find_ingredient_id(record["name"])
+                if existing_id is None:
+                    manager.save_ingredient(record)
+                    report["added"].append(item_id)
+                elif policy == "skip":
+                    report["skipped"].append(item_id)
+                elif policy == "replace":
+                    replacement = dict(record, id=existing_id)
+                    if replacement.get("allowed_potion_types") is DEFAULT_POTION_TYPES:
+                        # Types absents du fichier (défaut posé par la migration) : ceux de l'existant
+                        replacement["allowed_potion_types"] = ingredients[existing_id].get(
+                            "allowed_potion_types", DEFAULT_POTION_TYPES)
+                    manager.save_ingredient(replacement)
+                    report["replaced"].append(existing_id)
+                elif policy == "merge":
+                    # Types de potions absents du fichier : la migration a posé le
+                    # tuple par défaut (jamais produit par le JSON), l'existant prime
+                    updates = {key: value for key, value in record.items()
+                               if key != "id" and value not in ("", None, [])
+                               and value is not DEFAULT_POTION_TYPES}
+                    manager.save_ingredient(dict(ingredients[existing_id], **updates, id=existing_id))
+                    report["merged"].append(existing_id)
+                else:
+                    new_id, new_name = self._free_identity(item_id, record["name"])
+                    manager.save_ingredient(dict(record, id=new_id, name=new_name))
+                    report["renamed"].append((item_id, new_id))
+        return report
+    
+    def _free_identity(self, item_id: str, name: str) -> Tuple[str, str]:
+        """Premier couple (ID, nom) suffixé qui n'est pas déjà utilisé"""
+        manager = self.potion_manager
+        suffix = 2
+        while (f"{item_id}_{suffix}" in manager.data["ingredients"]
+               or manager.find_ingredient_id(f"{name} ({suffix})")):
+            suffix += 1
+        return f"{item_id}_{suffix}", f"{name} ({suffix})"
+    
+    # ---------- Import CSV ----------
+    
+    def read_ingredients_csv(self, source: Source,
+                             progress: Optional[Callable[[int, Optional[int]], None]] = None) -> Tuple[Dict[str, dict], dict]:
+        """Lire un CSV d'ingrédients (colonnes de l'export) ; même résultat que ``read_ingredients``
+        
+        L'ID de chaque ingrédient est dérivé de son nom ; les cellules vides
+        prennent la valeur par défaut du modèle. Les types de potions sont
+        séparés par "|" ; laissés vides, ``apply_ingredients`` garde ceux
+        de l'ingrédient existant.
+        """
+        stream = self._open(source, "utf-8-sig", "")
+        if stream is not None:
+            with stream:
+                return self.read_ingredients_csv(stream, progress)
+        
+        report = self._new_report()
+        ingredients: Dict[str, dict] = {}
+        for line, row in iter_csv_rows(source, INGREDIENT_COLUMNS, "ingredients"):
+            record = {key: value for key, value in row.items() if value}
+            if not record.get("name"):
+                self._reject(report, "ingredients", f"ligne {line}", "nom manquant")
+                continue
+            if "allowed_potion_types" in record:
+                record["allowed_potion_types"] = [
+                    potion_type.strip() for potion_type in record["allowed_potion_types"].split(POTION_TYPES_SEPARATOR)
+                    if potion_type.strip()]
+            accepted = self._accept("ingredients", make_ingredient_id(record["name"]), record, report, progress)
+            if accepted is not None:
+                ingredients[accepted[0]] = accepted[1]
+        return ingredients, report
+    
+    def read_potions_csv(self, source: Source,
+                         progress: Optional[Callable[[int, Optional[int]], None]] = None) -> Tuple[List[dict], dict]:
+        """Lire un CSV de potions (colonnes de l'export) sans modifier les données
+        
+        Base et ingrédients sont retrouvés par leur nom ou leur libellé dans
+        les index d'identité ; "Créée le" et "Favorite" (Oui/Non) sont relus.
+        Renvoie les recettes ``{"line", "base", "ingredient1", "ingredient2",
+        "fields"}`` à passer à ``apply_potions``, et le rapport de lecture.
+        """
+        stream = self._open(source, "utf-8-sig", "")
+        if stream is not None:
+            with stream:
+                return self.read_potions_csv(stream, progress)
+        
+        manager = self.potion_manager
+        report = self._new_report()
+        potions: List[dict] = []
+        for line, row in iter_csv_rows(source, POTION_COLUMNS, "potions"):
+            where = f"ligne {line}"
+            base_id = manager.find_base_id(row.get("base", ""))
+            if base_id is None:
+                self._reject(report, "potions", where, f"base inconnue : {row.get('base', '')}")
+                continue
+            ingredient_ids = [manager.find_ingredient_id(row.get(key, "")) for key in ("ingredient1", "ingredient2")]
+            if None in ingredient_ids:
+                unknown = row.get("ingredient1" if ingredient_ids[0] is None else "ingredient2", "")
+                self._reject(report, "potions", where, f"ingrédient inconnu : {unknown}")
+                continue
+            try:
+                created_at = parse_created_at(row.get("created_at", ""))
+            except ValueError as e:
+                self._reject(report, "potions", where, str(e))
+                continue
+            is_favorite = FAVORITE_VALUES.get(row.get("is_favorite", "").lower())
+            if is_favorite is None:
+                self._reject(report, "potions", where, f"Favorite '{row['is_favorite']}' invalide (attendu : Oui, Non)")
+                continue
+            
+            potions.append({
+                "line": line, "base": base_id, "ingredient1": ingredient_ids[0], "ingredient2": ingredient_ids[1],
+                "fields": {"created_at": created_at, "category": row.get("category") or None,
+                           "name": row.get("name") or None, "is_favorite": is_favorite,
+                           "notes": row.get("notes", "")},
+            })
+            report["imported"]["potions"] = len(potions)
+            if progress is not None:
+                progress(len(potions), None)
+        return potions, report
+    
+    def apply_potions(self, potions: Iterable[dict]) -> dict:
+        """Créer les potions lues par ``read_potions_csv``, en une seule sauvegarde
+        
+        Une combinaison déjà présente (dans les données ou plus haut dans le
+        fichier) est ignorée ; une recette impossible (types, compatibilité
+        avec la base) est refusée. Renvoie ``{"created": [ID], "duplicates":
+        nombre, "rejected": [...], "rejected_count": nombre}``.
+        """
+        manager = self.potion_manager
+        result = {"created": [], "duplicates": 0, "rejected": [], "rejected_count": 0}
+        with manager.data_manager.batch():
+            for potion in potions:
+                recipe = (potion["base"], potion["ingredient1"], potion["ingredient2"])
+                if manager.has_combination(*recipe):
+                    result["duplicates"] += 1
+                    continue
+                reason = manager.validate_combination(*recipe)
+                if reason:
+                    self._reject(result, "potions", f"ligne {potion['line']}", reason)
+                    continue
+                result["created"].append(manager.create_potion(*recipe, **potion["fields"]).id)
+        return result
+
+
+def ingredient_import_summary(applied: dict, rejected: List[dict], details: int = 20) -> List[str]:
+    """Lignes du rapport d'un import groupé (``apply_ingredients`` + refus de lecture)"""
+    lines = [
+        f"Ajoutés : {len(applied['added'])}",
+        f"Remplacés : {len(applied['replaced'])}",
+        f"Fusionnés : {len(applied['merged'])}",
+        f"Renommés : {len(applied['renamed'])}",
+        f"Ignorés (déjà présents) : {len(applied['skipped'])}",
+        f"Refusés : {len(rejected)}",
+    ]
+    for old_id, new_id in applied["renamed"][:details]:
+        lines.append(f"  {old_id} -> {new_id}")
+    for rejection in rejected[:details]:
+        where = rejection["file"] if rejection["id"] is None else f"{rejection['file']} - {rejection['id']}"
+        lines.append(f"  {where} : {rejection['reason']}")
+    if len(rejected) > details:
+        lines.append(f"  ... et {len(rejected) - details} autre(s) refus")
+    return lines
+
+
+def potion_import_summary(applied: dict, report: dict, details: int = 20) -> List[str]:
+    """Lignes du rapport d'un import CSV de potions (lecture + ``apply_potions``)"""
+    rejected = report["rejected"] + applied["rejected"]
+    rejected_count = report["rejected_count"] + applied["rejected_count"]
+    lines = [
+        f"Créées : {len(applied['created'])}",
+        f"Ignorées (combinaison existante) : {applied['duplicates']}",
+        f"Refusées : {rejected_count}",
+    ]
+    for rejection in rejected[:details]:
+        lines.append(f"  {rejection['id']} : {rejection['reason']}")
+    if rejected_count > details:
+        lines.append(f"  ... et {rejected_count - min(details, len(rejected))} autre(s) refus")
+    return lines
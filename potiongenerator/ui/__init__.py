@@ -0,0 +1,8 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - interface graphique (Tkinter)
+
+Seul ce sous-paquet dépend de tkinter. ``app`` contient la fenêtre
+principale ; ``ingredients`` et ``dialogs`` ne sont importés qu'à la
+première ouverture d'un dialogue.
+"""
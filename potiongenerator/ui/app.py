@@ -0,0 +1,1021 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - Fenêtre principale
+
+Construite sur ``potiongenerator.core`` ; les dialogues rarement utilisés
+(ingrédients, statistiques, sauvegardes, débogage, aide) sont importés à
+leur première ouverture pour accélérer le démarrage.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog, simpledialog
+import sys
+import datetime
+from pathlib import Path
+from typing import Optional
+
+from ..core import Potion, PotionManager, create_sample_ingredients, set_error_handler
+from ..export import ExportEngine, format_for_path
+from ..importer import ImportEngine, potion_import_summary
+from .tasks import Task, TaskRunner, TaskStatusBar
+from .widgets import RefreshScheduler, SearchableCombobox, VirtualTreeview
+
+# ==================== DÉTAILS ====================
+
+class PotionDetailsPanel(ttk.Frame):
+    """Panel d'affichage des détails d'une potion"""
+    
+    # Délai (ms) après la dernière frappe avant la sauvegarde automatique des notes
+    NOTES_AUTOSAVE_DELAY = 800
+    
+    def __init__(self, parent, potion_manager):
+        super().__init__(parent)
+        self.potion_manager = potion_manager
+        self.current_potion = None
+        self._notes_after_id = None
+        
+        # Titre
+        self.title_var = tk.StringVar()
+        title_label = ttk.Label(self, textvariable=self.title_var, font=('Arial', 14, 'bold'))
+        title_label.pack(anchor='w', pady=(0, 10))
+        
+        # Informations principales
+        self.info_frame = ttk.LabelFrame(self, text="Informations")
+        self.info_frame.pack(fill=tk.X, pady=5)
+        
+        self.category_var = tk.StringVar()
+        self.base_var = tk.StringVar()
+        self.created_var = tk.StringVar()
+        
+        ttk.Label(self.info_frame, textvariable=self.category_var).pack(anchor='w', padx=5, pady=2)
+        ttk.Label(self.info_frame, textvariable=self.base_var).pack(anchor='w', padx=5, pady=2)
+        ttk.Label(self.info_frame, textvariable=self.created_var).pack(anchor='w', padx=5, pady=2)
+        
+        # Ingrédients
+        self.ingredients_frame = ttk.LabelFrame(self, text="Ingrédients")
+        self.ingredients_frame.pack(fill=tk.X, pady=5)
+        
+        self.ingredient1_var = tk.StringVar()
+        self.ingredient2_var = tk.StringVar()
+        
+        ttk.Label(self.ingredients_frame, textvariable=self.ingredient1_var, foreground='green').pack(anchor='w', padx=5, pady=2)
+        ttk.Label(self.ingredients_frame, textvariable=self.ingredient2_var, foreground='red').pack(anchor='w', padx=5, pady=2)
+        
+        # Notes
+        notes_frame = ttk.LabelFrame(self, text="Notes")
+        notes_frame.pack(fill=tk.BOTH, expand=True, pady=5)
+        
+        self.notes_text = tk.Text(notes_frame, height=4, wrap=tk.WORD)
+        notes_scrollbar = ttk.Scrollbar(notes_frame, command=self.notes_text.yview)
+        self.notes_text.config(yscrollcommand=notes_scrollbar.set)
+        
+        self.notes_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        notes_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=5)
+        
+        # Boutons d'action
+        actions_frame = ttk.Frame(self)
+        actions_frame.pack(fill=tk.X, pady=5)
+        
+        self.favorite_btn = ttk.Button(actions_frame, text="★ Favori", command=self._toggle_favorite)
+        self.favorite_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
+        ttk.Button(actions_frame, text="Sauver Notes", command=self._save_notes).pack(side=tk.LEFT, padx=5)
+        ttk.Button(actions_frame, text="Supprimer", command=self._delete_potion).pack(side=tk.RIGHT)
+        
+        # Binding pour les notes
+        self.notes_text.bind('<KeyRelease>', self._on_notes_change)
+    
+    def display_potion(self, potion: Potion):
+        """Afficher les détails d'une potion"""
+        self._autosave_notes()
+        self.current_potion = potion
+        
+        # Titre
+        self.title_var.set(potion.name)
+        
+        # Informations
+        self.category_var.set(f"Catégorie : {potion.category}")
+        base_name = self.potion_manager.data["bases"][potion.base]["name"]
+        self.base_var.set(f"Base : {base_name}")
+        
+        created_date = datetime.datetime.fromisoformat(potion.created_at).strftime("%d/%m/%Y %H:%M")
+        self.created_var.set(f"Créée le : {created_date}")
+        
+        # Ingrédients
+        ing1 = self.potion_manager.data["ingredients"][potion.ingredient1]
+        ing2 = self.potion_manager.data["ingredients"][potion.ingredient2]
+        
+        self.ingredient1_var.set(f"✓ {ing1['name']} ({ing1['effect']}, {ing1['quality']}, {ing1['duration']})")
+        self.ingredient2_var.set(f"✗ {ing2['name']} ({ing2['effect']}, {ing2['quality']}, {ing2['duration']})")
+        
+        # Notes
+        self.notes_text.delete(1.0, tk.END)
+        self.notes_text.insert(1.0, potion.notes)
+        
+        # Bouton favori
+        self.favorite_btn.config(text="★ Favori" if potion.is_favorite else "☆ Favori")
+    
+    def clear(self):
+        """Effacer l'affichage"""
+        self._autosave_notes()
+        self.current_potion = None
+        for var in [self.title_var, self.category_var, self.base_var, self.created_var, 
+                   self.ingredient1_var, self.ingredient2_var]:
+            var.set("")
+        self.notes_text.delete(1.0, tk.END)
+    
+    def _toggle_favorite(self):
+        """Basculer le statut favori"""
+        if self.current_potion:
+            new_status = self.potion_manager.toggle_favorite(self.current_potion.id)
+            self.favorite_btn.config(text="★ Favori" if new_status else "☆ Favori")
+            self.current_potion.is_favorite = new_status
+    
+    def _save_notes(self):
+        """Sauvegarder les notes"""
+        if self.current_potion:
+            self._autosave_notes()
+            self.potion_manager.data_manager.flush()
+            messagebox.showinfo("Succès", "Notes sauvegardées !")
+    
+    def _delete_potion(self):
+        """Supprimer la potion"""
+        if self.current_potion:
+            result = messagebox.askyesno("Confirmation", 
+                                       f"Êtes-vous sûr de vouloir supprimer '{self.current_potion.name}' ?")
+            if result:
+                self.potion_manager.delete_potion(self.current_potion.id)
+                self.clear()
+                messagebox.showinfo("Succès", "Potion supprimée !")
+                # Notifier le parent pour rafraîchir la liste
+                self.event_generate("<<PotionDeleted>>")
+    
+    def _on_notes_change(self, event):
+        """Programmer la sauvegarde automatique des notes"""
+        if self._notes_after_id is not None:
+            self.after_cancel(self._notes_after_id)
+        self._notes_after_id = self.after(self.NOTES_AUTOSAVE_DELAY, self._autosave_notes)
+    
+    def _autosave_notes(self):
+        """Enregistrer les notes de la potion affichée si elles ont changé"""
+        if self._notes_after_id is not None:
+            self.after_cancel(self._notes_after_id)
+            self._notes_after_id = None
+        
+        if self.current_potion:
+            notes = self.notes_text.get(1.0, tk.END).strip()
+            if notes != self.current_potion.notes:
+                self.potion_manager.update_potion_notes(self.current_potion.id, notes)
+                self.current_potion.notes = notes
+
+# ==================== MAIN APPLICATION ====================
+
+class PotionGeneratorApp:
+    """Application principale du générateur de potions"""
+    
+    # Taille maximale d'un lot créé depuis l'interface : la création (index,
+    # écriture) reste dans le thread Tk, les gros lots passent par la ligne
+    # de commande (``python -m potiongenerator generate N``)
+    BATCH_LIMIT = 500
+    
+    def __init__(self, data_file: str = "data/potions_data.json",
+                 potion_manager: Optional[PotionManager] = None):
+        self.root = tk.Tk()
+        self.root.title("Générateur de Potions Avancé - v2.0")
+        self.root.geometry("1400x800")
+        self.root.minsize(1200, 700)
+        
+        # Gestionnaire principal (déjà chargé par main() : un seul chargement)
+        self.potion_manager = potion_manager or PotionManager(data_file)
+        
+        # Variables d'interface
+        self.search_var = tk.StringVar()
+        self.sort_var = tk.StringVar(value="Nom")
+        self.filter_var = tk.StringVar(value="Toutes")
+        
+        # Rafraîchissements regroupés (les listes avant la validation)
+        self.scheduler = RefreshScheduler(self.root)
+        
+        # Opérations longues en tâche de fond ; les erreurs signalées depuis
+        # un autre thread sont affichées par le thread Tk
+        self.tasks = TaskRunner(self.root)
+        set_error_handler(lambda title, message: self.tasks.call_soon(messagebox.showerror, title, message))
+        # Actions en attente de l'espace des recettes (construit en tâche de fond)
+        self._space_waiters = []
+        
+        # Créer l'interface
+        self._create_menu()
+        self._create_ui()
+        self._register_refreshes()
+        self._bind_events()
+        
+        # Initialiser l'affichage
+        self._refresh_all()
+    
+    def _create_menu(self):
+        """Créer la barre de menu"""
+        menubar = tk.Menu(self.root)
+        self.root.config(menu=menubar)
+        
+        # Menu Fichier
+        file_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Fichier", menu=file_menu)
+        file_menu.add_command(label="Exporter CSV", command=self._export_csv)
+        file_menu.add_command(label="Exporter JSON", command=self._export_json)
+        file_menu.add_separator()
+        file_menu.add_command(label="Importer", command=self._import_data)
+        file_menu.add_command(label="Importer CSV", command=self._import_csv)
+        file_menu.add_separator()
+        file_menu.add_command(label="Quitter", command=self._on_closing)
+        
+        # Menu Ingrédients
+        ingredients_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Ingrédients", menu=ingredients_menu)
+        ingredients_menu.add_command(label="Gestionnaire d'Ingrédients", command=self._open_ingredient_manager)
+        ingredients_menu.add_command(label="Nouvel Ingrédient", command=self._new_ingredient_quick)
+        ingredients_menu.add_separator()
+        ingredients_menu.add_command(label="Importer Ingrédients", command=self._import_ingredients)
+        ingredients_menu.add_command(label="Exporter Ingrédients", command=self._export_ingredients)
+        
+        # Menu Outils  
+        tools_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Outils", menu=tools_menu)
+        tools_menu.add_command(label="Statistiques", command=self._show_statistics)
+        tools_menu.add_command(label="Générer un lot...", command=self._generate_batch)
+        tools_menu.add_command(label="Nettoyage", command=self._cleanup_data)
+        tools_menu.add_command(label="Vérifier Cohérence", command=self._check_data_integrity)
+        tools_menu.add_command(label="Sauvegardes...", command=self._show_backups)
+        tools_menu.add_separator()
+        tools_menu.add_command(label="Debug Info", command=self._show_debug_info)
+        
+        # Menu Aide
+        help_menu = tk.Menu(menubar, tearoff=0)
+        menubar.add_cascade(label="Aide", menu=help_menu)
+        help_menu.add_command(label="Guide", command=self._show_help)
+        help_menu.add_command(label="À propos", command=self._show_about)
+    
+    def _create_ui(self):
+        """Créer l'interface utilisateur"""
+        # Barre d'état des tâches de fond (placée avant le conteneur extensible)
+        self.task_bar = TaskStatusBar(self.root, self.tasks)
+        self.task_bar.pack(side=tk.BOTTOM, fill=tk.X, padx=5, pady=(0, 5))
+        
+        # Conteneur principal avec panneaux redimensionnables
+        main_paned = ttk.PanedWindow(self.root, orient=tk.HORIZONTAL)
+        main_paned.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Panel gauche - Création
+        left_frame = ttk.Frame(main_paned)
+        main_paned.add(left_frame, weight=1)
+        
+        # Panel droit avec sous-panneaux
+        right_paned = ttk.PanedWindow(main_paned, orient=tk.VERTICAL)
+        main_paned.add(right_paned, weight=2)
+        
+        # Panel liste des potions
+        list_frame = ttk.Frame(right_paned)
+        right_paned.add(list_frame, weight=1)
+        
+        # Panel détails
+        details_frame = ttk.Frame(right_paned)
+        right_paned.add(details_frame, weight=1)
+        
+        # Créer les sections 
+        self._create_creation_panel(left_frame)
+        self._create_list_panel(list_frame)
+        self._create_details_panel(details_frame)
+    
+    def _create_creation_panel(self, parent):
+        """Créer le panel de création de potions"""
+        # Titre
+        title_label = ttk.Label(parent, text="Création de Potion", font=('Arial', 16, 'bold'))
+        title_label.pack(pady=(0, 20))
+        
+        # Base
+        base_frame = ttk.LabelFrame(parent, text="Base de la potion")
+        base_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.base_var = tk.StringVar()
+        bases = self.potion_manager.get_bases()
+        base_values = [PotionManager.base_label(base) for base in bases]
+        
+        self.base_combo = ttk.Combobox(base_frame, textvariable=self.base_var, 
+                                      values=base_values, state="readonly")
+        self.base_combo.pack(fill=tk.X, padx=5, pady=5)
+        
+        # Ingrédient positif
+        pos_frame = ttk.LabelFrame(parent, text="Ingrédient (Effet positif)")
+        pos_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.pos_search = SearchableCombobox(pos_frame)
+        self.pos_search.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Ingrédient négatif
+        neg_frame = ttk.LabelFrame(parent, text="Ingrédient (Effet négatif)")
+        neg_frame.pack(fill=tk.X, padx=10, pady=5)
+        
+        self.neg_search = SearchableCombobox(neg_frame)
+        self.neg_search.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Status et boutons
+        self.status_var = tk.StringVar()
+        status_label = ttk.Label(parent, textvariable=self.status_var, foreground='red')
+        status_label.pack(pady=5)
+        
+        buttons_frame = ttk.Frame(parent)
+        buttons_frame.pack(fill=tk.X, padx=10, pady=10)
+        
+        self.create_btn = ttk.Button(buttons_frame, text="Créer Potion", 
+                                    command=self._create_potion, state="disabled")
+        self.create_btn.pack(fill=tk.X, pady=2)
+        
+        ttk.Button(buttons_frame, text="Réinitialiser", 
+                  command=self._reset_form).pack(fill=tk.X, pady=2)
+        
+        ttk.Button(buttons_frame, text="Suggestion Aléatoire", 
+                  command=self._random_suggestion).pack(fill=tk.X, pady=2)
+    
+    def _create_list_panel(self, parent):
+        """Créer le panel de liste des potions"""
+        # Titre et contrôles
+        header_frame = ttk.Frame(parent)
+        header_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        ttk.Label(header_frame, text="Liste des Potions", font=('Arial', 14, 'bold')).pack(side=tk.LEFT)
+        
+        # Contrôles de recherche et tri
+        controls_frame = ttk.Frame(parent)
+        controls_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        # Recherche
+        ttk.Label(controls_frame, text="Recherche:").grid(row=0, column=0, sticky='w', padx=(0, 5))
+        search_entry = ttk.Entry(controls_frame, textvariable=self.search_var, width=20)
+        search_entry.grid(row=0, column=1, sticky='ew', padx=(0, 10))
+        
+        # Tri
+        ttk.Label(controls_frame, text="Trier par:").grid(row=0, column=2, sticky='w', padx=(0, 5))
+        sort_combo = ttk.Combobox(controls_frame, textvariable=self.sort_var, 
+                                 values=["Nom", "Catégorie", "Date", "Base"], 
+                                 state="readonly", width=15)
+        sort_combo.grid(row=0, column=3, sticky='ew', padx=(0, 10))
+        
+        # Filtre
+        ttk.Label(controls_frame, text="Filtre:").grid(row=0, column=4, sticky='w', padx=(0, 5))
+        filter_combo = ttk.Combobox(controls_frame, textvariable=self.filter_var,
+                                   values=["Toutes", "Favorites", "Mineur", "Majeur", "Légendaire", "Mythique"],
+                                   state="readonly", width=15)
+        filter_combo.grid(row=0, column=5, sticky='ew')
+        
+        controls_frame.columnconfigure(1, weight=1)
+        controls_frame.columnconfigure(3, weight=1)
+        controls_frame.columnconfigure(5, weight=1)
+        
+        # Liste des potions avec scrollbars
+        list_container = ttk.Frame(parent)
+        list_container.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Treeview virtualisé pour affichage tabulaire
+        columns = ("name", "category", "base", "created")
+        self.potions_tree = VirtualTreeview(list_container, columns=columns, row_factory=self._potion_row,
+                                            show="tree headings", height=15)
+        
+        # Configuration des colonnes
+        self.potions_tree.heading("#0", text="★")
+        self.potions_tree.heading("name", text="Nom")
+        self.potions_tree.heading("category", text="Catégorie") 
+        self.potions_tree.heading("base", text="Base")
+        self.potions_tree.heading("created", text="Créée le")
+        
+        self.potions_tree.column("#0", width=30, minwidth=30)
+        self.potions_tree.column("name", width=300, minwidth=200)
+        self.potions_tree.column("category", width=100, minwidth=80)
+        self.potions_tree.column("base", width=100, minwidth=80)
+        self.potions_tree.column("created", width=120, minwidth=100)
+        
+        # Placement
+        self.potions_tree.pack(fill=tk.BOTH, expand=True)
+        
+        # Statistiques en bas
+        stats_frame = ttk.Frame(parent)
+        stats_frame.pack(fill=tk.X, padx=5, pady=5)
+        
+        self.stats_var = tk.StringVar()
+        ttk.Label(stats_frame, textvariable=self.stats_var).pack(side=tk.LEFT)
+        
+        ttk.Button(stats_frame, text="Actualiser",
+                   command=lambda: self.scheduler.request("potions")).pack(side=tk.RIGHT)
+    
+    def _create_details_panel(self, parent):
+        """Créer le panel de détails"""
+        self.details_panel = PotionDetailsPanel(parent, self.potion_manager)
+        self.details_panel.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+    
+    def _register_refreshes(self):
+        """Enregistrer les rafraîchissements auprès du planificateur"""
+        self.scheduler.register("ingredients", self._refresh_ingredients, order=0)
+        self.scheduler.register("potions", self._refresh_potions_list, order=1)
+        self.scheduler.register("validation", self._validate_creation, order=2)
+    
+    def _bind_events(self):
+        """Lier les événements"""
+        # Quand la base change : ingrédients compatibles puis validation
+        self.base_combo.bind("<<ComboboxSelected>>",
+                             lambda e: self.scheduler.request("ingredients", "validation"))
+        
+        # Validation en temps réel pour la création
+        self.pos_search.var.trace('w', lambda *args: self.scheduler.request("validation"))
+        self.neg_search.var.trace('w', lambda *args: self.scheduler.request("validation"))
+        
+        # Recherche et filtres
+        self.search_var.trace('w', lambda *args: self.scheduler.request("potions", delay=RefreshScheduler.TYPING_DELAY))
+        self.sort_var.trace('w', lambda *args: self.scheduler.request("potions"))
+        self.filter_var.trace('w', lambda *args: self.scheduler.request("potions"))
+        
+        # Sélection dans la liste
+        self.potions_tree.bind("<<TreeviewSelect>>", self._on_potion_select)
+        self.potions_tree.bind("<Double-1>", self._on_potion_double_click)
+        
+        # Suppression de potion et changements d'ingrédients
+        self.details_panel.bind("<<PotionDeleted>>", lambda e: self.scheduler.request("potions", "validation"))
+        self.root.bind("<<IngredientsChanged>>", lambda e: self._on_ingredients_changed())
+        
+        # Raccourcis clavier
+        self.root.bind("<Control-n>", lambda e: self._create_potion())
+        self.root.bind("<Control-r>", lambda e: self._reset_form())
+        self.root.bind("<Control-s>", lambda e: self._export_csv())
+        self.root.bind("<Control-i>", lambda e: self._open_ingredient_manager())
+        self.root.bind("<F5>", lambda e: self._refresh_all())
+        
+        # Fermeture de l'application
+        self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
+    
+    def _on_ingredients_changed(self):
+        """Réagir aux changements d'ingrédients"""
+        self.scheduler.request("ingredients", "potions", "validation")
+    
+    def _open_ingredient_manager(self):
+        """Ouvrir le gestionnaire d'ingrédients"""
+        from .ingredients import IngredientManagerDialog
+        IngredientManagerDialog(self.root, self.potion_manager)
+    
+    def _new_ingredient_quick(self):
+        """Créer rapidement un nouvel ingrédient"""
+        from .ingredients import IngredientEditorDialog
+        editor = IngredientEditorDialog(self.root, self.potion_manager)
+        self.root.wait_window(editor.dialog)
+        
+        if editor.result:
+            self._on_ingredients_changed()
+            messagebox.showinfo("Succès", f"Ingrédient '{editor.result.name}' créé avec succès !")
+    
+    def _import_ingredients(self):
+        """Importer des ingrédients depuis un ou plusieurs fichiers JSON"""
+        from .ingredients import IngredientImportDialog
+        IngredientImportDialog(self.root, self.potion_manager, self.tasks, on_import=self._on_ingredients_changed)
+    
+    def _export_ingredients(self):
+        """Exporter tous les ingrédients"""
+        if not self.potion_manager.data["ingredients"]:
+            messagebox.showinfo("Aucun ingrédient", "Aucun ingrédient à exporter.")
+            return
+        
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("CSV files", "*.csv"), ("All files", "*.*")],
+            initialfile="ingredients_export.json"
+        )
+        
+        if filepath:
+            engine = ExportEngine(self.potion_manager)
+            self._run_export("Export des ingrédients", filepath,
+                             lambda task: engine.export_ingredients(filepath, format_for_path(filepath, "json"),
+                                                                    progress=task.progress),
+                             lambda count: f"{count} ingrédient(s) exporté(s) dans {filepath}")
+    
+    def _run_export(self, label: str, filepath: str, work, message):
+        """Lancer un export en tâche de fond ; un export annulé ou en échec est effacé"""
+        def run(task: Task) -> int:
+            try:
+                return work(task)
+            except Exception:
+                Path(filepath).unlink(missing_ok=True)
+                raise
+        
+        self.tasks.submit(label, run,
+                          on_done=lambda count: messagebox.showinfo("Export terminé", message(count)),
+                          on_error=lambda e: messagebox.showerror("Erreur d'export", f"Impossible d'exporter: {e}"))
+    
+    def _show_debug_info(self):
+        """Afficher les informations de débogage (instantané pris ici, texte calculé en tâche de fond)"""
+        from .dialogs import TextDialog, debug_info_text, debug_snapshot
+        snapshot = debug_snapshot(self.potion_manager)
+        self.tasks.submit("Informations de débogage", lambda task: debug_info_text(self.potion_manager, snapshot),
+                          on_done=lambda text: TextDialog(self.root, "Informations de Débogage", text,
+                                                          geometry="800x600", font=('Courier', 10)))
+    
+    def _check_data_integrity(self):
+        """Vérifier la cohérence des données (en tâche de fond)"""
+        self.tasks.submit("Vérification de la cohérence",
+                          lambda task: self.potion_manager.check_integrity(progress=task.progress),
+                          on_done=self._show_integrity_report)
+    
+    def _show_integrity_report(self, issues: list):
+        """Afficher le résultat de la vérification de cohérence"""
+        if issues:
+            issues_text = "\n".join(issues[:20])  # Limiter l'affichage
+            if len(issues) > 20:
+                issues_text += f"\n... et {len(issues) - 20} autres problèmes"
+            
+            messagebox.showwarning("Problèmes détectés", 
+                                 f"{len(issues)} problème(s) détecté(s):\n\n{issues_text}")
+        else:
+            messagebox.showinfo("Vérification terminée", "Aucun problème détecté. Les données sont cohérentes !")
+    
+    def _refresh_all(self):
+        """Actualiser tous les éléments de l'interface"""
+        self.scheduler.request("ingredients", "potions", "validation")
+    
+    def _refresh_ingredients(self):
+        """Actualiser les listes d'ingrédients selon la base sélectionnée"""
+        # Obtenir le type de potion sélectionné
+        potion_type = None
+        if self.base_var.get():
+            base_id = self._extract_base_id(self.base_var.get())
+            if base_id and base_id in self.potion_manager.data["bases"]:
+                potion_type = self.potion_manager.data["bases"][base_id]["potion_type"]
+        
+        # Obtenir tous les ingrédients
+        pos_ingredients = self.potion_manager.get_ingredients("positif")
+        neg_ingredients = self.potion_manager.get_ingredients("négatif")
+        
+        # Filtrer selon le type de potion si une base est sélectionnée
+        if potion_type:
+            pos_ingredients = [ing for ing in pos_ingredients 
+                             if potion_type in ing.allowed_potion_types]
+            neg_ingredients = [ing for ing in neg_ingredients 
+                             if potion_type in ing.allowed_potion_types]
+        
+        pos_names = [PotionManager.ingredient_label(ing) for ing in pos_ingredients]
+        neg_names = [PotionManager.ingredient_label(ing) for ing in neg_ingredients]
+        
+        self.pos_search.set_values(pos_names)
+        self.neg_search.set_values(neg_names)
+    
+    
+    def _refresh_potions_list(self):
+        """Actualiser la liste des potions"""
+        # Obtenir les potions filtrées et triées ; seules les lignes visibles sont construites
+        potion_ids = self.potion_manager.query_potion_ids(**self._potion_query())
+        self.potions_tree.set_keys(potion_ids)
+        
+        # Mettre à jour les statistiques
+        self._update_statistics()
+    
+    def _potion_row(self, potion_id: str) -> dict:
+        """Options d'une ligne de la liste des potions"""
+        potion = self.potion_manager.get_potion(potion_id)
+        # Formater la date
+        created_date = datetime.datetime.fromisoformat(potion.created_at).strftime("%d/%m/%Y")
+        
+        # Obtenir le nom de la base
+        base_name = self.potion_manager.data["bases"][potion.base]["name"]
+        
+        # Icône favorite
+        favorite_icon = "★" if potion.is_favorite else ""
+        
+        return {
+            "text": favorite_icon,
+            "values": (potion.name, potion.category, base_name, created_date)
+        }
+    
+    def _potion_query(self) -> dict:
+        """Critères de recherche, filtre et tri de la liste des potions"""
+        filter_value = self.filter_var.get()
+        return {
+            "search": self.search_var.get(),
+            "category": filter_value if filter_value in ["Mineur", "Majeur", "Légendaire", "Mythique"] else None,
+            "favorites_only": filter_value == "Favorites",
+            "sort_by": self.sort_var.get()
+        }
+    
+    def _update_statistics(self):
+        """Mettre à jour l'affichage des statistiques"""
+        statistics = self.potion_manager.statistics
+        total = statistics.total
+        favorites = statistics.favorites
+        
+        # Compter les potions affichées
+        displayed = len(self.potions_tree)
+        
+        stats_text = f"Total: {total} potions | Affichées: {displayed} | Favorites: {favorites}"
+        self.stats_var.set(stats_text)
+    
+    def _validate_creation(self, *args):
+        """Valider la possibilité de créer une potion"""
+        base = self.base_var.get()
+        pos_ing = self.pos_search.get()
+        neg_ing = self.neg_search.get()
+        
+        if not all([base, pos_ing, neg_ing]):
+            self.status_var.set("Veuillez sélectionner tous les champs")
+            self.create_btn.config(state="disabled")
+            return
+        
+        # Extraire les IDs
+        try:
+            base_id = self._extract_base_id(base)
+            pos_id = self._extract_ingredient_id(pos_ing, "positif")
+            neg_id = self._extract_ingredient_id(neg_ing, "négatif")
+            
+            if not all([base_id, pos_id, neg_id]):
+                raise ValueError("IDs non trouvés")
+            
+            # Vérifier que les ingrédients sont autorisés pour ce type de potion
+            base_data = self.potion_manager.data["bases"][base_id]
+            potion_type = base_data["potion_type"]
+            
+            pos_ingredient = self.potion_manager.data["ingredients"][pos_id]
+            neg_ingredient = self.potion_manager.data["ingredients"][neg_id]
+            
+            # Vérifier les types autorisés
+            pos_allowed = pos_ingredient.get("allowed_potion_types", [])
+            neg_allowed = neg_ingredient.get("allowed_potion_types", [])
+            
+            if potion_type not in pos_allowed:
+                self.status_var.set(f"{pos_ingredient['name']} n'est pas utilisable dans les {potion_type}s")
+                self.create_btn.config(state="disabled")
+                return
+            
+            if potion_type not in neg_allowed:
+                self.status_var.set(f"{neg_ingredient['name']} n'est pas utilisable dans les {potion_type}s")
+                self.create_btn.config(state="disabled")
+                return
+            
+        except:
+            self.status_var.set("Sélections invalides")
+            self.create_btn.config(state="disabled")
+            return
+        
+        # Vérifier les doublons
+        if self.potion_manager.has_combination(base_id, pos_id, neg_id):
+            self.status_var.set("Cette combinaison existe déjà")
+            self.create_btn.config(state="disabled")
+            return
+        
+        # Tout est valide
+        self.status_var.set("Prêt à créer")
+        self.create_btn.config(state="normal")
+    
+    def _extract_base_id(self, base_display: str) -> str:
+        """Extraire l'ID de base depuis l'affichage"""
+        return self.potion_manager.find_base_id(base_display) or ""
+    
+    def _extract_ingredient_id(self, ingredient_display: str, expected_type: str) -> str:
+        """Extraire l'ID d'ingrédient depuis l'affichage"""
+        return self.potion_manager.find_ingredient_id(ingredient_display, expected_type) or ""
+    
+    def _create_potion(self):
+        """Créer une nouvelle potion"""
+        try:
+            base_id = self._extract_base_id(self.base_var.get())
+            pos_id = self._extract_ingredient_id(self.pos_search.get(), "positif")
+            neg_id = self._extract_ingredient_id(self.neg_search.get(), "négatif")
+            
+            potion = self.potion_manager.create_potion(base_id, pos_id, neg_id)
+            
+            if potion:
+                messagebox.showinfo("Succès", f"Potion créée: {potion.name}")
+                self.scheduler.request("potions", "validation")
+                self._reset_form()
+            else:
+                messagebox.showerror("Erreur", "Impossible de créer la potion (doublon?)")
+                
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Erreur lors de la création: {e}")
+    
+    def _reset_form(self):
+        """Réinitialiser le formulaire de création"""
+        self.base_var.set("")
+        self.pos_search.set("")
+        self.neg_search.set("")
+        self.status_var.set("")
+        self.create_btn.config(state="disabled")
+    
+    def _random_suggestion(self):
+        """Suggérer une combinaison aléatoire, valide et encore inutilisée"""
+        self._with_combination_space(self._apply_random_suggestion)
+    
+    def _apply_random_suggestion(self):
+        """Remplir le formulaire avec une recette tirée dans l'espace des recettes"""
+        suggestions = self.potion_manager.suggest_combinations(1)
+        if not suggestions:
+            messagebox.showinfo("Aucune suggestion", "Toutes les combinaisons valides ont déjà été utilisées.")
+            return
+        
+        base_id, pos_id, neg_id = suggestions[0]
+        base = self.potion_manager.get_base(base_id)
+        pos_ing = self.potion_manager.get_ingredient(pos_id)
+        neg_ing = self.potion_manager.get_ingredient(neg_id)
+        
+        if base and pos_ing and neg_ing:
+            self.base_var.set(PotionManager.base_label(base))
+            self.pos_search.set(PotionManager.ingredient_label(pos_ing))
+            self.neg_search.set(PotionManager.ingredient_label(neg_ing))
+            self.scheduler.request("ingredients", "validation")
+    
+    def _on_potion_select(self, event):
+        """Gestion de la sélection d'une potion"""
+        selection = self.potions_tree.selection()
+        if selection:
+            # L'ID de la potion sert de clé de ligne
+            potion_id = selection[0]
+            
+            # Trouver la potion
+            potion = self.potion_manager.get_potion(potion_id)
+            if potion:
+                self.details_panel.display_potion(potion)
+    
+    def _on_potion_double_click(self, event):
+        """Gestion du double-clic sur une potion"""
+        # Ici on pourrait ouvrir une fenêtre d'édition détaillée
+        pass
+    
+    def _export_csv(self):
+        """Exporter les potions (CSV, JSON Lines ou JSON selon l'extension)"""
+        total = self.potion_manager.statistics.total
+        if not total:
+            messagebox.showinfo("Aucune potion", "Aucune potion à exporter.")
+            return
+        
+        # Liste filtrée : proposer de n'exporter que la vue affichée (dans son ordre)
+        potion_ids = None
+        displayed = len(self.potions_tree)
+        if displayed != total:
+            choice = messagebox.askyesnocancel(
+                "Exporter",
+                f"Exporter seulement les {displayed} potion(s) affichée(s) ?\n"
+                f"(Non : exporter les {total} potions)")
+            if choice is None:
+                return
+            if choice:
+                potion_ids = list(self.potions_tree.keys)
+        
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines", "*.jsonl"), ("JSON files", "*.json"),
+                       ("All files", "*.*")],
+            initialfile="potions_export.csv"
+        )
+        
+        if filepath:
+            engine = ExportEngine(self.potion_manager)
+            self._run_export("Export des potions", filepath,
+                             lambda task: engine.export_potions(filepath, format_for_path(filepath),
+                                                                potion_ids=potion_ids, progress=task.progress),
+                             lambda count: f"{count} potion(s) exportée(s) dans {filepath}")
+    
+    def _export_json(self):
+        """Exporter toutes les données en JSON"""
+        filepath = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            initialfile="potions_backup.json"
+        )
+        
+        if filepath:
+            engine = ExportEngine(self.potion_manager)
+            # Synchronisation et copie des petites sections ici, dans le thread Tk
+            snapshot = engine.document_snapshot()
+            self._run_export("Export des données", filepath,
+                             lambda task: engine.export_document(filepath, progress=task.progress,
+                                                                 snapshot=snapshot),
+                             lambda count: f"Données exportées dans {filepath}")
+    
+    def _import_data(self):
+        """Importer des données"""
+        filepath = filedialog.askopenfilename(
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        
+        if filepath:
+            result = messagebox.askyesno("Confirmation", 
+                                       "L'import va remplacer toutes les données actuelles. Continuer ?")
+            if result:
+                # Lecture en flux (validée et migrée) en tâche de fond, remplacement dans le thread Tk
+                engine = ImportEngine(self.potion_manager)
+                self.tasks.submit("Import des données",
+                                  lambda task: engine.read_document(filepath, progress=task.progress),
+                                  on_done=self._replace_imported_data,
+                                  on_error=lambda e: messagebox.showerror("Erreur d'import",
+                                                                          f"Impossible d'importer: {e}"))
+    
+    def _replace_imported_data(self, result):
+        """Remplacer les données par le document importé"""
+        document, report = result
+        try:
+            self.potion_manager.replace_data(document)
+        except Exception as e:
+            messagebox.showerror("Erreur d'import", f"Impossible d'importer: {e}")
+            return
+        
+        message = "Données importées avec succès !"
+        if report["rejected_count"]:
+            first = report["rejected"][0]
+            message += (f"\n{report['rejected_count']} entrée(s) ignorée(s), par exemple "
+                        f"{first['section']} {first['id']} : {first['reason']}")
+        messagebox.showinfo("Import terminé", message)
+        self.details_panel.clear()
+        self._refresh_all()
+    
+    def _import_csv(self):
+        """Ajouter les potions d'un CSV exporté puis retouché dans un tableur"""
+        filepath = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        
+        if filepath:
+            # Lecture et résolution des noms en tâche de fond, création dans le thread Tk
+            engine = ImportEngine(self.potion_manager)
+            self.tasks.submit("Import CSV",
+                              lambda task: engine.read_potions_csv(filepath, progress=task.progress),
+                              on_done=lambda result: self._add_imported_potions(engine, result),
+                              on_error=lambda e: messagebox.showerror("Erreur d'import",
+                                                                      f"Impossible d'importer: {e}"))
+    
+    def _add_imported_potions(self, engine: ImportEngine, result):
+        """Créer les potions lues dans le CSV (une seule sauvegarde) et en rendre compte"""
+        potions, report = result
+        applied = engine.apply_potions(potions)
+        self._refresh_all()
+        messagebox.showinfo("Import CSV terminé", "\n".join(potion_import_summary(applied, report)))
+    
+    def _show_statistics(self):
+        """Afficher les statistiques détaillées
+        
+        Les compteurs, tenus à jour, sont lus dans le thread Tk ; les
+        recettes restantes s'affichent une fois l'espace des recettes
+        construit en tâche de fond.
+        """
+        from .dialogs import StatisticsDialog
+        dialog = StatisticsDialog(self.root, self.potion_manager)
+        self._with_combination_space(lambda: dialog.show_remaining(self.potion_manager.get_remaining_counts()))
+    
+    def _with_combination_space(self, callback):
+        """Appeler ``callback`` (thread Tk) dès que l'espace des recettes est prêt
+        
+        Sa première construction parcourt toutes les potions : elle passe
+        par le TaskRunner, sur un instantané, puis l'espace est adopté dans
+        le thread Tk.
+        """
+        if self.potion_manager.combination_space_ready:
+            callback()
+            return
+        self._space_waiters.append(callback)
+        if len(self._space_waiters) == 1:
+            self._build_combination_space()
+    
+    def _build_combination_space(self):
+        """Construire l'espace des recettes en tâche de fond"""
+        build = self.potion_manager.prepare_combination_space()
+        self.tasks.submit("Calcul des recettes disponibles", lambda task: build(task.progress),
+                          on_done=self._install_combination_space,
+                          on_error=self._abandon_combination_space,
+                          on_cancel=self._abandon_combination_space)
+    
+    def _install_combination_space(self, built):
+        """Adopter l'espace construit et servir les actions en attente"""
+        if not self.potion_manager.install_combination_space(built):
+            # Ingrédients modifiés pendant le calcul : le recommencer
+            self._build_combination_space()
+            return
+        waiters, self._space_waiters = self._space_waiters, []
+        for callback in waiters:
+            callback()
+    
+    def _abandon_combination_space(self, error: Optional[Exception] = None):
+        """Oublier les actions en attente (calcul annulé ou en échec)"""
+        self._space_waiters.clear()
+        if error is not None:
+            messagebox.showerror("Erreur", f"Impossible de calculer les recettes disponibles: {error}")
+    
+    def _show_backups(self):
+        """Lister les sauvegardes et en restaurer une"""
+        from .dialogs import BackupsDialog
+        BackupsDialog(self.root, self.potion_manager, on_restore=self._on_backup_restored)
+    
+    def _on_backup_restored(self):
+        """Réafficher les données après la restauration d'une sauvegarde"""
+        self.details_panel.clear()
+        self._refresh_all()
+    
+    def _generate_batch(self):
+        """Générer un lot de potions parmi les combinaisons encore disponibles
+        
+        L'espace des recettes est construit au besoin en tâche de fond ; le
+        lot, limité à BATCH_LIMIT potions, est créé dans le thread Tk.
+        """
+        count = simpledialog.askinteger(
+            "Générer un lot",
+            f"Nombre de potions à générer (au plus {self.BATCH_LIMIT}) :\n"
+            f"Pour un lot plus grand : python -m potiongenerator generate N",
+            parent=self.root, minvalue=1, maxvalue=self.BATCH_LIMIT)
+        if not count:
+            return
+        self._with_combination_space(lambda: self._create_batch(count))
+    
+    def _create_batch(self, count: int):
+        """Créer un lot de ``count`` potions (une seule sauvegarde) et en rendre compte"""
+        report = self.potion_manager.create_potions_batch(count)
+        message = f"{len(report['created'])} potion(s) créée(s)."
+        if report["rejected"]:
+            message += f"\n{len(report['rejected'])} refus : {report['rejected'][0]['reason']}"
+        messagebox.showinfo("Lot généré", message)
+        self.scheduler.request("potions", "validation")
+    
+    def _cleanup_data(self):
+        """Nettoyer les données (supprimer les entrées orphelines)"""
+        # Ici on pourrait implémenter un nettoyage des données corrompues
+        messagebox.showinfo("Nettoyage", "Fonction de nettoyage non implémentée dans cette version.")
+    
+    def _show_help(self):
+        """Afficher l'aide"""
+        from .dialogs import HELP_TEXT, TextDialog
+        TextDialog(self.root, "Guide d'utilisation", HELP_TEXT)
+    
+    def _show_about(self):
+        """Afficher les informations sur l'application"""
+        about_text = """
+Générateur de Potions Avancé
+Version 2.0
+
+Application de création et gestion de potions alchimiques
+pour jeux de rôle et univers fantasy.
+
+Fonctionnalités:
+• Création de potions par combinaison d'ingrédients
+• Gestion complète avec favoris et notes
+• Recherche et filtrage avancés
+• Export/Import de données
+• Statistiques détaillées
+• Interface moderne et intuitive
+
+Développé avec Python et Tkinter
+Architecture modulaire et extensible
+"""
+        messagebox.showinfo("À propos", about_text)
+    
+    def _on_closing(self):
+        """Gestion de la fermeture de l'application"""
+        # Sauvegarder automatiquement (seulement si des modifications sont en attente)
+        self.details_panel._autosave_notes()
+        self.scheduler.cancel()
+        self.tasks.shutdown()
+        self.potion_manager.data_manager.close()
+        self.root.destroy()
+    
+    def run(self):
+        """Lancer l'application"""
+        self.root.mainloop()
+
+
+# ==================== POINT D'ENTRÉE ====================
+
+def main():
+    """Point d'entrée principal"""
+    # Erreurs de stockage affichées en boîte de dialogue
+    set_error_handler(messagebox.showerror)
+    
+    try:
+        # Fichier de données : JSON par défaut, ou base SQLite (.sqlite/.db) en argument
+        data_file = sys.argv[1] if len(sys.argv) > 1 else "data/potions_data.json"
+        
+        # Chargement unique : le même gestionnaire sert ensuite à l'interface
+        potion_manager = PotionManager(data_file)
+        data_manager = potion_manager.data_manager
+        
+        # Debug: Afficher les informations de base
+        print(f"Fichier de données: {data_manager.data_file}")
+        print(f"Fichier existe: {data_manager.data_file.exists()}")
+        print(f"Nombre d'ingrédients: {len(data_manager.data.get('ingredients', {}))}")
+        
+        if not data_manager.data["ingredients"]:
+            print("ATTENTION: Aucun ingrédient trouvé, ajout d'échantillons...")
+            # Ajouter des ingrédients d'exemple (une seule écriture)
+            sample_ingredients = create_sample_ingredients()
+            with data_manager.batch():
+                for ingredient_data in sample_ingredients.values():
+                    potion_manager.save_ingredient(ingredient_data)
+            print(f"Ingrédients d'exemple ajoutés: {len(sample_ingredients)}")
+        
+        # Lancer l'application ; le stockage est fermé (écritures différées
+        # comprises) quelle que soit la façon dont la boucle Tk se termine
+        try:
+            app = PotionGeneratorApp(data_file, potion_manager=potion_manager)
+            app.run()
+        finally:
+            data_manager.close()
+        
+    except Exception as e:
+        messagebox.showerror("Erreur fatale", f"Impossible de démarrer l'application: {e}")
+        import traceback
+        traceback.print_exc()
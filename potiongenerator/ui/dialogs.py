@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - Fenêtres secondaires
+
+Statistiques, sauvegardes, informations de débogage et guide : rarement
+ouvertes, elles ne sont chargées qu'à la première utilisation.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+import datetime
+from typing import Callable, Dict, Optional
+
+from ..core import PotionManager
+
+
+# ==================== STATISTIQUES ====================
+
+class StatisticsDialog:
+    """Fenêtre des statistiques détaillées
+    
+    Les compteurs sont lus à l'ouverture ; les recettes restantes arrivent
+    par ``show_remaining`` une fois l'espace des recettes construit.
+    """
+    
+    def __init__(self, parent, potion_manager: PotionManager):
+        self.potion_manager = potion_manager
+        stats = potion_manager.get_statistics()
+        
+        # Créer une fenêtre de statistiques
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Statistiques")
+        self.dialog.geometry("600x400")
+        self.dialog.transient(parent)
+        
+        # Notebook pour organiser les statistiques
+        notebook = ttk.Notebook(self.dialog)
+        notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        self._create_general_tab(notebook, stats)
+        self._create_ingredients_tab(notebook, stats)
+        self._create_categories_tab(notebook, stats)
+        self._create_bases_tab(notebook, stats)
+    
+    def _create_general_tab(self, notebook, stats: dict):
+        """Onglet général"""
+        general_frame = ttk.Frame(notebook)
+        notebook.add(general_frame, text="Général")
+        
+        ttk.Label(general_frame, text="Statistiques Générales", font=('Arial', 14, 'bold')).pack(pady=10)
+        ttk.Label(general_frame, text=f"Total des potions: {stats['total_potions']}").pack(anchor='w', padx=20)
+        ttk.Label(general_frame, text=f"Total des ingrédients: {stats['total_ingredients']}").pack(anchor='w', padx=20)
+        ttk.Label(general_frame, text=f"Potions favorites: {stats['favorites']}").pack(anchor='w', padx=20)
+        
+        if stats['most_used_ingredient']:
+            ing_id, count = stats['most_used_ingredient']
+            ing_name = self.potion_manager.data["ingredients"][ing_id]["name"]
+            ttk.Label(general_frame, text=f"Ingrédient le plus utilisé: {ing_name} ({count} fois)").pack(anchor='w', padx=20)
+    
+    def _create_ingredients_tab(self, notebook, stats: dict):
+        """Onglet ingrédients les plus utilisés"""
+        ingredients_frame = ttk.Frame(notebook)
+        notebook.add(ingredients_frame, text="Ingrédients")
+        
+        ttk.Label(ingredients_frame, text="Ingrédients les plus utilisés", font=('Arial', 14, 'bold')).pack(pady=10)
+        for ing_id, count in stats['top_ingredients']:
+            ingredient = self.potion_manager.get_ingredient(ing_id)
+            ing_name = ingredient.name if ingredient else ing_id
+            ttk.Label(ingredients_frame, text=f"{ing_name}: {count} fois").pack(anchor='w', padx=20)
+    
+    def _create_categories_tab(self, notebook, stats: dict):
+        """Onglet catégories"""
+        categories_frame = ttk.Frame(notebook)
+        notebook.add(categories_frame, text="Catégories")
+        
+        ttk.Label(categories_frame, text="Répartition par Catégorie", font=('Arial', 14, 'bold')).pack(pady=10)
+        for category, count in stats['categories'].items():
+            ttk.Label(categories_frame, text=f"{category}: {count} potions").pack(anchor='w', padx=20)
+    
+    def _create_bases_tab(self, notebook, stats: dict):
+        """Onglet bases"""
+        bases_frame = ttk.Frame(notebook)
+        notebook.add(bases_frame, text="Bases")
+        
+        ttk.Label(bases_frame, text="Utilisation des Bases", font=('Arial', 14, 'bold')).pack(pady=10)
+        for base_id, count in stats['bases_used'].items():
+            base_name = self.potion_manager.data["bases"][base_id]["name"]
+            ttk.Label(bases_frame, text=f"{base_name}: {count} potions").pack(anchor='w', padx=20)
+        
+        ttk.Label(bases_frame, text="Recettes encore disponibles", font=('Arial', 14, 'bold')).pack(pady=10)
+        self.remaining_frame = ttk.Frame(bases_frame)
+        self.remaining_frame.pack(fill=tk.X)
+        ttk.Label(self.remaining_frame, text="Calcul en cours...").pack(anchor='w', padx=20)
+    
+    def show_remaining(self, remaining: Dict[str, int]):
+        """Afficher les recettes restantes par base (sans effet si la fenêtre est fermée)"""
+        if not self.dialog.winfo_exists():
+            return
+        for child in self.remaining_frame.winfo_children():
+            child.destroy()
+        for base_id, count in remaining.items():
+            base_name = self.potion_manager.data["bases"][base_id]["name"]
+            ttk.Label(self.remaining_frame, text=f"{base_name}: {count} recettes").pack(anchor='w', padx=20)
+
+
+# ==================== SAUVEGARDES ====================
+
+class BackupsDialog:
+    """Liste des sauvegardes, avec création et restauration"""
+    
+    def __init__(self, parent, potion_manager: PotionManager,
+                 on_restore: Optional[Callable[[], None]] = None):
+        self.potion_manager = potion_manager
+        self.on_restore = on_restore
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Sauvegardes")
+        self.dialog.geometry("600x400")
+        self.dialog.transient(parent)
+        
+        columns = ("created", "reason", "size")
+        self.tree = ttk.Treeview(self.dialog, columns=columns, show="headings")
+        self.tree.heading("created", text="Date")
+        self.tree.heading("reason", text="Origine")
+        self.tree.heading("size", text="Taille")
+        self.tree.column("created", width=200)
+        self.tree.column("reason", width=200)
+        self.tree.column("size", width=100)
+        self.tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        buttons_frame = ttk.Frame(self.dialog)
+        buttons_frame.pack(fill=tk.X, padx=10, pady=(0, 10))
+        ttk.Button(buttons_frame, text="Restaurer", command=self._restore).pack(side=tk.LEFT)
+        ttk.Button(buttons_frame, text="Sauvegarder maintenant", command=self._create).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Fermer", command=self.dialog.destroy).pack(side=tk.RIGHT)
+        
+        self._fill()
+    
+    def _fill(self):
+        self.tree.delete(*self.tree.get_children())
+        for entry in self.potion_manager.data_manager.backups.list_backups():
+            created = datetime.datetime.fromisoformat(entry["created"]).strftime("%d/%m/%Y %H:%M:%S")
+            self.tree.insert("", tk.END, iid=entry["id"],
+                             values=(created, entry["reason"], f"{entry['size'] // 1024} Ko"))
+    
+    def _create(self):
+        self.potion_manager.data_manager.create_backup()
+        self._fill()
+    
+    def _restore(self):
+        selection = self.tree.selection()
+        if not selection:
+            messagebox.showwarning("Aucune sélection", "Veuillez sélectionner une sauvegarde.", parent=self.dialog)
+            return
+        if not messagebox.askyesno("Confirmation",
+                                   "Les données actuelles seront remplacées par cette sauvegarde. Continuer ?",
+                                   parent=self.dialog):
+            return
+        try:
+            self.potion_manager.restore_backup(selection[0])
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de restaurer: {e}", parent=self.dialog)
+            return
+        if self.on_restore:
+            self.on_restore()
+        self._fill()
+        messagebox.showinfo("Restauration terminée", "Sauvegarde restaurée !", parent=self.dialog)
+
+
+# ==================== TEXTE ====================
+
+class TextDialog:
+    """Fenêtre de texte en lecture seule (débogage, guide)"""
+    
+    def __init__(self, parent, title: str, text: str, geometry: str = "600x500", font=None):
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(title)
+        self.dialog.geometry(geometry)
+        self.dialog.transient(parent)
+        
+        options = {"font": font} if font else {}
+        text_widget = tk.Text(self.dialog, wrap=tk.WORD, padx=10, pady=10, **options)
+        scrollbar = ttk.Scrollbar(self.dialog, command=text_widget.yview)
+        text_widget.config(yscrollcommand=scrollbar.set)
+        
+        text_widget.insert(1.0, text)
+        text_widget.config(state=tk.DISABLED)
+        
+        text_widget.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+
+def debug_snapshot(potion_manager: PotionManager) -> dict:
+    """Instantané lu par ``debug_info_text``, pris dans le thread Tk (copies et compteurs, sans tri)"""
+    data = potion_manager.data
+    return {
+        "version": data.get('version', 'Non définie'),
+        "data_file": potion_manager.data_manager.data_file,
+        "ingredient_ids": list(data['ingredients']),
+        "total_potions": potion_manager.statistics.total,
+        "bases": potion_manager.get_bases(),
+        "keys": list(data.keys()),
+    }
+
+
+def debug_info_text(potion_manager: PotionManager, snapshot: dict) -> str:
+    """Informations de débogage sur les données chargées
+    
+    Exécutée en tâche de fond : ingrédients relus un à un par leur ID,
+    triés et filtrés sur l'instantané, sans toucher aux vues partagées.
+    """
+    debug_info = []
+    
+    # Informations générales
+    debug_info.append("=== INFORMATIONS DE DÉBOGAGE ===\n")
+    debug_info.append(f"Version des données: {snapshot['version']}")
+    debug_info.append(f"Fichier de données: {snapshot['data_file']}")
+    
+    # Ingrédients
+    debug_info.append(f"\n=== INGRÉDIENTS ===")
+    debug_info.append(f"Nombre total dans le JSON: {len(snapshot['ingredient_ids'])}")
+    
+    ingredients = sorted(filter(None, map(potion_manager.get_ingredient, snapshot['ingredient_ids'])),
+                         key=lambda x: x.name)
+    debug_info.append(f"Nombre récupéré par get_ingredients(): {len(ingredients)}")
+    
+    if ingredients:
+        debug_info.append(f"\nPremiers ingrédients:")
+        for i, ing in enumerate(ingredients[:5]):
+            debug_info.append(f"  {i+1}. {ing.name} ({ing.type}) - ID: {ing.id}")
+    
+    # Types d'ingrédients
+    positifs = [ing for ing in ingredients if ing.type == "positif"]
+    negatifs = [ing for ing in ingredients if ing.type == "négatif"]
+    debug_info.append(f"\nIngrédients positifs: {len(positifs)}")
+    debug_info.append(f"Ingrédients négatifs: {len(negatifs)}")
+    
+    # Potions
+    debug_info.append(f"\n=== POTIONS ===")
+    debug_info.append(f"Nombre total: {snapshot['total_potions']}")
+    
+    # Bases
+    bases = snapshot['bases']
+    debug_info.append(f"\n=== BASES ===")
+    debug_info.append(f"Nombre total: {len(bases)}")
+    for base in bases:
+        debug_info.append(f"  - {base.name} ({base.id})")
+    
+    # Structure des données
+    debug_info.append(f"\n=== STRUCTURE JSON ===")
+    debug_info.append(f"Clés principales: {snapshot['keys']}")
+    
+    if 'ingredients' in snapshot['keys']:
+        debug_info.append(f"IDs des ingrédients (5 premiers): {snapshot['ingredient_ids'][:5]}")
+    
+    return '\n'.join(debug_info)
+
+
+HELP_TEXT = """
+GUIDE D'UTILISATION - Générateur de Potions v2.0
+
+CRÉATION DE POTIONS:
+1. Sélectionnez une base de potion
+2. Choisissez un ingrédient à effet positif
+3. Choisissez un ingrédient à effet négatif
+4. Cliquez sur "Créer Potion"
+
+RACCOURCIS CLAVIER:
+- Ctrl+N: Créer une potion
+- Ctrl+R: Réinitialiser le formulaire
+- Ctrl+S: Exporter en CSV
+- F5: Actualiser l'affichage
+
+FONCTIONNALITÉS:
+- Recherche dans la liste des potions
+- Tri par différents critères
+- Filtrage par catégorie ou favorites
+- Gestion des favoris et notes
+- Export/Import de données
+- Statistiques détaillées
+
+ASTUCES:
+- Double-cliquez sur une potion pour voir les détails
+- Utilisez la recherche d'ingrédients pour trouver rapidement
+- Marquez vos potions favorites avec l'étoile
+- Gérez vos ingrédients via le menu "Ingrédients"
+- Sauvegardez régulièrement vos données
+
+GESTION DES INGRÉDIENTS:
+- Ctrl+I: Ouvrir le gestionnaire d'ingrédients
+- Créez, modifiez et supprimez des ingrédients
+- Système de contraindications et synergies
+- Import/Export d'ingrédients en JSON/CSV
+"""
@@ -0,0 +1,706 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - Dialogues de gestion des ingrédients
+
+Chargé à la première ouverture du gestionnaire ou de l'éditeur.
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox, filedialog
+
+from ..core import (INGREDIENT_QUALITIES, INGREDIENT_RARITIES, INGREDIENT_TYPES, Ingredient,
+                   make_ingredient_id)
+from ..importer import ImportEngine, ingredient_import_summary
+from .widgets import RefreshScheduler, SearchableCombobox, VirtualTreeview
+
+# ==================== INGREDIENT MANAGEMENT ====================
+
+class IngredientEditorDialog:
+    """Dialog pour créer/éditer un ingrédient avec types de potions autorisés"""
+    
+    def __init__(self, parent, potion_manager, ingredient=None):
+        self.parent = parent
+        self.potion_manager = potion_manager
+        self.ingredient = ingredient
+        self.result = None
+        self.deleted = False
+        
+        # Types de potions disponibles (extraits des bases)
+        self.potion_types = []
+        for base_data in potion_manager.data["bases"].values():
+            if base_data["potion_type"] not in self.potion_types:
+                self.potion_types.append(base_data["potion_type"])
+        
+        self.potion_type_vars = {}  # Dict pour stocker les variables des checkbox
+        
+        # Créer la fenêtre
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Éditer Ingrédient" if ingredient else "Nouvel Ingrédient")
+        self.dialog.geometry("500x650")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        # Centrer la fenêtre
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+        
+        self._create_widgets()
+        self._populate_if_editing()
+        
+        # Focus sur le premier champ
+        self.name_entry.focus_set()
+    
+    def _create_widgets(self):
+        """Créer les widgets du formulaire"""
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        # Titre
+        title = "Modifier l'ingrédient" if self.ingredient else "Créer un nouvel ingrédient"
+        ttk.Label(main_frame, text=title, font=('Arial', 14, 'bold')).pack(pady=(0, 20))
+        
+        # Formulaire
+        form_frame = ttk.Frame(main_frame)
+        form_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Nom
+        ttk.Label(form_frame, text="Nom de l'ingrédient *").grid(row=0, column=0, sticky='w', pady=5)
+        self.name_var = tk.StringVar()
+        self.name_entry = ttk.Entry(form_frame, textvariable=self.name_var, width=40)
+        self.name_entry.grid(row=0, column=1, sticky='ew', pady=5, padx=(10, 0))
+        
+        # Effet
+        ttk.Label(form_frame, text="Effet *").grid(row=1, column=0, sticky='w', pady=5)
+        self.effect_var = tk.StringVar()
+        self.effect_entry = ttk.Entry(form_frame, textvariable=self.effect_var, width=40)
+        self.effect_entry.grid(row=1, column=1, sticky='ew', pady=5, padx=(10, 0))
+        
+        # Type
+        ttk.Label(form_frame, text="Type *").grid(row=2, column=0, sticky='w', pady=5)
+        self.type_var = tk.StringVar()
+        type_combo = ttk.Combobox(form_frame, textvariable=self.type_var, 
+                                 values=list(INGREDIENT_TYPES), state="readonly", width=37)
+        type_combo.grid(row=2, column=1, sticky='ew', pady=5, padx=(10, 0))
+        
+        # Qualité
+        ttk.Label(form_frame, text="Qualité *").grid(row=3, column=0, sticky='w', pady=5)
+        self.quality_var = tk.StringVar()
+        quality_combo = ttk.Combobox(form_frame, textvariable=self.quality_var,
+                                    values=list(INGREDIENT_QUALITIES),
+                                    state="readonly", width=37)
+        quality_combo.grid(row=3, column=1, sticky='ew', pady=5, padx=(10, 0))
+        
+        # Durée
+        ttk.Label(form_frame, text="Durée *").grid(row=4, column=0, sticky='w', pady=5)
+        self.duration_var = tk.StringVar()
+        duration_combo = ttk.Combobox(form_frame, textvariable=self.duration_var,
+                                     values=["Instantané", "1 minute", "10 minutes", "15 minutes", "1 heure", "24 heures", 
+                                            "Un cycle", "Jusqu'à réveil", "Jusqu'à guérison",
+                                            "Voir scénarisation"], width=37)
+        duration_combo.grid(row=4, column=1, sticky='ew', pady=5, padx=(10, 0))
+        
+        # Rareté
+        ttk.Label(form_frame, text="Rareté").grid(row=5, column=0, sticky='w', pady=5)
+        self.rarity_var = tk.StringVar(value="Commun")
+        rarity_combo = ttk.Combobox(form_frame, textvariable=self.rarity_var,
+                                   values=list(INGREDIENT_RARITIES),
+                                   state="readonly", width=37)
+        rarity_combo.grid(row=5, column=1, sticky='ew', pady=5, padx=(10, 0))
+        
+        # Description
+        ttk.Label(form_frame, text="Description").grid(row=6, column=0, sticky='nw', pady=5)
+        desc_frame = ttk.Frame(form_frame)
+        desc_frame.grid(row=6, column=1, sticky='ew', pady=5, padx=(10, 0))
+        
+        self.description_text = tk.Text(desc_frame, height=4, width=40, wrap=tk.WORD)
+        desc_scrollbar = ttk.Scrollbar(desc_frame, command=self.description_text.yview)
+        self.description_text.config(yscrollcommand=desc_scrollbar.set)
+        
+        self.description_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        desc_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Types de potions autorisés
+        ttk.Label(form_frame, text="Utilisable dans *").grid(row=7, column=0, sticky='nw', pady=5)
+        types_frame = ttk.LabelFrame(form_frame, text="Types de potions")
+        types_frame.grid(row=7, column=1, sticky='ew', pady=5, padx=(10, 0))
+        
+        # Créer les checkbox pour chaque type de potion
+        for i, potion_type in enumerate(self.potion_types):
+            var = tk.BooleanVar(value=True)  # Par défaut, tous cochés
+            self.potion_type_vars[potion_type] = var
+            
+            check = ttk.Checkbutton(types_frame, text=potion_type, variable=var,
+                                   command=self._validate_potion_types)
+            check.grid(row=i//2, column=i%2, sticky='w', padx=10, pady=2)
+        
+        # Configuration de la grille
+        form_frame.columnconfigure(1, weight=1)
+        
+        # Message d'aide
+        help_frame = ttk.Frame(main_frame)
+        help_frame.pack(fill=tk.X, pady=(20, 10))
+        
+        help_text = "* Champs obligatoires\nSélectionnez au moins un type de potion."
+        ttk.Label(help_frame, text=help_text, font=('Arial', 8), foreground='gray').pack(anchor='w')
+        
+        # Status
+        self.status_var = tk.StringVar()
+        self.status_label = ttk.Label(main_frame, textvariable=self.status_var, foreground='red')
+        self.status_label.pack(pady=5)
+        
+        # Boutons
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Button(buttons_frame, text="Annuler", command=self._cancel).pack(side=tk.RIGHT, padx=(5, 0))
+        self.save_btn = ttk.Button(buttons_frame, text="Sauvegarder", command=self._save)
+        self.save_btn.pack(side=tk.RIGHT)
+        
+        if self.ingredient:  # Mode édition
+            ttk.Button(buttons_frame, text="Supprimer", command=self._delete).pack(side=tk.LEFT)
+        
+        # Validation en temps réel
+        self.name_var.trace('w', self._validate)
+        self.effect_var.trace('w', self._validate)
+        self.type_var.trace('w', self._validate)
+        self.quality_var.trace('w', self._validate)
+        self.duration_var.trace('w', self._validate)
+        
+        # Bindings
+        self.dialog.bind('<Return>', lambda e: self._save())
+        self.dialog.bind('<Escape>', lambda e: self._cancel())
+    
+    def _populate_if_editing(self):
+        """Remplir les champs si on édite un ingrédient existant"""
+        if self.ingredient:
+            self.name_var.set(self.ingredient.name)
+            self.effect_var.set(self.ingredient.effect)
+            self.type_var.set(self.ingredient.type)
+            self.quality_var.set(self.ingredient.quality)
+            self.duration_var.set(self.ingredient.duration)
+            self.rarity_var.set(self.ingredient.rarity)
+            
+            self.description_text.insert(1.0, self.ingredient.description)
+            
+            # Configurer les checkbox selon les types autorisés
+            for potion_type in self.potion_types:
+                if hasattr(self.ingredient, 'allowed_potion_types'):
+                    is_allowed = potion_type in self.ingredient.allowed_potion_types
+                else:
+                    is_allowed = True  # Par défaut, tous autorisés pour les anciens ingrédients
+                self.potion_type_vars[potion_type].set(is_allowed)
+    
+    def _validate_potion_types(self):
+        """Valider qu'au moins un type de potion est sélectionné"""
+        selected_count = sum(1 for var in self.potion_type_vars.values() if var.get())
+        if selected_count == 0:
+            self.status_var.set("Sélectionnez au moins un type de potion")
+            self.save_btn.config(state="disabled")
+            return False
+        return True
+    
+    def _validate(self, *args):
+        """Valider le formulaire"""
+        name = self.name_var.get().strip()
+        effect = self.effect_var.get().strip()
+        type_val = self.type_var.get()
+        quality = self.quality_var.get()
+        duration = self.duration_var.get()
+        
+        if not all([name, effect, type_val, quality, duration]):
+            self.status_var.set("Veuillez remplir tous les champs obligatoires")
+            self.save_btn.config(state="disabled")
+            return
+        
+        # Vérifier qu'au moins un type de potion est sélectionné
+        if not self._validate_potion_types():
+            return
+        
+        # Vérifier les doublons (sauf si on édite le même ingrédient)
+        ingredient_id = make_ingredient_id(name)
+        existing_id = (ingredient_id if ingredient_id in self.potion_manager.data["ingredients"]
+                       else self.potion_manager.find_ingredient_id(name))
+        current_id = self.ingredient.id if self.ingredient else None
+        
+        # En édition, le même ID que l'ingrédient actuel est autorisé
+        if existing_id and existing_id != current_id:
+            self.status_var.set("Un ingrédient avec ce nom existe déjà")
+            self.save_btn.config(state="disabled")
+            return
+        
+        # Valide
+        self.status_var.set("")
+        self.save_btn.config(state="normal")
+    
+    def _save(self):
+        """Sauvegarder l'ingrédient"""
+        try:
+            # Récupérer les données
+            name = self.name_var.get().strip()
+            effect = self.effect_var.get().strip()
+            type_val = self.type_var.get()
+            quality = self.quality_var.get()
+            duration = self.duration_var.get()
+            rarity = self.rarity_var.get()
+            description = self.description_text.get(1.0, tk.END).strip()
+            
+            # Récupérer les types de potions autorisés
+            allowed_potion_types = [pt for pt, var in self.potion_type_vars.items() if var.get()]
+            
+            # Générer l'ID
+            ingredient_id = make_ingredient_id(name)
+            
+            # Créer l'objet ingrédient
+            ingredient_data = {
+                "id": ingredient_id,
+                "name": name,
+                "effect": effect,
+                "type": type_val,
+                "quality": quality,
+                "duration": duration,
+                "rarity": rarity,
+                "description": description,
+                "allowed_potion_types": allowed_potion_types
+            }
+            
+            # Mode édition : si l'ID a changé, les références sont mises à jour
+            old_id = self.ingredient.id if self.ingredient else None
+            self.potion_manager.save_ingredient(ingredient_data, old_id=old_id)
+            
+            # Résultat pour le parent
+            self.result = Ingredient(**ingredient_data)
+            
+            # Fermer
+            self.dialog.destroy()
+            
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de sauvegarder l'ingrédient: {e}")
+    
+    def _delete(self):
+        """Supprimer l'ingrédient (après choix du sort des potions qui l'utilisent)"""
+        delete_dialog = IngredientDeleteDialog(self.dialog, self.potion_manager, self.ingredient)
+        self.dialog.wait_window(delete_dialog.dialog)
+        
+        if delete_dialog.deleted:
+            self.deleted = True
+            self.dialog.destroy()
+        else:
+            self.dialog.grab_set()
+    
+    def _cancel(self):
+        """Annuler"""
+        self.dialog.destroy()
+
+class IngredientDeleteDialog:
+    """Confirmation de la suppression d'un ingrédient
+    
+    Le nombre de potions qui l'utilisent, lu dans l'index inverse, s'affiche
+    dès l'ouverture. S'il y en a, la suppression reste bloquée tant qu'on
+    n'a pas choisi de les supprimer aussi ou de les reporter sur un autre
+    ingrédient du même type.
+    """
+    
+    def __init__(self, parent, potion_manager, ingredient):
+        self.potion_manager = potion_manager
+        self.ingredient = ingredient
+        self.deleted = False
+        self.usage = len(potion_manager.potion_ids_using_ingredient(ingredient.id))
+        
+        # Créer la fenêtre
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Supprimer l'ingrédient")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+        
+        self._create_widgets()
+    
+    def _create_widgets(self):
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=20)
+        
+        ttk.Label(main_frame, text=f"Supprimer « {self.ingredient.name} » ?",
+                  font=('Arial', 12, 'bold')).pack(anchor='w', pady=(0, 10))
+        usage = f"Utilisé par {self.usage} potion(s)." if self.usage else "Aucune potion ne l'utilise."
+        ttk.Label(main_frame, text=usage).pack(anchor='w')
+        
+        # Sort des potions concernées
+        self.mode_var = tk.StringVar(value="block")
+        if self.usage:
+            options_frame = ttk.LabelFrame(main_frame, text="Potions concernées", padding=10)
+            options_frame.pack(fill=tk.BOTH, expand=True, pady=10)
+            choices = [("block", "Ne rien supprimer tant qu'il est utilisé"),
+                       ("cascade", f"Supprimer aussi les {self.usage} potion(s)"),
+                       ("reassign", "Reporter les potions sur :")]
+            for mode, label in choices:
+                ttk.Radiobutton(options_frame, text=label, variable=self.mode_var, value=mode,
+                                command=self._update).pack(anchor='w')
+            
+            # Remplaçants possibles : ingrédients du même type
+            self.replacement_search = SearchableCombobox(options_frame)
+            self.replacement_search.pack(fill=tk.BOTH, expand=True, padx=(20, 0), pady=(2, 0))
+            self.replacement_search.set_values([
+                self.potion_manager.ingredient_label(ingredient)
+                for ingredient in self.potion_manager.get_ingredients(self.ingredient.type)
+                if ingredient.id != self.ingredient.id])
+            self.replacement_search.var.trace('w', lambda *args: self._update())
+        
+        # Boutons
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(fill=tk.X, pady=(10, 0))
+        ttk.Button(buttons_frame, text="Annuler", command=self.dialog.destroy).pack(side=tk.RIGHT, padx=(5, 0))
+        self.delete_btn = ttk.Button(buttons_frame, text="Supprimer", command=self._delete)
+        self.delete_btn.pack(side=tk.RIGHT)
+        
+        self.dialog.bind('<Escape>', lambda e: self.dialog.destroy())
+        self._update()
+    
+    def _replacement_id(self):
+        return self.potion_manager.find_ingredient_id(self.replacement_search.get(), self.ingredient.type)
+    
+    def _update(self):
+        """Activer la suppression une fois le sort des potions choisi"""
+        mode = self.mode_var.get()
+        ready = (not self.usage or mode == "cascade"
+                 or (mode == "reassign" and self._replacement_id() not in (None, self.ingredient.id)))
+        self.delete_btn.config(state="normal" if ready else "disabled")
+    
+    def _delete(self):
+        mode = self.mode_var.get()
+        replacement = self._replacement_id() if self.usage and mode == "reassign" else None
+        try:
+            reason = self.potion_manager.delete_ingredient(self.ingredient.id, mode, replacement)
+        except Exception as e:
+            messagebox.showerror("Erreur", f"Impossible de supprimer l'ingrédient: {e}", parent=self.dialog)
+            return
+        
+        if reason:
+            messagebox.showwarning("Suppression impossible", reason, parent=self.dialog)
+            return
+        self.deleted = True
+        self.dialog.destroy()
+
+class IngredientManagerDialog:
+    """Dialog principal de gestion des ingrédients"""
+    
+    def __init__(self, parent, potion_manager):
+        self.parent = parent
+        self.potion_manager = potion_manager
+        
+        # Créer la fenêtre
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Gestionnaire d'Ingrédients")
+        self.scheduler = RefreshScheduler(self.dialog)
+        self.scheduler.register("list", self._refresh_list)
+        self.dialog.geometry("1100x600")
+        self.dialog.transient(parent)
+        
+        # Variables
+        self.search_var = tk.StringVar()
+        self.filter_var = tk.StringVar(value="Tous")
+        self.sort_var = tk.StringVar(value="Nom")
+        
+        self._create_widgets()
+        self._refresh_list()
+        
+        # Centrer
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 100, parent.winfo_rooty() + 50))
+    
+    def _create_widgets(self):
+        """Créer l'interface"""
+        main_frame = ttk.Frame(self.dialog)
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        
+        # Titre
+        ttk.Label(main_frame, text="Gestionnaire d'Ingrédients", 
+                 font=('Arial', 16, 'bold')).pack(pady=(0, 20))
+        
+        # Contrôles
+        controls_frame = ttk.Frame(main_frame)
+        controls_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        # Recherche
+        ttk.Label(controls_frame, text="Recherche:").grid(row=0, column=0, sticky='w', padx=(0, 5))
+        search_entry = ttk.Entry(controls_frame, textvariable=self.search_var, width=25)
+        search_entry.grid(row=0, column=1, sticky='ew', padx=(0, 10))
+        
+        # Filtre par type
+        ttk.Label(controls_frame, text="Type:").grid(row=0, column=2, sticky='w', padx=(0, 5))
+        filter_combo = ttk.Combobox(controls_frame, textvariable=self.filter_var,
+                                   values=["Tous", *INGREDIENT_TYPES],
+                                   state="readonly", width=15)
+        filter_combo.grid(row=0, column=3, sticky='ew', padx=(0, 10))
+        
+        # Tri
+        ttk.Label(controls_frame, text="Trier par:").grid(row=0, column=4, sticky='w', padx=(0, 5))
+        sort_combo = ttk.Combobox(controls_frame, textvariable=self.sort_var,
+                                 values=["Nom", "Type", "Qualité", "Rareté"], 
+                                 state="readonly", width=15)
+        sort_combo.grid(row=0, column=5, sticky='ew')
+        
+        controls_frame.columnconfigure(1, weight=1)
+        controls_frame.columnconfigure(3, weight=1)
+        controls_frame.columnconfigure(5, weight=1)
+        
+        # Liste des ingrédients
+        list_frame = ttk.Frame(main_frame)
+        list_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        # Treeview virtualisé (seules les lignes visibles sont insérées)
+        columns = ("name", "effect", "type", "quality", "rarity", "bases")
+        self.ingredients_tree = VirtualTreeview(list_frame, columns=columns,
+                                                row_factory=self._ingredient_row, height=15)
+        
+        # En-têtes
+        self.ingredients_tree.heading("name", text="Nom")
+        self.ingredients_tree.heading("effect", text="Effet")
+        self.ingredients_tree.heading("type", text="Type")
+        self.ingredients_tree.heading("quality", text="Qualité")
+        self.ingredients_tree.heading("rarity", text="Rareté")
+        self.ingredients_tree.heading("bases", text="Bases compatibles")
+        
+        # Largeurs
+        self.ingredients_tree.column("name", width=150, minwidth=120)
+        self.ingredients_tree.column("effect", width=200, minwidth=150)
+        self.ingredients_tree.column("type", width=70, minwidth=50)
+        self.ingredients_tree.column("quality", width=80, minwidth=60)
+        self.ingredients_tree.column("rarity", width=80, minwidth=60)
+        self.ingredients_tree.column("bases", width=200, minwidth=150)
+        
+        # Configuration des couleurs
+        self.ingredients_tree.tag_configure("positif", background="#e8f5e8")
+        self.ingredients_tree.tag_configure("négatif", background="#fde8e8")
+        
+        # Placement
+        self.ingredients_tree.pack(fill=tk.BOTH, expand=True)
+        
+        # Boutons d'action
+        buttons_frame = ttk.Frame(main_frame)
+        buttons_frame.pack(fill=tk.X)
+        
+        ttk.Button(buttons_frame, text="Nouvel Ingrédient", command=self._new_ingredient).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(buttons_frame, text="Modifier", command=self._edit_ingredient).pack(side=tk.LEFT, padx=5)
+        ttk.Button(buttons_frame, text="Actualiser", command=lambda: self.scheduler.request("list")).pack(side=tk.LEFT, padx=5)
+        
+        ttk.Button(buttons_frame, text="Fermer", command=self.dialog.destroy).pack(side=tk.RIGHT)
+        
+        # Statistiques
+        self.stats_var = tk.StringVar()
+        ttk.Label(buttons_frame, textvariable=self.stats_var).pack(side=tk.RIGHT, padx=(0, 20))
+        
+        # Bindings
+        self.search_var.trace('w', lambda *args: self.scheduler.request("list", delay=RefreshScheduler.TYPING_DELAY))
+        self.filter_var.trace('w', lambda *args: self.scheduler.request("list"))
+        self.sort_var.trace('w', lambda *args: self.scheduler.request("list"))
+        
+        self.ingredients_tree.bind("<Double-1>", lambda e: self._edit_ingredient())
+        self.ingredients_tree.bind("<Return>", lambda e: self._edit_ingredient())
+    
+    def _refresh_list(self):
+        """Actualiser la liste des ingrédients"""
+        # Obtenir et filtrer les ingrédients
+        ingredients = self.potion_manager.get_ingredients()
+        filtered_ingredients = self._filter_ingredients(ingredients)
+        sorted_ingredients = self._sort_ingredients(filtered_ingredients)
+        
+        # Seules les lignes visibles sont construites
+        self.ingredients_tree.set_keys([ingredient.id for ingredient in sorted_ingredients])
+        
+        # Statistiques
+        total = len(ingredients)
+        displayed = len(sorted_ingredients)
+        positifs = len([i for i in sorted_ingredients if i.type == "positif"])
+        negatifs = len([i for i in sorted_ingredients if i.type == "négatif"])
+        
+        stats_text = f"Total: {total} | Affichés: {displayed} | Positifs: {positifs} | Négatifs: {negatifs}"
+        self.stats_var.set(stats_text)
+
+    def _ingredient_row(self, ing_id: str) -> dict:
+        """Options d'une ligne de la liste des ingrédients"""
+        ingredient = self.potion_manager.get_ingredient(ing_id)
+        
+        # Formater les bases compatibles
+        base_names = {
+            "eau": "Potion",
+            "huile": "Poison", 
+            "pate": "Onguent",
+            "vin": "Filtre",
+            "cendre": "Substrat",
+            "quartz": "Médicament"
+        }
+        
+        compatible_bases = getattr(ingredient, 'compatible_bases', [])
+        bases_display = ", ".join([base_names.get(base, base) for base in compatible_bases])
+        if not bases_display:
+            bases_display = "Aucune"
+        
+        # Couleur selon le type
+        return {
+            "values": (ingredient.name, ingredient.effect, ingredient.type,
+                       ingredient.quality, ingredient.rarity, bases_display),
+            "tags": (ingredient.type,)
+        }
+    
+    def _new_ingredient(self):
+        """Créer un nouvel ingrédient via le dialog"""
+        editor = IngredientEditorDialog(self.dialog, self.potion_manager)
+        self.dialog.wait_window(editor.dialog)
+
+        if editor.result:
+            self._refresh_list()
+            messagebox.showinfo("Succès", f"Ingrédient '{editor.result.name}' créé avec succès !")
+            self.dialog.event_generate("<<IngredientsChanged>>", when="tail")
+
+    def _edit_ingredient(self):
+        """Modifier l'ingrédient sélectionné"""
+        selection = self.ingredients_tree.selection()
+        if not selection:
+            messagebox.showwarning("Aucune sélection", "Veuillez sélectionner un ingrédient à modifier.")
+            return
+
+        # L'ID de l'ingrédient sert d'identifiant de ligne
+        ing = self.potion_manager.get_ingredient(selection[0])
+        if ing:
+            editor = IngredientEditorDialog(self.dialog, self.potion_manager, ingredient=ing)
+            self.dialog.wait_window(editor.dialog)
+
+            if editor.result or editor.deleted:
+                self._refresh_list()
+                if editor.deleted:
+                    messagebox.showinfo("Succès", f"Ingrédient '{ing.name}' supprimé.")
+                else:
+                    messagebox.showinfo("Succès", f"Ingrédient '{editor.result.name}' modifié avec succès !")
+                self.dialog.event_generate("<<IngredientsChanged>>", when="tail")
+
+    def _filter_ingredients(self, ingredients):
+        """Appliquer les filtres de recherche et de type aux ingrédients"""
+        search_text = self.search_var.get().lower()
+        filter_type = self.filter_var.get()
+
+        filtered = []
+        for ing in ingredients:
+            if search_text and search_text not in ing.name.lower():
+                continue
+            if filter_type != "Tous" and ing.type != filter_type:
+                continue
+            filtered.append(ing)
+
+        return filtered
+
+    def _sort_ingredients(self, ingredients):
+        """Trier les ingrédients selon le critère sélectionné"""
+        sort_key = self.sort_var.get()
+
+        if sort_key == "Nom":
+            return sorted(ingredients, key=lambda i: i.name.lower())
+        elif sort_key == "Type":
+            return sorted(ingredients, key=lambda i: i.type)
+        elif sort_key == "Qualité":
+            return sorted(ingredients, key=lambda i: i.quality)
+        elif sort_key == "Rareté":
+            return sorted(ingredients, key=lambda i: i.rarity)
+
+        return ingredients
+
+
+# ==================== IMPORT GROUPÉ ====================
+
+class IngredientImportDialog:
+    """Import groupé d'ingrédients : plusieurs fichiers, une seule politique de conflit
+    
+    Les fichiers sont lus et validés en tâche de fond ; les ingrédients
+    retenus sont ensuite ajoutés en une seule sauvegarde.
+    """
+    
+    POLICIES = [("skip", "Ignorer (garder l'existant)"), ("replace", "Remplacer l'existant"),
+                ("merge", "Fusionner les champs"), ("rename", "Importer sous un autre nom")]
+    
+    def __init__(self, parent, potion_manager, tasks, on_import=None):
+        self.potion_manager = potion_manager
+        self.tasks = tasks
+        self.on_import = on_import
+        self.files = []
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Importer des ingrédients")
+        self.dialog.geometry("650x500")
+        self.dialog.transient(parent)
+        
+        # Fichiers
+        files_frame = ttk.LabelFrame(self.dialog, text="Fichiers JSON")
+        files_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.files_list = tk.Listbox(files_frame, height=5)
+        self.files_list.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5, pady=5)
+        files_buttons = ttk.Frame(files_frame)
+        files_buttons.pack(side=tk.RIGHT, fill=tk.Y, padx=5, pady=5)
+        ttk.Button(files_buttons, text="Ajouter...", command=self._add_files).pack(fill=tk.X, pady=2)
+        ttk.Button(files_buttons, text="Retirer", command=self._remove_file).pack(fill=tk.X, pady=2)
+        
+        # Politique de conflit
+        policy_frame = ttk.LabelFrame(self.dialog, text="Ingrédient déjà présent (même ID ou même nom)")
+        policy_frame.pack(fill=tk.X, padx=10, pady=5)
+        self.policy_var = tk.StringVar(value="skip")
+        for policy, label in self.POLICIES:
+            ttk.Radiobutton(policy_frame, text=label, value=policy,
+                            variable=self.policy_var).pack(anchor='w', padx=10, pady=1)
+        
+        # Rapport
+        report_frame = ttk.LabelFrame(self.dialog, text="Rapport")
+        report_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
+        self.report_text = tk.Text(report_frame, height=8, wrap=tk.WORD, state=tk.DISABLED)
+        report_scrollbar = ttk.Scrollbar(report_frame, command=self.report_text.yview)
+        self.report_text.config(yscrollcommand=report_scrollbar.set)
+        self.report_text.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        report_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        
+        # Boutons
+        buttons_frame = ttk.Frame(self.dialog)
+        buttons_frame.pack(fill=tk.X, padx=10, pady=(5, 10))
+        self.import_btn = ttk.Button(buttons_frame, text="Importer", command=self._import, state="disabled")
+        self.import_btn.pack(side=tk.LEFT)
+        ttk.Button(buttons_frame, text="Fermer", command=self.dialog.destroy).pack(side=tk.RIGHT)
+    
+    def _add_files(self):
+        filepaths = filedialog.askopenfilenames(
+            parent=self.dialog, title="Fichiers d'ingrédients",
+            filetypes=[("JSON files", "*.json"), ("CSV files", "*.csv"), ("All files", "*.*")])
+        for filepath in filepaths:
+            if filepath not in self.files:
+                self.files.append(filepath)
+                self.files_list.insert(tk.END, filepath)
+        self.import_btn.config(state="normal" if self.files else "disabled")
+    
+    def _remove_file(self):
+        for index in reversed(self.files_list.curselection()):
+            self.files_list.delete(index)
+            del self.files[index]
+        self.import_btn.config(state="normal" if self.files else "disabled")
+    
+    def _set_report(self, text: str, done: bool = True):
+        """Afficher le rapport ; ``done`` réactive le bouton d'import"""
+        if not self.dialog.winfo_exists():
+            return
+        self.report_text.config(state=tk.NORMAL)
+        self.report_text.delete(1.0, tk.END)
+        self.report_text.insert(1.0, text)
+        self.report_text.config(state=tk.DISABLED)
+        self.import_btn.config(state="normal" if done and self.files else "disabled")
+    
+    def _import(self):
+        """Lire et valider les fichiers en tâche de fond, puis appliquer la politique choisie"""
+        engine = ImportEngine(self.potion_manager)
+        files, policy = list(self.files), self.policy_var.get()
+        self._set_report("Lecture des fichiers...", done=False)
+        
+        def apply(result):
+            records, rejected = result
+            applied = engine.apply_ingredients(records, policy)
+            self._set_report("\n".join(ingredient_import_summary(applied, rejected)))
+            changed = applied["added"] or applied["replaced"] or applied["merged"] or applied["renamed"]
+            if changed and self.on_import:
+                self.on_import()
+        
+        self.tasks.submit("Lecture des ingrédients",
+                          lambda task: engine.read_ingredient_files(files, progress=task.progress),
+                          on_done=apply,
+                          on_error=lambda e: self._set_report(f"Import impossible : {e}"),
+                          on_cancel=lambda: self._set_report("Import annulé."))
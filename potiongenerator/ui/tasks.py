@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - Tâches de fond
+
+Les opérations longues (imports, exports, vérifications) tournent sur un
+thread de travail ; leur progression et leur résultat reviennent au thread
+Tk par une file lue périodiquement avec ``after``. Les tâches lisent les
+données en mémoire : des threads plutôt que des processus, qui devraient
+recevoir une copie de tout le document.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from ..core import report_error
+
+# ==================== TÂCHES ====================
+
+class TaskCancelled(Exception):
+    """Levée dans la tâche par ``progress`` une fois l'annulation demandée"""
+
+
+class Task:
+    """Travail confié au TaskRunner
+    
+    Le travail reçoit la tâche en argument et signale son avancement avec
+    ``task.progress(done, total)`` : l'appel est peu coûteux (les mises à
+    jour sont fusionnées jusqu'au prochain passage de Tk) et lève
+    TaskCancelled si l'utilisateur a annulé.
+    """
+    
+    def __init__(self, runner: "TaskRunner", label: str, work: Callable[["Task"], Any],
+                 on_done: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[Exception], None]] = None,
+                 on_cancel: Optional[Callable[[], None]] = None):
+        self.runner = runner
+        self.label = label
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_cancel = on_cancel
+        self.done = 0
+        self.total: Optional[int] = None
+        self._cancel_event = threading.Event()
+        self._progress_posted = False
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+    
+    def cancel(self):
+        """Demander l'arrêt ; pris en compte au prochain appel de ``progress``"""
+        self._cancel_event.set()
+    
+    def progress(self, done: int, total: Optional[int] = None):
+        """Signaler l'avancement (depuis le thread de travail)"""
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+        self.done, self.total = done, total
+        if not self._progress_posted:
+            self._progress_posted = True
+            self.runner._queue.put(("progress", self, None))
+
+
+class TaskRunner:
+    """Exécute des travaux hors du thread Tk et en rapporte l'avancement
+    
+    Les rappels (``on_done``, ``on_error``, ``on_cancel``) et les écouteurs
+    sont toujours appelés dans le thread Tk, qui peut donc modifier les
+    données et l'affichage sans précaution particulière.
+    """
+    
+    # Période (ms) de lecture de la file des messages
+    POLL_INTERVAL = 50
+    
+    def __init__(self, widget, max_workers: int = 2):
+        self.widget = widget
+        self.tasks: List[Task] = []
+        self._listeners: List[Callable[[], None]] = []
+        self._queue: "queue.Queue" = queue.Queue()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="potion-task")
+        self._ui_thread = threading.current_thread()
+        self._after_id = self.widget.after(self.POLL_INTERVAL, self._poll)
+    
+    def add_listener(self, callback: Callable[[], None]):
+        """Être prévenu quand une tâche démarre, avance ou se termine"""
+        self._listeners.append(callback)
+    
+    def submit(self, label: str, work: Callable[[Task], Any],
+               on_done: Optional[Callable[[Any], None]] = None,
+               on_error: Optional[Callable[[Exception], None]] = None,
+               on_cancel: Optional[Callable[[], None]] = None) -> Task:
+        """Lancer ``work(task)`` sur un thread de travail"""
+        task = Task(self, label, work, on_done, on_error, on_cancel)
+        self.tasks.append(task)
+        self._executor.submit(self._run, task)
+        self._notify()
+        return task
+    
+    def call_soon(self, func: Callable, *args):
+        """Appeler ``func`` dans le thread Tk (appelable depuis n'importe quel thread)"""
+        if threading.current_thread() is self._ui_thread:
+            func(*args)
+        else:
+            self._queue.put(("call", func, args))
+    
+    def cancel_all(self):
+        for task in self.tasks:
+            task.cancel()
+    
+    def shutdown(self):
+        """Annuler les tâches et attendre leur arrêt (fermeture de l'application)"""
+        self.cancel_all()
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._executor.shutdown(wait=True, cancel_futures=True)
+    
+    def _run(self, task: Task):
+        """Corps exécuté dans le thread de travail"""
+        try:
+            if task.cancelled:
+                raise TaskCancelled()
+            result = task.work(task)
+        except TaskCancelled:
+            self._queue.put(("cancelled", task, None))
+        except Exception as e:
+            self._queue.put(("error", task, e))
+        else:
+            self._queue.put(("done", task, result))
+    
+    def _poll(self):
+        """Traiter les messages des threads de travail (thread Tk)"""
+        self._after_id = self.widget.after(self.POLL_INTERVAL, self._poll)
+        while True:
+            try:
+                kind, subject, value = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self._dispatch(kind, subject, value)
+            except Exception as e:
+                report_error("Erreur", f"Erreur inattendue: {e}")
+    
+    def _dispatch(self, kind: str, subject, value):
+        if kind == "call":
+            subject(*value)
+            return
+        
+        task: Task = subject
+        if kind == "progress":
+            task._progress_posted = False
+            self._notify()
+            return
+        
+        if task in self.tasks:
+            self.tasks.remove(task)
+        self._notify()
+        if kind == "done":
+            if task.on_done:
+                task.on_done(value)
+        elif kind == "error":
+            if task.on_error:
+                task.on_error(value)
+            else:
+                report_error("Erreur", f"{task.label} : échec ({value})")
+        elif task.on_cancel:
+            task.on_cancel()
+    
+    def _notify(self):
+        for callback in self._listeners:
+            callback()
+
+
+# ==================== ZONE D'ÉTAT ====================
+
+class TaskStatusBar(ttk.Frame):
+    """Barre d'état : tâche en cours, barre de progression et bouton Annuler
+    
+    La barre de progression devient indéterminée tant que la tâche ne
+    connaît pas son total.
+    """
+    
+    def __init__(self, parent, runner: TaskRunner):
+        super().__init__(parent)
+        self.runner = runner
+        self.text_var = tk.StringVar(value="Prêt")
+        
+        ttk.Label(self, textvariable=self.text_var).pack(side=tk.LEFT, padx=5)
+        self.cancel_btn = ttk.Button(self, text="Annuler", command=self._cancel)
+        self.progressbar = ttk.Progressbar(self, length=200, maximum=100)
+        self._indeterminate = False
+        self._busy = False
+        
+        runner.add_listener(self._update)
+    
+    def _update(self):
+        tasks = self.runner.tasks
+        if not tasks:
+            self.text_var.set("Prêt")
+            self._set_indeterminate(False)
+            self.progressbar.pack_forget()
+            self.cancel_btn.pack_forget()
+            self._busy = False
+            return
+        
+        task = tasks[0]
+        text = task.label
+        if task.total:
+            percent = min(100.0, 100.0 * task.done / task.total)
+            text += f" ({task.done}/{task.total})"
+            self._set_indeterminate(False)
+            self.progressbar["value"] = percent
+        else:
+            if task.done:
+                text += f" ({task.done})"
+            self._set_indeterminate(True)
+        if len(tasks) > 1:
+            text += f"  (+{len(tasks) - 1} autre(s) en cours)"
+        if task.cancelled:
+            text += " - annulation..."
+        self.text_var.set(text)
+        
+        if not self._busy:
+            self.cancel_btn.pack(side=tk.RIGHT, padx=5)
+            self.progressbar.pack(side=tk.RIGHT, padx=5)
+            self._busy = True
+    
+    def _set_indeterminate(self, indeterminate: bool):
+        if indeterminate == self._indeterminate:
+            return
+        self._indeterminate = indeterminate
+        if indeterminate:
+            self.progressbar.config(mode="indeterminate")
+            self.progressbar.start(15)
+        else:
+            self.progressbar.stop()
+            self.progressbar.config(mode="determinate")
+    
+    def _cancel(self):
+        """Annuler la tâche affichée"""
+        if self.runner.tasks:
+            self.runner.tasks[0].cancel()
+            self._update()
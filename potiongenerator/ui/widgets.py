@@ -0,0 +1,450 @@
+# -*- coding: utf-8 -*-
+"""
+Générateur de Potions - Composants Tkinter réutilisables
+
+Planificateur de rafraîchissements, liste virtualisée et liste déroulante
+avec recherche, partagés par la fenêtre principale et les dialogues.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+import bisect
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..core import SearchIndex
+
+# ==================== RAFRAÎCHISSEMENT ====================
+
+class RefreshScheduler:
+    """Planificateur central des rafraîchissements de l'interface
+    
+    Les composants enregistrent leurs rafraîchissements sous un nom puis les
+    demandent par ce nom. Les demandes sont regroupées et exécutées une
+    seule fois, au prochain passage à vide de Tk (``after_idle``) ou après
+    un court délai pour la saisie au clavier. Chaque rafraîchissement a un
+    rang : la validation passe après la mise à jour des listes.
+    """
+    
+    # Délai (ms) après la dernière frappe dans un champ de recherche
+    TYPING_DELAY = 200
+    
+    def __init__(self, widget):
+        self.widget = widget
+        self._tasks: Dict[str, Tuple[int, Callable[[], None]]] = {}
+        self._pending: set = set()
+        self._after_id = None
+        self._idle = False
+    
+    def register(self, name: str, callback: Callable[[], None], order: int = 0):
+        """Enregistrer un rafraîchissement ; les petits rangs passent d'abord"""
+        self._tasks[name] = (order, callback)
+    
+    def request(self, *names: str, delay: int = 0):
+        """Demander des rafraîchissements, regroupés jusqu'à la prochaine exécution
+        
+        Avec ``delay`` (ms), l'exécution est repoussée à chaque nouvelle
+        demande jusqu'à ce que la saisie s'arrête.
+        """
+        for name in names:
+            if name not in self._tasks:
+                raise KeyError(f"Rafraîchissement inconnu: {name}")
+        self._pending.update(names)
+        if self._after_id is not None:
+            if self._idle:
+                return
+            self.widget.after_cancel(self._after_id)
+        self._idle = not delay
+        if delay:
+            self._after_id = self.widget.after(delay, self.flush)
+        else:
+            self._after_id = self.widget.after_idle(self.flush)
+    
+    def flush(self):
+        """Exécuter immédiatement les rafraîchissements en attente, dans l'ordre"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        pending, self._pending = self._pending, set()
+        for name in sorted(pending, key=lambda name: self._tasks[name][0]):
+            self._tasks[name][1]()
+    
+    def cancel(self):
+        """Abandonner les rafraîchissements en attente"""
+        if self._after_id is not None:
+            self.widget.after_cancel(self._after_id)
+            self._after_id = None
+        self._pending.clear()
+
+# ==================== LISTE VIRTUALISÉE ====================
+
+def plan_row_moves(old_keys: List[str], new_keys: List[str]) -> Tuple[List[str], List[Tuple[str, Optional[str], bool]]]:
+    """Changements minimaux pour passer de ``old_keys`` à ``new_keys``
+    
+    Renvoie les clés à supprimer puis, en partant de la fin, les lignes à
+    placer sous la forme ``(clé, clé suivante ou None, nouvelle)``. Les
+    lignes conservées qui forment la plus longue sous-suite croissante de
+    l'ancien ordre ne bougent pas : seules les autres sont déplacées.
+    """
+    new_set = set(new_keys)
+    removed = [key for key in old_keys if key not in new_set]
+    old_positions = {key: position for position, key in enumerate(old_keys) if key in new_set}
+    
+    # Plus longue sous-suite croissante des anciennes positions (tri par patience)
+    tails: List[int] = []
+    tail_keys: List[str] = []
+    previous: Dict[str, Optional[str]] = {}
+    for key in new_keys:
+        position = old_positions.get(key)
+        if position is None:
+            continue
+        slot = bisect.bisect_left(tails, position)
+        previous[key] = tail_keys[slot - 1] if slot else None
+        if slot == len(tails):
+            tails.append(position)
+            tail_keys.append(key)
+        else:
+            tails[slot] = position
+            tail_keys[slot] = key
+    stable = set()
+    key = tail_keys[-1] if tail_keys else None
+    while key is not None:
+        stable.add(key)
+        key = previous[key]
+    
+    placements = []
+    next_key = None
+    for key in reversed(new_keys):
+        if key not in stable:
+            placements.append((key, next_key, key not in old_positions))
+        next_key = key
+    return removed, placements
+
+class VirtualTreeview(ttk.Frame):
+    """Treeview virtualisé : seules les lignes visibles sont insérées
+    
+    La liste complète n'est qu'une séquence de clés (IDs) filtrée et triée ;
+    ``row_factory(key)`` fournit à la demande les options d'une ligne
+    (``text``, ``values``, ``tags``). La barre de défilement verticale
+    pilote l'index de la première ligne affichée, si bien que le coût d'un
+    rafraîchissement dépend de la hauteur de la fenêtre et non du nombre
+    d'éléments. La sélection est suivie par clé et survit au défilement.
+    
+    Émet ``<<TreeviewSelect>>`` lorsque la clé sélectionnée change.
+    """
+    
+    # Lignes insérées au-delà de la zone visible
+    MARGIN = 3
+    # Hauteurs par défaut (pixels) tant que la première ligne n'est pas mesurée
+    DEFAULT_ROW_HEIGHT = 20
+    DEFAULT_HEADING_HEIGHT = 25
+    # Lignes parcourues par cran de molette
+    WHEEL_ROWS = 3
+    
+    def __init__(self, parent, columns, row_factory, show="headings", height=15):
+        super().__init__(parent)
+        self.row_factory = row_factory
+        self.keys: List[str] = []
+        self.first = 0
+        self._positions: Optional[Dict[str, int]] = None
+        self._selected: Optional[str] = None
+        self._visible_rows = height
+        # Options des lignes actuellement insérées, par clé
+        self._rendered: Dict[str, dict] = {}
+        
+        self.tree = ttk.Treeview(self, columns=columns, show=show, height=height,
+                                 selectmode="browse")
+        
+        # La barre verticale pilote l'index, pas le défilement du Treeview
+        self.v_scrollbar = ttk.Scrollbar(self, orient=tk.VERTICAL, command=self._on_scrollbar)
+        h_scrollbar = ttk.Scrollbar(self, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=h_scrollbar.set)
+        
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
+        h_scrollbar.grid(row=1, column=0, sticky='ew')
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        
+        # Bindings
+        self.tree.bind("<Configure>", self._on_configure)
+        self.tree.bind("<<TreeviewSelect>>", self._on_tree_select)
+        self.tree.bind("<MouseWheel>", self._on_mousewheel)
+        self.tree.bind("<Button-4>", lambda e: self._scroll_rows(-self.WHEEL_ROWS))
+        self.tree.bind("<Button-5>", lambda e: self._scroll_rows(self.WHEEL_ROWS))
+        self.tree.bind("<Up>", lambda e: self._move_selection(-1))
+        self.tree.bind("<Down>", lambda e: self._move_selection(1))
+        self.tree.bind("<Prior>", lambda e: self._move_selection(-self._visible_rows))
+        self.tree.bind("<Next>", lambda e: self._move_selection(self._visible_rows))
+        self.tree.bind("<Home>", lambda e: self._move_selection(-len(self.keys)))
+        self.tree.bind("<End>", lambda e: self._move_selection(len(self.keys)))
+    
+    # ---------- Délégation au Treeview ----------
+    
+    def heading(self, column, **kwargs):
+        return self.tree.heading(column, **kwargs)
+    
+    def column(self, column, **kwargs):
+        return self.tree.column(column, **kwargs)
+    
+    def tag_configure(self, tag, **kwargs):
+        return self.tree.tag_configure(tag, **kwargs)
+    
+    def bind(self, sequence=None, func=None, add=None):
+        """Les événements virtuels restent sur le cadre, les autres vont au Treeview"""
+        if sequence and sequence.startswith("<<"):
+            return super().bind(sequence, func, add)
+        return self.tree.bind(sequence, func, add)
+    
+    # ---------- Contenu ----------
+    
+    def set_keys(self, keys: List[str]):
+        """Remplacer la liste (filtrée et triée) des clés affichées
+        
+        La première ligne affichée reste en haut si elle existe toujours,
+        pour conserver la position de défilement.
+        """
+        top_key = self.keys[self.first] if self.first < len(self.keys) else None
+        self.keys = keys
+        self._positions = None
+        if self._selected is not None and self.index(self._selected) is None:
+            self._selected = None
+        top = self.index(top_key) if top_key is not None else None
+        self.first = self._clamp(self.first if top is None else top)
+        self.refresh()
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def index(self, key: str) -> Optional[int]:
+        """Position d'une clé dans la liste, ou None"""
+        if self._positions is None:
+            self._positions = {item_key: position for position, item_key in enumerate(self.keys)}
+        return self._positions.get(key)
+    
+    def refresh(self):
+        """Réconcilier les lignes affichées avec la fenêtre courante
+        
+        Seules les différences avec le rendu précédent sont appliquées :
+        suppressions, insertions, déplacements et valeurs modifiées.
+        """
+        window = self.keys[self.first:self.first + self._visible_rows + self.MARGIN]
+        removed, placements = plan_row_moves(list(self.tree.get_children()), window)
+        
+        if removed:
+            self.tree.delete(*removed)
+            for key in removed:
+                self._rendered.pop(key, None)
+        inserted = set()
+        for key, next_key, is_new in placements:
+            if not is_new:
+                self.tree.detach(key)
+            index = self.tree.index(next_key) if next_key is not None else tk.END
+            if is_new:
+                self._rendered[key] = self.row_factory(key)
+                self.tree.insert("", index, iid=key, **self._rendered[key])
+                inserted.add(key)
+            else:
+                self.tree.move(key, "", index)
+        
+        # Valeurs modifiées des lignes conservées
+        for key in window:
+            if key in inserted:
+                continue
+            options = self.row_factory(key)
+            if options != self._rendered[key]:
+                self.tree.item(key, **options)
+                self._rendered[key] = options
+        
+        # Sélection
+        current = self.tree.selection()
+        if self._selected in self._rendered:
+            if current != (self._selected,):
+                self.tree.selection_set(self._selected)
+            self.tree.focus(self._selected)
+        elif current:
+            self.tree.selection_remove(*current)
+        self._update_scrollbar()
+    
+    # ---------- Sélection ----------
+    
+    def selection(self) -> Tuple[str, ...]:
+        """Clé sélectionnée, même hors de la zone affichée"""
+        return (self._selected,) if self._selected is not None else ()
+    
+    def select(self, key: Optional[str], see: bool = True):
+        """Sélectionner une ligne par sa clé (ID)"""
+        if key is not None and self.index(key) is None:
+            key = None
+        changed = key != self._selected
+        self._selected = key
+        if key is not None and see:
+            self.see(key)
+        else:
+            self.refresh()
+        if changed:
+            self.event_generate("<<TreeviewSelect>>")
+    
+    def see(self, key: str):
+        """Faire défiler jusqu'à la ligne d'une clé"""
+        position = self.index(key)
+        if position is None:
+            return
+        if position < self.first:
+            self.first = position
+        elif position >= self.first + self._visible_rows:
+            self.first = self._clamp(position - self._visible_rows + 1)
+        self.refresh()
+    
+    def _on_tree_select(self, event):
+        # Les suppressions de lignes hors fenêtre vident la sélection du
+        # Treeview : seule une nouvelle clé compte
+        selection = self.tree.selection()
+        if selection and selection[0] != self._selected:
+            self._selected = selection[0]
+            self.event_generate("<<TreeviewSelect>>")
+    
+    def _move_selection(self, delta: int):
+        if not self.keys:
+            return "break"
+        position = self.index(self._selected) if self._selected is not None else None
+        if position is None:
+            # Sans sélection, partir de la première ligne affichée
+            position, delta = self.first, 0
+        position = max(0, min(len(self.keys) - 1, position + delta))
+        self.select(self.keys[position])
+        return "break"
+    
+    # ---------- Défilement ----------
+    
+    def _clamp(self, first: int) -> int:
+        return max(0, min(first, len(self.keys) - self._visible_rows))
+    
+    def _scroll_rows(self, delta: int):
+        first = self._clamp(self.first + delta)
+        if first != self.first:
+            self.first = first
+            self.refresh()
+        return "break"
+    
+    def _on_mousewheel(self, event):
+        return self._scroll_rows(-self.WHEEL_ROWS if event.delta > 0 else self.WHEEL_ROWS)
+    
+    def _on_scrollbar(self, *args):
+        """Convertir la position de la barre en index de première ligne"""
+        if args[0] == "moveto":
+            first = int(float(args[1]) * len(self.keys))
+        elif args[0] == "scroll":
+            step = self._visible_rows if args[2] == "pages" else 1
+            first = self.first + int(args[1]) * step
+        else:
+            return
+        first = self._clamp(first)
+        if first != self.first:
+            self.first = first
+            self.refresh()
+    
+    def _update_scrollbar(self):
+        total = len(self.keys)
+        if total <= self._visible_rows:
+            self.v_scrollbar.set(0.0, 1.0)
+        else:
+            self.v_scrollbar.set(self.first / total, (self.first + self._visible_rows) / total)
+    
+    def _on_configure(self, event):
+        """Recalculer le nombre de lignes visibles après un redimensionnement"""
+        children = self.tree.get_children()
+        bbox = self.tree.bbox(children[0]) if children else None
+        if bbox:
+            heading_height, row_height = bbox[1], bbox[3]
+        else:
+            heading_height, row_height = self.DEFAULT_HEADING_HEIGHT, self.DEFAULT_ROW_HEIGHT
+        visible_rows = max(1, (event.height - heading_height) // max(1, row_height))
+        if visible_rows != self._visible_rows:
+            self._visible_rows = visible_rows
+            self.first = self._clamp(self.first)
+            self.refresh()
+
+
+# ==================== LISTE DÉROULANTE AVEC RECHERCHE ====================
+
+class SearchableCombobox(ttk.Frame):
+    """Combobox avec recherche intégrée"""
+    
+    # Nombre maximal de résultats affichés dans la liste
+    MAX_RESULTS = 50
+    
+    def __init__(self, parent, values=None, **kwargs):
+        super().__init__(parent)
+        self.values = values or []
+        # Index construit à la première frappe
+        self.index: Optional[SearchIndex] = None
+        self.filtered_values = self.values[:self.MAX_RESULTS]
+        self._search_term = ""
+        
+        # Variable pour la sélection
+        self.var = tk.StringVar()
+        
+        # Entry pour la recherche
+        self.entry = ttk.Entry(self, textvariable=self.var)
+        self.entry.pack(fill=tk.X)
+        
+        # Listbox pour les résultats
+        self.listbox = tk.Listbox(self, height=6)
+        self.listbox.pack(fill=tk.BOTH, expand=True)
+        
+        # Scrollbar
+        scrollbar = ttk.Scrollbar(self, command=self.listbox.yview)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.listbox.config(yscrollcommand=scrollbar.set)
+        
+        # Bindings
+        self.entry.bind('<KeyRelease>', self._on_key_release)
+        self.listbox.bind('<Double-Button-1>', self._on_select)
+        self.listbox.bind('<Return>', self._on_select)
+        
+        self._update_listbox()
+    
+    def _on_key_release(self, event):
+        """Filtrer les résultats lors de la saisie"""
+        search_term = self.var.get()
+        if search_term == self._search_term:
+            # Touche sans effet sur le texte (flèches, Maj...)
+            return
+        self._search_term = search_term
+        if self.index is None:
+            self.index = SearchIndex(self.values)
+        self.filtered_values = self.index.search(search_term, limit=self.MAX_RESULTS)
+        self._update_listbox()
+        
+        # Auto-sélection si un seul résultat
+        if len(self.filtered_values) == 1:
+            self.listbox.selection_set(0)
+    
+    def _on_select(self, event):
+        """Sélectionner un élément"""
+        selection = self.listbox.curselection()
+        if selection:
+            value = self.filtered_values[selection[0]]
+            self.var.set(value)
+    
+    def _update_listbox(self):
+        """Mettre à jour la listbox"""
+        self.listbox.delete(0, tk.END)
+        for value in self.filtered_values:
+            self.listbox.insert(tk.END, value)
+    
+    def set_values(self, values):
+        """Définir les valeurs disponibles"""
+        self.values = values
+        self.index = None
+        self._search_term = ""
+        self.filtered_values = values[:self.MAX_RESULTS]
+        self._update_listbox()
+    
+    def get(self):
+        """Obtenir la valeur sélectionnée"""
+        return self.var.get()
+    
+    def set(self, value):
+        """Définir la valeur"""
+        self.var.set(value)
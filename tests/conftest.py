@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""
+Fixtures communes des tests (sans interface graphique)
+
+Chaque test tourne dans un dossier temporaire : le gestionnaire de données
+y crée ses dossiers relatifs (``backups``, ``exports``).
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from potiongenerator import PotionManager, create_sample_ingredients  # noqa: E402
+
+BASES = {
+    "eau": {"id": "eau", "name": "Eau", "potion_type": "Potion", "description": "Base liquide standard"},
+    "huile": {"id": "huile", "name": "Huile", "potion_type": "Poison", "description": "Base huileuse toxique"},
+    "pate": {"id": "pate", "name": "Pâte", "potion_type": "Onguent", "description": "Base épaisse topique"},
+}
+
+
+def write_document(path: Path, storage: str = "json") -> Path:
+    """Écrire un fichier de données v2.0 : trois bases et les ingrédients d'exemple"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "version": "2.0",
+        "metadata": {"created": "2024-01-01T00:00:00", "last_modified": "2024-01-01T00:00:00",
+                     "total_potions": 0, "total_ingredients": 0},
+        "config": {"auto_save": True, "backup_frequency": 10, "storage": storage, "theme": "light"},
+        "bases": BASES,
+        "ingredients": create_sample_ingredients(),
+        "potions": {},
+        "tags": [],
+        "favorites": [],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(document, f, ensure_ascii=False)
+    return path
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch) -> Path:
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def json_file(workdir) -> Path:
+    return write_document(workdir / "data" / "potions_data.json")
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def manager(request, json_file):
+    """Gestionnaire sur le fichier JSON, ou sur une base SQLite initialisée depuis lui"""
+    data_file = json_file if request.param == "json" else json_file.with_suffix(".db")
+    potion_manager = PotionManager(str(data_file))
+    yield potion_manager
+    potion_manager.data_manager.close()
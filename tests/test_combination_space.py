@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+"""Espace des recettes : tirages sans répétition (arbre de Fenwick et masques)"""
+
+import itertools
+import random
+
+import pytest
+
+from potiongenerator import Base, CombinationSpace, Ingredient
+
+QUALITIES = ["Mineur", "Majeur", "Légendaire", "Mythique"]
+RARITIES = ["Commun", "Rare", "Légendaire", "Mythique"]
+
+
+def build_space() -> CombinationSpace:
+    """Trois bases sur deux types ; plus de 64 négatifs pour couvrir plusieurs blocs de bits"""
+    bases = [Base("eau", "Eau", "Potion"), Base("vin", "Vin", "Potion"), Base("huile", "Huile", "Poison")]
+    ingredients = []
+    for index in range(8):
+        ingredients.append(Ingredient(f"pos_{index}", f"Positif {index}", "Effet", "positif",
+                                      QUALITIES[index % 4], "Instantané", RARITIES[index % 4],
+                                      allowed_potion_types=["Potion", "Poison"] if index % 3 else ["Potion"]))
+    for index in range(70):
+        ingredients.append(Ingredient(f"neg_{index:02d}", f"Négatif {index}", "Effet", "négatif",
+                                      QUALITIES[index % 4], "Instantané", RARITIES[(index // 4) % 4],
+                                      allowed_potion_types=["Poison"] if index % 5 == 0 else ["Potion", "Poison"]))
+    return CombinationSpace(bases, ingredients)
+
+
+def valid_recipes(space: CombinationSpace) -> set:
+    recipes = set()
+    for base, positive, negative in itertools.product(space.bases.values(), space.positives, space.negatives):
+        if base.potion_type in positive.allowed_potion_types and base.potion_type in negative.allowed_potion_types:
+            recipes.add((base.id, positive.id, negative.id))
+    return recipes
+
+
+def test_counts_match_enumeration():
+    space = build_space()
+    recipes = valid_recipes(space)
+    assert space.total() == space.remaining() == len(recipes)
+    assert set(space.iter_unused()) == recipes
+
+
+@pytest.mark.parametrize("weighting", [None, "rarity", "quality"])
+@pytest.mark.parametrize("seed", range(5))
+def test_sample_never_repeats_nor_returns_used_recipes(weighting, seed):
+    space = build_space()
+    rng = random.Random(seed)
+    recipes = valid_recipes(space)
+    used = set(rng.sample(sorted(recipes), len(recipes) // 3))
+    for recipe in used:
+        assert space.mark_used(*recipe)
+
+    drawn = space.sample(200, weighting=weighting, rng=rng)
+    assert len(drawn) == len(set(drawn)) == 200
+    assert set(drawn) <= recipes - used
+    # Un tirage ne réserve rien
+    assert space.remaining() == len(recipes) - len(used)
+
+
+@pytest.mark.parametrize("weighting", [None, "rarity"])
+def test_sample_exhausts_the_space_exactly(weighting):
+    space = build_space()
+    rng = random.Random(7)
+    recipes = valid_recipes(space)
+    used = set(rng.sample(sorted(recipes), len(recipes) - 25))
+    for recipe in used:
+        space.mark_used(*recipe)
+
+    drawn = space.sample(100, weighting=weighting, rng=rng)
+    assert sorted(drawn) == sorted(recipes - used)
+
+    for recipe in drawn:
+        space.mark_used(*recipe)
+    assert space.remaining() == 0
+    assert space.sample(5, weighting=weighting, rng=rng) == []
+
+
+def test_released_recipes_can_be_drawn_again():
+    space = build_space()
+    recipes = sorted(valid_recipes(space))
+    for recipe in recipes:
+        space.mark_used(*recipe)
+    # Ingrédients dans l'ordre inverse : même recette
+    base_id, positive, negative = recipes[42]
+    assert space.mark_unused(base_id, negative, positive)
+    assert space.sample(3, rng=random.Random(0)) == [recipes[42]]
+
+
+def test_sample_for_one_base():
+    space = build_space()
+    drawn = space.sample(50, base_id="huile", rng=random.Random(3))
+    assert len(set(drawn)) == 50
+    assert all(base_id == "huile" for base_id, _, _ in drawn)
+
+
+@pytest.mark.parametrize("snapshot_first", [True, False])
+def test_background_build_catches_up_with_concurrent_edits(manager, snapshot_first):
+    first, second, third = manager.suggest_combinations(3, rng=random.Random(0))
+    kept = manager.create_potion(*first)
+    removed = manager.create_potion(*second)
+    expected = manager.get_remaining_counts()
+    manager._invalidate_combination_space()
+
+    build = manager.prepare_combination_space()
+    assert not manager.combination_space_ready
+    # Modifications pendant la construction, vues ou non par l'instantané
+    built = build() if snapshot_first else None
+    manager.delete_potion(removed.id)
+    manager.create_potion(*third)
+    manager.toggle_favorite(kept.id)
+    built = built or build()
+
+    assert manager.install_combination_space(built)
+    assert manager.combination_space_ready
+    assert manager.get_remaining_counts() == {
+        base_id: count + (base_id == second[0]) - (base_id == third[0]) for base_id, count in expected.items()}
+    assert not manager.combination_space.is_used(*second)
+    assert manager.combination_space.is_used(*third)
+
+
+def test_background_build_is_stale_after_an_ingredient_change(manager):
+    build = manager.prepare_combination_space()
+    manager.save_ingredient({"id": "menthe", "name": "Menthe", "effect": "Fraîcheur", "type": "positif",
+                             "quality": "Mineur", "duration": "Instantané"})
+
+    assert not manager.install_combination_space(build())
+    assert not manager.combination_space_ready
+    assert manager.install_combination_space(manager.prepare_combination_space()())
+    assert "menthe" in {ingredient.id for ingredient in manager.combination_space.positives}
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""Suppression d'un ingrédient par l'index inverse : refus, cascade et report"""
+
+import pytest
+
+from potiongenerator import PotionManager
+
+RECIPES = [("eau", "sauge", "ortie"), ("huile", "lotus", "ortie"), ("eau", "sauge", "belladone"),
+           ("pate", "lotus", "mandragore")]
+
+
+def create_potions(manager: PotionManager) -> dict:
+    """Recette -> ID de potion"""
+    return {recipe: manager.create_potion(*recipe).id for recipe in RECIPES}
+
+
+def assert_references_match_scan(manager: PotionManager):
+    potions = dict(manager.data["potions"].items())
+    for ing_id in manager.data["ingredients"]:
+        expected = {potion_id for potion_id, potion_data in potions.items()
+                    if ing_id in (potion_data["ingredient1"], potion_data["ingredient2"])}
+        assert manager.potion_ids_using_ingredient(ing_id) == expected
+    for base_id in manager.data["bases"]:
+        expected = {potion_id for potion_id, potion_data in potions.items() if potion_data["base"] == base_id}
+        assert manager.potion_ids_using_base(base_id) == expected
+    assert manager.check_integrity() == []
+
+
+def reopen(manager: PotionManager) -> PotionManager:
+    manager.data_manager.close()
+    return PotionManager(str(manager.data_manager.data_file))
+
+
+def test_block_refuses_and_changes_nothing(manager):
+    create_potions(manager)
+    before = dict(manager.data["potions"].items())
+
+    reason = manager.delete_ingredient("ortie")
+    assert reason == "Ortie est utilisé par 2 potion(s)"
+    assert manager.get_ingredient("ortie") is not None
+    assert dict(manager.data["potions"].items()) == before
+
+
+def test_unused_ingredient_is_deleted(manager):
+    create_potions(manager)
+    manager.save_ingredient({"id": "menthe", "name": "Menthe", "effect": "Fraîcheur", "type": "positif",
+                             "quality": "Mineur", "duration": "Instantané"})
+
+    assert manager.delete_ingredient("menthe") is None
+    assert manager.get_ingredient("menthe") is None
+    assert manager.delete_ingredient("menthe") == "Ingrédient inconnu: menthe"
+    with pytest.raises(ValueError):
+        manager.delete_ingredient("sauge", mode="purge")
+
+
+def test_cascade_removes_the_potions_using_it(manager):
+    potion_ids = create_potions(manager)
+
+    assert manager.delete_ingredient("ortie", mode="cascade") is None
+    assert manager.get_ingredient("ortie") is None
+    assert set(manager.data["potions"]) == {potion_ids[RECIPES[2]], potion_ids[RECIPES[3]]}
+    assert not manager.has_combination(*RECIPES[0])
+    assert manager.get_statistics()["total_potions"] == 2
+    assert_references_match_scan(manager)
+
+    reloaded = reopen(manager)
+    try:
+        assert reloaded.get_ingredient("ortie") is None
+        assert len(reloaded.data["potions"]) == 2
+        assert_references_match_scan(reloaded)
+    finally:
+        reloaded.data_manager.close()
+
+
+def test_reassign_moves_the_potions_to_the_replacement(manager):
+    potion_ids = create_potions(manager)
+
+    assert manager.delete_ingredient("ortie", mode="reassign", replacement="mandragore") is None
+    assert manager.get_ingredient("ortie") is None
+    assert len(manager.data["potions"]) == len(RECIPES)
+    assert manager.data["potions"][potion_ids[RECIPES[0]]]["ingredient2"] == "mandragore"
+    assert manager.has_combination("eau", "mandragore", "sauge")
+    assert not manager.has_combination(*RECIPES[0])
+    assert manager.potion_ids_using_ingredient("mandragore") == {
+        potion_ids[RECIPES[0]], potion_ids[RECIPES[1]], potion_ids[RECIPES[3]]}
+    assert_references_match_scan(manager)
+
+    reloaded = reopen(manager)
+    try:
+        assert reloaded.potion_ids_using_ingredient("ortie") == set()
+        assert_references_match_scan(reloaded)
+    finally:
+        reloaded.data_manager.close()
+
+
+@pytest.mark.parametrize("replacement, reason", [
+    ("belladone", "Cette combinaison existe déjà"),
+    ("lotus", "Il faut un ingrédient positif et un ingrédient négatif"),
+    ("ortie", "Choisissez un autre ingrédient existant pour le remplacer"),
+    (None, "Choisissez un autre ingrédient existant pour le remplacer"),
+])
+def test_invalid_reassignment_changes_nothing(manager, replacement, reason):
+    create_potions(manager)
+    before = dict(manager.data["potions"].items())
+
+    refusal = manager.delete_ingredient("ortie", mode="reassign", replacement=replacement)
+    assert refusal is not None and refusal.endswith(reason)
+    assert manager.get_ingredient("ortie") is not None
+    assert dict(manager.data["potions"].items()) == before
+    assert_references_match_scan(manager)
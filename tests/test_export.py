@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+"""Export du document complet : instantané pris avant la tâche de fond"""
+
+import io
+import json
+
+from potiongenerator.export import ExportEngine
+
+
+def test_document_export_reads_the_snapshot_taken_beforehand(manager):
+    manager.create_potions_batch(5, seed=2)
+    engine = ExportEngine(manager)
+    snapshot = engine.document_snapshot()
+    next_potion_id = manager.data["metadata"]["next_potion_id"]
+
+    # Modifications du thread Tk pendant l'export
+    manager.create_potion(*manager.suggest_combinations(1)[0])
+    manager.data_manager.put("metadata", "exported_during", True)
+
+    stream = io.StringIO()
+    count = engine.export_document(stream, snapshot=snapshot)
+    document = json.loads(stream.getvalue())
+
+    assert "exported_during" not in document["metadata"]
+    assert document["metadata"]["next_potion_id"] == next_potion_id
+    assert manager.data["metadata"]["next_potion_id"] == next_potion_id + 1
+    assert set(document["bases"]) == set(manager.data["bases"])
+    assert set(document["ingredients"]) == set(manager.data["ingredients"])
+    # Les potions restent lues en flux
+    assert count == len(document["potions"]) == 6
+
+
+def test_document_export_without_snapshot(manager):
+    manager.create_potions_batch(3, seed=4)
+    stream = io.StringIO()
+    assert ExportEngine(manager).export_document(stream) == 3
+    document = json.loads(stream.getvalue())
+    assert document["version"] == "2.0"
+    assert dict(manager.data["potions"].items()) == document["potions"]
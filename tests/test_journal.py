@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Stockage "journal" : rejeu après un arrêt brutal et compaction"""
+
+import json
+
+from potiongenerator import DataManager
+
+from conftest import write_document
+
+
+def potion(potion_id: str, name: str = "Potion") -> dict:
+    return {"id": potion_id, "name": name, "base": "eau", "ingredient1": "sauge", "ingredient2": "ortie",
+            "category": "Mineur", "created_at": "2024-01-01T00:00:00", "is_favorite": False, "notes": ""}
+
+
+def journal_lines(manager: DataManager) -> list:
+    with open(manager.journal_file, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def snapshot(manager: DataManager) -> dict:
+    with open(manager.data_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_modifications_are_journaled_then_replayed(workdir):
+    data_file = write_document(workdir / "data" / "potions_data.json", storage="journal")
+    manager = DataManager(str(data_file))
+    manager.put("potions", "potion_1", potion("potion_1"))
+    manager.put("potions", "potion_2", potion("potion_2"))
+    manager.remove("potions", "potion_1")
+
+    # L'instantané n'a pas bougé : tout est dans le journal
+    assert snapshot(manager)["potions"] == {}
+    assert [record["op"] for record in journal_lines(manager)] == ["put", "put", "del"]
+
+    # Arrêt brutal : aucune fermeture, un nouveau gestionnaire rejoue le journal
+    reloaded = DataManager(str(data_file))
+    assert list(reloaded.data["potions"]) == ["potion_2"]
+
+
+def test_batch_is_a_single_record(workdir):
+    data_file = write_document(workdir / "data" / "potions_data.json", storage="journal")
+    manager = DataManager(str(data_file))
+    with manager.batch():
+        manager.put("potions", "potion_1", potion("potion_1"))
+        with manager.batch():
+            manager.put("potions", "potion_2", potion("potion_2"))
+
+    records = journal_lines(manager)
+    assert len(records) == 1 and records[0]["op"] == "batch"
+    assert len(records[0]["records"]) == 2
+    assert set(DataManager(str(data_file)).data["potions"]) == {"potion_1", "potion_2"}
+
+
+def test_truncated_last_record_is_ignored(workdir):
+    data_file = write_document(workdir / "data" / "potions_data.json", storage="journal")
+    manager = DataManager(str(data_file))
+    manager.put("potions", "potion_1", potion("potion_1"))
+    manager._close_journal()
+    with open(manager.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"op": "put", "section": "potions", "id": "potion_2", "val')
+
+    assert list(DataManager(str(data_file)).data["potions"]) == ["potion_1"]
+
+
+def test_compaction_folds_journal_into_snapshot(workdir):
+    data_file = write_document(workdir / "data" / "potions_data.json", storage="journal")
+    manager = DataManager(str(data_file))
+    manager.put("potions", "potion_1", potion("potion_1"))
+    manager.put("potions", "potion_2", potion("potion_2", "Renommée"))
+    manager.remove("potions", "potion_1")
+
+    manager.compact(wait=True)
+
+    assert not manager.journal_file.exists()
+    assert not manager.compacting_file.exists()
+    assert snapshot(manager)["potions"] == {"potion_2": potion("potion_2", "Renommée")}
+
+    # Les modifications suivantes repartent dans un nouveau journal
+    manager.put("potions", "potion_3", potion("potion_3"))
+    assert len(journal_lines(manager)) == 1
+    manager.close()
+    assert not manager.journal_file.exists()
+    assert set(snapshot(manager)["potions"]) == {"potion_2", "potion_3"}
+
+
+def test_interrupted_compaction_is_replayed_first(workdir):
+    data_file = write_document(workdir / "data" / "potions_data.json", storage="journal")
+    manager = DataManager(str(data_file))
+    # Segment scellé par une compaction interrompue, puis journal plus récent
+    for journal, name in ((manager.compacting_file, "Ancienne"), (manager.journal_file, "Récente")):
+        record = {"op": "put", "section": "potions", "id": "potion_1", "value": potion("potion_1", name)}
+        with open(journal, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+
+    reloaded = DataManager(str(data_file))
+    assert reloaded.data["potions"]["potion_1"]["name"] == "Récente"
+
+    reloaded.sync()
+    assert not reloaded.journal_file.exists() and not reloaded.compacting_file.exists()
+    assert snapshot(reloaded)["potions"]["potion_1"]["name"] == "Récente"
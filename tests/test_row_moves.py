@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Réconciliation des lignes de la liste virtualisée (plus longue sous-suite croissante)
+
+``plan_row_moves`` est une fonction pure : elle est testée sans créer de
+fenêtre, en rejouant son plan sur une simple liste comme le fait
+``VirtualTreeview.refresh``.
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+from potiongenerator.ui.widgets import plan_row_moves  # noqa: E402
+
+
+def apply_plan(old_keys: list, removed: list, placements: list) -> list:
+    """Rejouer le plan : suppressions, puis détacher et placer chaque ligne devant la suivante"""
+    rows = [key for key in old_keys if key not in set(removed)]
+    for key, next_key, is_new in placements:
+        assert is_new == (key not in rows)
+        if not is_new:
+            rows.remove(key)
+        rows.insert(rows.index(next_key) if next_key is not None else len(rows), key)
+    return rows
+
+
+def longest_increasing_length(values: list) -> int:
+    """Longueur de la plus longue sous-suite croissante, en O(n²)"""
+    lengths = []
+    for index, value in enumerate(values):
+        lengths.append(1 + max((lengths[before] for before in range(index) if values[before] < value), default=0))
+    return max(lengths, default=0)
+
+
+@pytest.mark.parametrize("old_keys, new_keys", [
+    ([], []),
+    ([], ["a", "b"]),
+    (["a", "b"], []),
+    (["a", "b", "c"], ["a", "b", "c"]),
+    (["a", "b", "c"], ["c", "a", "b"]),
+    (["a", "b", "c", "d"], ["d", "c", "b", "a"]),
+    (["a", "b", "c", "d"], ["b", "c", "d", "e"]),
+])
+def test_plan_reaches_the_new_order(old_keys, new_keys):
+    removed, placements = plan_row_moves(old_keys, new_keys)
+    assert apply_plan(old_keys, removed, placements) == new_keys
+
+
+def test_scrolling_by_one_row_touches_only_the_ends():
+    old_keys = [f"potion_{index}" for index in range(30)]
+    new_keys = old_keys[1:] + ["potion_30"]
+    removed, placements = plan_row_moves(old_keys, new_keys)
+    assert removed == ["potion_0"]
+    assert placements == [("potion_30", None, True)]
+
+
+def test_unchanged_window_needs_no_work():
+    keys = [f"potion_{index}" for index in range(10)]
+    assert plan_row_moves(keys, list(keys)) == ([], [])
+
+
+@pytest.mark.parametrize("seed", range(50))
+def test_random_reorders_move_the_fewest_rows(seed):
+    rng = random.Random(seed)
+    universe = [f"k{index}" for index in range(40)]
+    old_keys = rng.sample(universe, rng.randint(0, 30))
+    new_keys = rng.sample(universe, rng.randint(0, 30))
+
+    removed, placements = plan_row_moves(old_keys, new_keys)
+    assert apply_plan(old_keys, removed, placements) == new_keys
+    assert sorted(removed) == sorted(set(old_keys) - set(new_keys))
+
+    # Les lignes conservées hors de la plus longue sous-suite croissante sont les seules déplacées
+    old_positions = {key: position for position, key in enumerate(old_keys)}
+    kept = [old_positions[key] for key in new_keys if key in old_positions]
+    moved = [key for key, _, is_new in placements if not is_new]
+    assert len(moved) == len(kept) - longest_increasing_length(kept)
+    assert sum(is_new for _, _, is_new in placements) == len(set(new_keys) - set(old_keys))
@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Stockage SQLite : rechargement, index inverses et recherche plein texte"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from potiongenerator import PotionManager
+
+
+@pytest.fixture
+def populated(json_file):
+    """Fichier JSON avec une douzaine de potions, puis la base SQLite initialisée depuis lui"""
+    json_manager = PotionManager(str(json_file))
+    json_manager.create_potions_batch(12, seed=1)
+    json_manager.update_potion_notes(next(iter(json_manager.data["potions"])), "Brassée un soir de pleine lune")
+    json_manager.data_manager.close()
+    db_manager = PotionManager(str(json_file.with_suffix(".db")))
+    yield json_manager, db_manager
+    db_manager.data_manager.close()
+
+
+def test_database_is_initialized_from_json_and_reloads(populated, json_file):
+    json_manager, db_manager = populated
+    assert db_manager.data_manager.storage == "sqlite"
+    assert dict(db_manager.data["potions"].items()) == dict(json_manager.data["potions"].items())
+
+    potion_id = next(iter(db_manager.data["potions"]))
+    db_manager.toggle_favorite(potion_id)
+    spec = db_manager.suggest_combinations(1)[0]
+    created = db_manager.create_potion(*spec)
+    db_manager.data_manager.close()
+
+    reloaded = PotionManager(str(json_file.with_suffix(".db")))
+    try:
+        assert reloaded.data["potions"][potion_id]["is_favorite"] is True
+        assert reloaded.has_combination(*spec)
+        assert reloaded.get_statistics()["total_potions"] == 13
+        assert reloaded.get_statistics()["favorites"] == 1
+        assert created.id in reloaded.data["potions"]
+    finally:
+        reloaded.data_manager.close()
+
+
+def test_reference_lookups_match_a_scan(populated):
+    _, db_manager = populated
+    potions = dict(db_manager.data["potions"].items())
+    for ing_id in db_manager.data["ingredients"]:
+        expected = {potion_id for potion_id, potion_data in potions.items()
+                    if ing_id in (potion_data["ingredient1"], potion_data["ingredient2"])}
+        assert db_manager.potion_ids_using_ingredient(ing_id) == expected
+    for base_id in db_manager.data["bases"]:
+        expected = {potion_id for potion_id, potion_data in potions.items() if potion_data["base"] == base_id}
+        assert db_manager.potion_ids_using_base(base_id) == expected
+    for potion_data in potions.values():
+        # L'ordre des ingrédients n'importe pas
+        assert db_manager.has_combination(potion_data["base"], potion_data["ingredient2"], potion_data["ingredient1"])
+
+
+@pytest.mark.parametrize("query", ["sauge", "pot", "PURIF", "poison de", "lune", "eau ortie", "le", "zzz", "Pât"])
+def test_search_matches_the_in_memory_index(populated, query):
+    json_manager, db_manager = populated
+    assert db_manager.search_potion_ids(query) == json_manager.search_potion_ids(query)
+    assert set(db_manager.query_potion_ids(query)) == json_manager.search_potion_ids(query)
+
+
+def test_search_follows_edits_and_pages(populated, json_file):
+    _, db_manager = populated
+    potion_id, other_id = list(db_manager.data["potions"])[:2]
+    db_manager.update_potion_notes(potion_id, "Recette du grimoire d'Éléonore")
+    assert db_manager.search_potion_ids("grimoire élé") == {potion_id}
+    assert db_manager.search_potion_ids("GRIMOIRE eleo") == {potion_id}
+
+    db_manager.delete_potion(potion_id)
+    assert db_manager.search_potion_ids("grimoire") == set()
+
+    everything = db_manager.query_potion_ids("de", sort_by="Nom")
+    assert db_manager.query_potion_ids("de", sort_by="Nom", limit=4, offset=3) == everything[3:7]
+
+    db_manager.update_potion_notes(other_id, "grimoire")
+    db_manager.data_manager.close()
+    reloaded = PotionManager(str(json_file.with_suffix(".db")))
+    try:
+        assert reloaded.search_potion_ids("grimoire") == {other_id}
+    finally:
+        reloaded.data_manager.close()
+
+
+def test_older_database_is_backfilled(populated, json_file):
+    _, db_manager = populated
+    expected = db_manager.search_potion_ids("pot")
+    db_manager.data_manager.close()
+
+    # Base antérieure à l'index plein texte : index vide, version 0
+    connection = sqlite3.connect(json_file.with_suffix(".db"))
+    connection.execute("DROP TABLE potion_search")
+    connection.execute("PRAGMA user_version = 0")
+    connection.commit()
+    connection.close()
+
+    reloaded = PotionManager(str(json_file.with_suffix(".db")))
+    try:
+        assert expected and reloaded.search_potion_ids("pot") == expected
+    finally:
+        reloaded.data_manager.close()
+
+
+def test_background_reads_share_the_connection(populated):
+    _, db_manager = populated
+    errors = []
+
+    def read():
+        try:
+            for _ in range(20):
+                db_manager.check_integrity()
+                db_manager.query_potion_ids("pot", sort_by="Date")
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    potion_ids = list(db_manager.data["potions"])
+    for index in range(200):
+        db_manager.toggle_favorite(potion_ids[index % len(potion_ids)])
+    reader.join()
+    assert errors == []
+
+
+def test_periodic_backups_copy_the_database(populated, tmp_path):
+    _, db_manager = populated
+    data_manager = db_manager.data_manager
+    data_manager.data["config"]["backup_frequency"] = 1
+    potion_id = next(iter(db_manager.data["potions"]))
+    db_manager.toggle_favorite(potion_id)
+    db_manager.update_potion_notes(potion_id, "Sauvegardée en tâche de fond")
+    data_manager._wait_for_backup()
+
+    backups = data_manager.backups.list_backups()
+    assert backups
+    copy = tmp_path / "copie.db"
+    copy.write_bytes(data_manager.backups.read(backups[0]["id"]))
+    connection = sqlite3.connect(copy)
+    try:
+        assert connection.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+        assert connection.execute("SELECT COUNT(*) FROM potions").fetchone() == (12,)
+    finally:
+        connection.close()
+    assert not list(data_manager.data_file.parent.glob("*.backup"))